@@ -0,0 +1,275 @@
+"""Build the changelogs of many repositories in one go.
+
+Running the tool once per repository means a new process each time, reading
+the settings again and opening new connections to GitHub. Here every
+repository in a manifest file is built in the same process, at most 'jobs' at
+a time. They share one GitHub client (and so its pool of open connections),
+the response cache, the rate limits and the cache of contributor names.
+
+Each repository can change any of the settings just for itself, and its files
+are written to its own folder rather than the current one.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar, NoReturn, get_origin
+
+import rtoml
+import typer
+from github import Auth, Github, GithubException
+from rich import print as rprint
+
+from github_changelog_md.changelog.changelog import ChangeLog
+from github_changelog_md.changelog.connection import retry_args
+from github_changelog_md.changelog.profiles import ProfileCache
+from github_changelog_md.config.settings import Settings
+from github_changelog_md.constants import PROFILE_CACHE_FILE, ExitErrors
+from github_changelog_md.helpers import get_cache_dir
+
+if TYPE_CHECKING:  # pragma: no cover
+    from github_changelog_md.constants import ChangelogOptions
+
+# how many repositories are built at the same time, unless the manifest or
+# '--jobs' says otherwise.
+DEFAULT_JOBS = 4
+
+
+def batch_error(message: str) -> NoReturn:
+    """Show a problem with the manifest file, and exit."""
+    rprint(f"\n[red]  X  Error in the manifest: {message}\n", file=sys.stderr)
+    raise typer.Exit(ExitErrors.BAD_MANIFEST)
+
+
+def setting_names() -> set[str]:
+    """Return the names of the settings a repository can change."""
+    names = set()
+    for name, annotation in Settings.__annotations__.items():
+        origin: object = get_origin(annotation)
+        if origin is not ClassVar:
+            names.add(name)
+    return names
+
+
+@dataclass
+class BatchRepo:
+    """A repository listed in the manifest."""
+
+    owner: str
+    name: str
+    folder: Path
+    settings: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def full_name(self) -> str:
+        """Return the 'owner/name' of the repository."""
+        return f"{self.owner}/{self.name}"
+
+
+@dataclass
+class Manifest:
+    """The repositories to build, and how many to build at once."""
+
+    repos: list[BatchRepo]
+    jobs: int = DEFAULT_JOBS
+
+    @classmethod
+    def load(cls, path: Path) -> Manifest:
+        """Load and check the manifest at 'path'.
+
+        A repository's folder is relative to the manifest, and is a folder
+        named after the repository (next to the manifest) if not given.
+        """
+        try:
+            data: dict[str, Any] = rtoml.load(path)
+        except (OSError, ValueError) as exc:
+            batch_error(f"Cannot read '{path}' : {exc}")
+
+        jobs = data.get("jobs", DEFAULT_JOBS)
+        if not isinstance(jobs, int) or jobs < 1:
+            batch_error("'jobs' must be a whole number of at least 1")
+        entries = data.get("repos")
+        if (
+            not isinstance(entries, list)
+            or not entries
+            or not all(isinstance(entry, dict) for entry in entries)
+        ):
+            batch_error("There are no '[[repos]]' to build")
+
+        known_settings = setting_names()
+        repos = []
+        for entry in entries:
+            full_name = str(entry.get("repo", ""))
+            owner, _, name = full_name.partition("/")
+            if not owner or not name or "/" in name:
+                batch_error(f"'{full_name}' is not an 'owner/name' repository")
+            settings = entry.get("settings", {})
+            if not isinstance(settings, dict):
+                batch_error(f"The settings for {full_name} must be a table")
+            unknown = sorted(settings.keys() - known_settings)
+            if unknown:
+                batch_error(
+                    f"Unknown settings for {full_name} : {', '.join(unknown)}"
+                )
+            repos.append(
+                BatchRepo(
+                    owner=owner,
+                    name=name,
+                    folder=path.parent / entry.get("folder", name),
+                    settings=settings,
+                )
+            )
+        return cls(repos=repos, jobs=jobs)
+
+
+def repo_settings(settings: Settings, changes: dict[str, Any]) -> Settings:
+    """Return a copy of 'settings' with the 'changes' for one repository."""
+    if not changes:
+        return settings
+    changed = copy.copy(settings)
+    for name, value in changes.items():
+        setattr(changed, name, value)
+    return changed
+
+
+@dataclass
+class BatchJob:
+    """A repository to build, with its own settings and options."""
+
+    repo: BatchRepo
+    settings: Settings
+    options: ChangelogOptions
+
+
+@dataclass
+class BatchResult:
+    """How building the changelog of one repository went."""
+
+    full_name: str
+    exit_code: int = 0
+    changed: bool = False
+    seconds: float = 0.0
+
+    @property
+    def failed(self) -> bool:
+        """Return True if the changelog could not be built."""
+        return self.exit_code != 0
+
+
+class BatchRunner:
+    """Build the changelogs for a list of jobs, sharing what we can."""
+
+    def __init__(self, settings: Settings, jobs: int) -> None:
+        """Set up the shared caches, with 'settings' from the config file.
+
+        This needs to be created inside 'github_connections', so the clients
+        use the shared connections.
+        """
+        self.jobs = jobs
+        self.clients: dict[str, Github] = {}
+        self.profile_cache = (
+            ProfileCache(
+                get_cache_dir(settings.cache_dir) / PROFILE_CACHE_FILE,
+                settings.profile_cache_days * 24 * 60 * 60,
+            )
+            if settings.profile_cache_days > 0
+            else None
+        )
+
+    def get_client(self, settings: Settings) -> Github | None:
+        """Return the client for this PAT, made the first time it is used.
+
+        This is None if there is no PAT, which ChangeLog will report.
+        """
+        pat: str | None = getattr(settings, "github_pat", None)
+        if pat is None:
+            return None
+        if pat not in self.clients:
+            self.clients[pat] = Github(auth=Auth.Token(pat), **retry_args())
+        return self.clients[pat]
+
+    def build(self, job: BatchJob, client: Github | None) -> BatchResult:
+        """Build the changelog of one repository.
+
+        Any error only fails this repository, the rest of the batch carries on.
+        """
+        result = BatchResult(job.repo.full_name)
+        start = time.monotonic()
+        try:
+            job.repo.folder.mkdir(parents=True, exist_ok=True)
+            changelog = ChangeLog(
+                job.repo.name,
+                # 'quiet' swaps stdout, which every thread shares, so the
+                # output is hidden once for the whole batch instead.
+                {**job.options, "quiet": False},
+                settings=job.settings,
+                client=client,
+                folder=job.repo.folder,
+                profile_cache=self.profile_cache,
+            )
+            changelog.run()
+        except typer.Exit as exc:
+            result.exit_code = exc.exit_code
+        except GithubException as exc:
+            rprint(
+                f"\n[red]  X  Error {exc.status} while building "
+                f"{job.repo.full_name}\n",
+                file=sys.stderr,
+            )
+            result.exit_code = ExitErrors.GIT_ERROR
+        except Exception as exc:  # noqa: BLE001
+            rprint(
+                f"\n[red]  X  Error while building {job.repo.full_name} : "
+                f"{exc}\n",
+                file=sys.stderr,
+            )
+            result.exit_code = ExitErrors.BATCH_FAILED
+        else:
+            result.changed = changelog.changelog_changed
+        result.seconds = time.monotonic() - start
+        return result
+
+    def run(self, jobs: list[BatchJob], *, quiet: bool) -> list[BatchResult]:
+        """Build every job, returning the results in the same order.
+
+        A line is printed as each repository finishes, unless 'quiet'.
+        """
+        # the clients are made before starting, so each PAT only gets one.
+        clients = [self.get_client(job.settings) for job in jobs]
+        results: dict[int, BatchResult] = {}
+        stdout = sys.stdout
+        with contextlib.ExitStack() as stack:
+            devnull = stack.enter_context(Path(os.devnull).open("w"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+            pool = stack.enter_context(ThreadPoolExecutor(self.jobs))
+            futures = {
+                pool.submit(self.build, job, client): index
+                for index, (job, client) in enumerate(zip(jobs, clients))
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if not quiet:
+                    rprint(self.describe(result), file=stdout)
+        return [results[index] for index in range(len(jobs))]
+
+    @staticmethod
+    def describe(result: BatchResult) -> str:
+        """Return the line printed when a repository has been built."""
+        if result.failed:
+            return (
+                f"  [red]X[/red]  [bold]{result.full_name}[/bold] failed "
+                f"(error {result.exit_code})"
+            )
+        state = "updated" if result.changed else "unchanged"
+        return (
+            f"  [green]->[/green] [bold]{result.full_name}[/bold] {state} "
+            f"({result.seconds:.1f}s)"
+        )
@@ -0,0 +1,100 @@
+"""Share a request budget between every process using the same PAT.
+
+GitHub counts the rate limit per token, so several runs at once (eg a process
+pool, or CI jobs on one machine) all spend the same 5000 requests an hour, and
+sending them all at once trips the secondary limits too. With
+'shared_rate_limit' set, every request first takes a token from a bucket kept
+in a small file in the cache folder. The bucket refills at that many tokens an
+hour, and holds at most a minute's worth, so however many processes are
+running they send no more than this between them.
+
+The file is only read and written while holding a lock file, which works the
+same on every platform. A lock left behind by a process that was killed is
+removed once it is older than STALE_LOCK_SECONDS.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterator
+    from pathlib import Path
+
+# the lock is only held for as long as it takes to update a tiny file, so one
+# this old was left behind.
+STALE_LOCK_SECONDS = 10.0
+LOCK_POLL_SECONDS = 0.005
+
+
+def try_lock(path: Path) -> bool:
+    """Create the lock file at 'path', returning False if it already exists.
+
+    A stale lock is removed, so the next try can take it.
+    """
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        with contextlib.suppress(FileNotFoundError):
+            if time.time() - path.stat().st_mtime > STALE_LOCK_SECONDS:
+                path.unlink()
+        return False
+    return True
+
+
+@contextlib.contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold the lock file at 'path' for the duration of the block."""
+    while not try_lock(path):
+        time.sleep(LOCK_POLL_SECONDS)
+    try:
+        yield
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def token_key(token: str) -> str:
+    """Return the name used for a PAT's bucket, without giving the PAT away."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+class SharedBucket:
+    """A token bucket saved in a file, so other processes can draw from it."""
+
+    def __init__(self, path: Path, per_hour: int) -> None:
+        """Create the bucket at 'path', refilling at 'per_hour' tokens."""
+        self.path = path
+        self.lock_path = path.with_name(f"{path.name}.lock")
+        self.rate = per_hour / 3600
+        self.capacity = max(per_hour / 60, 1.0)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def load(self, now: float) -> float:
+        """Return the tokens in the bucket now, full if it is new."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            tokens = float(data["tokens"])
+            updated = float(data["updated"])
+        except (OSError, KeyError, TypeError, ValueError):
+            return self.capacity
+        return min(tokens + max(now - updated, 0) * self.rate, self.capacity)
+
+    def take(self) -> float:
+        """Take a token, returning how long to wait before using it.
+
+        If the bucket is empty the token is taken anyway (leaving the bucket
+        in debt), so those waiting are served in the order they asked.
+        """
+        with file_lock(self.lock_path):
+            now = time.time()
+            tokens = self.load(now) - 1
+            self.path.write_text(
+                json.dumps({"tokens": tokens, "updated": now}),
+                encoding="utf-8",
+            )
+        return 0.0 if tokens >= 0 else -tokens / self.rate
@@ -7,45 +7,103 @@ from __future__ import annotations
 
 import contextlib
 import datetime
+import io
+import itertools
 import os
 import sys
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal, NoReturn
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Literal,
+    NoReturn,
+    TextIO,
+    TypeVar,
+    overload,
+)
 
 import typer
 from github import Auth, Github, GithubException
-from github.GitRelease import GitRelease
 from rich import print as rprint
 
+from github_changelog_md.changelog.checkpoint import (
+    Checkpoint,
+    RecordCheckpoint,
+)
+from github_changelog_md.changelog.connection import (
+    SharedConnection,
+    retry_args,
+    shared_connections,
+)
+from github_changelog_md.changelog.fingerprint import (
+    Fingerprint,
+    digest,
+    digest_files,
+    digest_repr,
+    probe_remote,
+)
+from github_changelog_md.changelog.fragments import (
+    FRAGMENT_VERSION,
+    FragmentCache,
+)
+from github_changelog_md.changelog.graphql import GraphQLFetcher
+from github_changelog_md.changelog.linker import link_to_releases
+from github_changelog_md.changelog.localgit import LocalGit
+from github_changelog_md.changelog.pages import PageFetcher
+from github_changelog_md.changelog.plan import RenderPlan
+from github_changelog_md.changelog.profiles import ProfileCache, fetch_names
+from github_changelog_md.changelog.records import (
+    IssueRecord,
+    PRRecord,
+    ReleaseRecord,
+    RepoRecord,
+    UserRecord,
+    as_records,
+    to_dict,
+)
+from github_changelog_md.changelog.search import SearchFetcher
+from github_changelog_md.changelog.snapshot import Snapshot, snapshot_error
+from github_changelog_md.changelog.store import ISSUE, LocalStore
+from github_changelog_md.changelog.window import find_tail, updated_since
 from github_changelog_md.config import get_settings
 from github_changelog_md.constants import (
+    CHECKPOINT_DIR,
     CONTRIBUTORS_FILE,
+    FINGERPRINT_DIR,
+    FRAGMENT_DIR,
     IGNORED_CONTRIBUTORS,
     IGNORED_LABELS,
+    PROFILE_CACHE_FILE,
     SECTIONS,
+    STORE_FILE,
     ChangelogOptions,
     ExitErrors,
     SectionHeadings,
 )
 from github_changelog_md.helpers import (
     cap_first_letter,
+    get_cache_dir,
     get_index_of_tuple,
     get_section_name,
     header,
     title_unique,
+    write_atomic,
 )
 
 if TYPE_CHECKING:  # pragma: no cover
-    from io import TextIOWrapper
-
     from github.Commit import Commit
     from github.Issue import Issue
-    from github.NamedUser import NamedUser
     from github.PaginatedList import PaginatedList
     from github.PullRequest import PullRequest
     from github.Repository import Repository
 
+    from github_changelog_md.config.settings import Settings
+
+R = TypeVar("R", PRRecord, IssueRecord)
+
 
 def git_error(exc: GithubException) -> NoReturn:
     """Handle a Git Exception."""
@@ -57,6 +115,26 @@ def git_error(exc: GithubException) -> NoReturn:
     raise typer.Exit(ExitErrors.GIT_ERROR)
 
 
+def closed_issues(repo: Repository) -> PaginatedList[Issue]:
+    """Return the closed issues (which include PRs), newest first."""
+    return repo.get_issues(state="closed", sort="created")
+
+
+def closed_prs(repo: Repository) -> PaginatedList[PullRequest]:
+    """Return the closed PRs, newest first."""
+    return repo.get_pulls(state="closed", sort="created", direction="desc")
+
+
+def updated_issues(repo: Repository) -> PaginatedList[Issue]:
+    """Return the closed issues (which include PRs), last updated first."""
+    return repo.get_issues(state="closed", sort="updated", direction="desc")
+
+
+def updated_prs(repo: Repository) -> PaginatedList[PullRequest]:
+    """Return the closed PRs, last updated first."""
+    return repo.get_pulls(state="closed", sort="updated", direction="desc")
+
+
 @dataclass
 class ReleaseTextCache:
     """Cache release-text settings keyed by release tag."""
@@ -72,23 +150,44 @@ class ChangeLog:
 
     done_str = "[green]Done[/green]"
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         repo_name: str,
         options: ChangelogOptions,
+        snapshot: Snapshot | None = None,
+        *,
+        settings: Settings | None = None,
+        client: Github | None = None,
+        folder: Path | None = None,
+        profile_cache: ProfileCache | None = None,
     ) -> None:
-        """Initialize the class."""
-        self.settings = get_settings()
+        """Initialize the class.
 
-        try:
-            self.auth = Auth.Token(self.settings.github_pat)
-            self.git = Github(auth=self.auth)
-        except AttributeError as exc:
-            rprint(
-                "\n[red]  X  Error: No GitHub PAT found in settings file\n",
-                file=sys.stderr,
-            )
-            raise typer.Exit(ExitErrors.NO_PAT) from exc
+        If a 'snapshot' is given, the changelog is rendered from that instead
+        of fetching anything, so no GitHub PAT is needed.
+
+        The rest are used when running for several repositories at once: the
+        'settings' for this one, a 'client' and 'profile_cache' shared by all
+        of them, and the 'folder' to write the files to (and read any local
+        git clone from) rather than the current one.
+        """
+        self.settings = settings if settings is not None else get_settings()
+        self.snapshot = snapshot
+        self.folder = folder
+        self.profile_cache = profile_cache
+
+        if client is not None:
+            self.git = client
+        elif snapshot is None:
+            try:
+                self.auth = Auth.Token(self.settings.github_pat)
+                self.git = Github(auth=self.auth, **retry_args())
+            except AttributeError as exc:
+                rprint(
+                    "\n[red]  X  Error: No GitHub PAT found in settings file\n",
+                    file=sys.stderr,
+                )
+                raise typer.Exit(ExitErrors.NO_PAT) from exc
 
         self.repo_name: str = repo_name
         self.user: str | None = options["user_name"]
@@ -96,18 +195,31 @@ class ChangeLog:
 
         self.sections: list[SectionHeadings]
         self.ignored_labels: list[str]
-
-        self.repo_data: Repository
-        self.repo_releases: list[GitRelease]
-        self.repo_prs: PaginatedList[PullRequest]
-        self.repo_issues: PaginatedList[Issue]
-        self.pr_by_release: dict[int, list[PullRequest]]
-        self.issue_by_release: dict[int, list[Issue]]
-        self.prev_release: GitRelease | Literal["HEAD"] | None = None
-        self.filtered_repo_issues: list[Issue]
-        self.unreleased: list[PullRequest]
-        self.unreleased_issues: list[Issue]
-        self.contributors: list[NamedUser]
+        self.plan: RenderPlan
+        self.fragment_base: str
+
+        self.repo_data: Repository | RepoRecord
+        self.fragments: FragmentCache | None = None
+        self.graphql: GraphQLFetcher | None = None
+        self.store: LocalStore | None = None
+        self.pages: PageFetcher | None = None
+        self.search: SearchFetcher | None = None
+        self.local_git: LocalGit | None = None
+        self.repo_releases: list[ReleaseRecord]
+        self.repo_prs: list[PRRecord]
+        self.repo_issues: list[IssueRecord]
+        self.pr_by_release: dict[int, list[PRRecord]]
+        self.issue_by_release: dict[int, list[IssueRecord]]
+        self.prev_release: ReleaseRecord | Literal["HEAD"] | None = None
+        self.filtered_repo_issues: list[IssueRecord]
+        self.unreleased: list[PRRecord]
+        self.unreleased_issues: list[IssueRecord]
+        self.issue_closers: dict[int, UserRecord | None] = {}
+        # issues whose closer was already looked up, even if nobody was found.
+        self.known_closers: set[int] = set()
+        self.contributors: list[UserRecord]
+        self.changelog_changed = False
+        self.contributors_changed = False
         self.release_text_cache = ReleaseTextCache(
             yanked_by_release=self.build_release_lookup(
                 self.settings.yanked,
@@ -155,34 +267,275 @@ class ChangeLog:
         contains it's own error handling.
         """
         with contextlib.ExitStack() as stack:
-            if self.options["quiet"]:
-                devnull = stack.enter_context(Path(os.devnull).open("w"))
-                stack.enter_context(contextlib.redirect_stdout(devnull))
+            self.start(stack)
+
+            fingerprint: Fingerprint | None = None
+            if self.snapshot:
+                self.use_snapshot(self.snapshot)
+            else:
+                self.repo_data = self.get_repo_data()
+                if self.options["quick_check"]:
+                    fingerprint = self.get_fingerprint()
+                    if fingerprint == Fingerprint.load(self.fingerprint_path):
+                        rprint(
+                            "  [green]->[/green] Nothing has changed since the "
+                            "last run, so there is nothing to do\n"
+                        )
+                        return
+                self.fetch_lists(stack)
+            self.render()
+
+            # update the CONTRIBUTORS.md file if requested
+            if (
+                self.options["contributors"]
+                and self.boundary_release
+                and self.settings.contributors_source != "git"
+            ):
+                rprint(
+                    "  [green]->[/green] Not updating CONTRIBUTORS.md, as "
+                    "that needs every release\n"
+                )
+            elif self.options["contributors"]:
+                self.contributors = self.get_contributors()
+                self.update_contributors()
+
+            if fingerprint:
+                self.save_fingerprint(fingerprint)
 
-            header()
+    def render(self) -> None:
+        """Link the data we have to the releases, and write the changelog."""
+        # filter out PRs from actual issues (PR's are issues too but
+        # we don't want them in the list).
+        self.filtered_repo_issues = self.filter_issues()
 
-            self.sections = self.rename_sections(self.extend_sections())
-            self.ignored_labels = self.flatten_ignores()
+        self.pr_by_release = self.link_pull_requests()
+        self.issue_by_release = self.link_issues()
+        self.issue_closers = self.get_issue_closers()
 
+        # actually generate the changelog file from all the data we have
+        # collected.
+        self.generate_changelog()
+
+    def load(self, stack: contextlib.ExitStack) -> None:
+        """Fetch everything (or read the snapshot) and write the changelog.
+
+        This is used by 'serve', which keeps the data, and the markdown of
+        each release, to update the changelog as events come in. Anything
+        that needs closing when the server stops is added to 'stack'.
+        """
+        self.start(stack)
+        if self.snapshot:
+            self.use_snapshot(self.snapshot)
+        else:
+            self.repo_data = self.get_repo_data()
+            self.fetch_lists(stack)
+        self.fragments = FragmentCache(self.fragment_path)
+        self.render()
+
+    def run_unreleased(self) -> str:
+        """Return just the unreleased section, fetching as little as we can.
+
+        Only the latest release and the PRs and Issues updated since it are
+        fetched, so this stays quick however long the history is.
+        """
+        with contextlib.ExitStack() as stack:
+            self.start(stack)
             self.repo_data = self.get_repo_data()
-            self.repo_releases = self.get_repo_releases()
-            self.repo_prs = self.get_closed_prs()
-            self.repo_issues = self.get_closed_issues()
-            # filter out PRs from actual issues (PR's are issues too but
-            # we don't want them in the list).
+            (
+                self.repo_releases,
+                self.repo_prs,
+                self.repo_issues,
+            ) = self.fetch_recent_lists(0)
             self.filtered_repo_issues = self.filter_issues()
 
             self.pr_by_release = self.link_pull_requests()
             self.issue_by_release = self.link_issues()
+            self.issue_closers = (
+                self.resolve_closers(self.unreleased_issues)
+                if self.options["show_issues"]
+                else {}
+            )
 
-            # actually generate the changelog file from all the data we have
-            # collected.
-            self.generate_changelog()
+            f = io.StringIO()
+            self.process_unreleased(f)
+            return f.getvalue()
 
-            # update the CONTRIBUTORS.md file if requested
-            if self.options["contributors"]:
-                self.contributors = self.get_contributors()
-                self.update_contributors()
+    def start(self, stack: contextlib.ExitStack) -> None:
+        """Set up the output and the sections, before fetching anything.
+
+        Anything that needs closing when we are done is added to 'stack'.
+        """
+        if self.options["quiet"]:
+            devnull = stack.enter_context(Path(os.devnull).open("w"))  # noqa: SIM115
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+
+        if self.snapshot is None and not SharedConnection.installed:
+            # the lists are fetched at the same time, which is only safe with
+            # the shared connections. The commands set these up before making
+            # the client, so this is for when ChangeLog is used on its own.
+            stack.enter_context(shared_connections())
+            self.git = Github(**self.git.requester.kwargs)
+
+        header()
+
+        self.sections = self.rename_sections(self.extend_sections())
+        self.ignored_labels = self.flatten_ignores()
+        self.plan = self.compile_plan()
+
+    def fetch_data(self, stack: contextlib.ExitStack) -> Repository:
+        """Fetch the repository, releases, PRs and Issues from GitHub."""
+        repo_data = self.get_repo_data()
+        self.repo_data = repo_data
+        self.fetch_lists(stack)
+        return repo_data
+
+    def fetch_lists(self, stack: contextlib.ExitStack) -> None:
+        """Fetch the releases, PRs and Issues of 'repo_data' from GitHub."""
+        if self.options["max_releases"]:
+            (
+                self.repo_releases,
+                self.repo_prs,
+                self.repo_issues,
+            ) = self.fetch_recent_lists(self.options["max_releases"])
+        elif self.settings.local_store:
+            store_path = get_cache_dir(self.settings.cache_dir) / STORE_FILE
+            self.store = stack.enter_context(
+                contextlib.closing(LocalStore(store_path))
+            )
+            (
+                self.repo_releases,
+                self.repo_prs,
+                self.repo_issues,
+            ) = self.sync_local_store(self.store)
+        else:
+            (
+                self.repo_releases,
+                self.repo_prs,
+                self.repo_issues,
+            ) = self.fetch_repo_lists()
+        self.print_budget()
+
+    def use_snapshot(self, snapshot: Snapshot) -> None:
+        """Use the data saved in a snapshot instead of fetching it."""
+        self.repo_data = snapshot.repo
+        self.repo_releases = self.window_releases(list(snapshot.releases))
+        self.repo_prs = snapshot.pull_requests
+        self.repo_issues = snapshot.issues
+        fetched_at = snapshot.fetched_at.astimezone().strftime("%Y-%m-%d %H:%M")
+        rprint(
+            f"  [green]->[/green] Using snapshot of [bold]"
+            f"{snapshot.repo.full_name}[/bold] from {fetched_at}",
+        )
+
+    def save_snapshot(self, path: Path) -> None:
+        """Fetch everything needed to render the changelog into a snapshot.
+
+        Who closed each issue and the names of the PR authors are resolved
+        here too, so that rendering the snapshot never needs to ask GitHub for
+        anything.
+        """
+        with contextlib.ExitStack() as stack:
+            self.start(stack)
+            repo_data = self.fetch_data(stack)
+            self.filtered_repo_issues = self.filter_issues()
+            closers = self.resolve_closers(self.filtered_repo_issues)
+            authors = {
+                user.login: user
+                for user in self.resolve_names(
+                    list(
+                        {
+                            pr.user.login: pr.user for pr in self.repo_prs
+                        }.values()
+                    )
+                )
+            }
+
+            first_commit_at = (
+                None if self.repo_releases else self.get_latest_release_date()
+            )
+            snapshot = Snapshot(
+                repo=RepoRecord.from_github(repo_data, first_commit_at),
+                fetched_at=datetime.datetime.now(tz=datetime.timezone.utc),
+                releases=self.repo_releases,
+                pull_requests=[
+                    replace(pr, user=authors[pr.user.login])
+                    for pr in self.repo_prs
+                ],
+                issues=[
+                    replace(issue, closed_by=closers.get(issue.number))
+                    for issue in self.filtered_repo_issues
+                ],
+            )
+
+            rprint("  [green]->[/green] Saving snapshot ... ", end="")
+            snapshot.save(path)
+            rprint(self.done_str)
+            rprint(
+                f"  [green]->[/green] Snapshot saved to [bold]{path}[/bold]\n",
+            )
+
+    @property
+    def fingerprint_path(self) -> Path:
+        """Return where the fingerprint of the last run is saved."""
+        return (
+            get_cache_dir(self.settings.cache_dir)
+            / FINGERPRINT_DIR
+            / f"{self.repo_data.full_name.replace('/', '--')}.json"
+        )
+
+    def output_paths(self) -> list[Path]:
+        """Return the files that a run writes."""
+        paths = [self.local_path(self.options["output_file"])]
+        if self.options["contributors"]:
+            paths.append(self.local_path(CONTRIBUTORS_FILE))
+        return paths
+
+    def local_path(self, name: str) -> Path:
+        """Return the path of a file we write, in 'folder' if one was given."""
+        return (self.folder or Path.cwd()) / name
+
+    def get_fingerprint(self) -> Fingerprint:
+        """Probe GitHub, and return the fingerprint of what this run would use.
+
+        The output files are as they are now, so a changelog that was edited
+        or deleted since the last run is generated again.
+        """
+        rprint("  [green]->[/green] Checking GitHub for changes ... ", end="")
+        try:
+            remote = probe_remote(self.git.requester, self.github_repo.url)
+        except GithubException as exc:
+            git_error(exc)
+        if self.local_git:
+            # the releases come from the tags, so check those instead.
+            remote["release"] = [
+                to_dict(release) for release in self.local_git.get_releases()
+            ]
+        rprint(self.done_str)
+        settings = {
+            key: value
+            for key, value in self.settings.get_attrs().items()
+            if key != "github_pat"
+        }
+        return Fingerprint(
+            remote=digest(remote),
+            config=digest({"settings": settings, "options": self.options}),
+            output=digest_files(self.output_paths()),
+        )
+
+    def save_fingerprint(self, fingerprint: Fingerprint) -> None:
+        """Save the fingerprint, with the files that were just written."""
+        replace(fingerprint, output=digest_files(self.output_paths())).save(
+            self.fingerprint_path
+        )
+
+    @property
+    def github_repo(self) -> Repository:
+        """Return the repository on GitHub, for the steps that fetch data."""
+        if isinstance(self.repo_data, RepoRecord):
+            snapshot_error(
+                "This needs GitHub, so can't be done from a snapshot"
+            )
+        return self.repo_data
 
     def flatten_ignores(self) -> list[str]:
         """Process the ignored labels.
@@ -205,6 +558,12 @@ class ChangeLog:
 
         return ignored_labels
 
+    def compile_plan(self) -> RenderPlan:
+        """Compile the sections and ignore settings used while rendering."""
+        return RenderPlan.compile(
+            self.sections, self.ignored_labels, self.options["ignore_items"]
+        )
+
     def rename_sections(
         self, sections: list[SectionHeadings]
     ) -> list[SectionHeadings]:
@@ -250,17 +609,22 @@ class ChangeLog:
             SECTIONS[:insert_index] + extend_sections + SECTIONS[insert_index:]
         )
 
-    def get_contributors(self) -> list[NamedUser]:
+    def get_contributors(self) -> list[UserRecord]:
         """This will get all the contributors to the repo.
 
-        It will return a list of NamedUser objects, getting these from the list
-        of PRs and Issues, removing any duplicates
+        It will return a list of UserRecords, getting these from the list
+        of PRs and Issues, removing any duplicates. With 'contributors_source'
+        set to 'git' they are the authors in the local history instead.
         """
-        user_list: list[NamedUser] = []
         rprint("  [green]->[/green] Getting Contributors ... ", end="")
-        for pr in self.repo_prs:
-            if pr.user not in user_list:
-                user_list.append(pr.user)
+        if self.settings.contributors_source == "git":
+            local_git = self.local_git or self.open_local_git(self.repo_data)
+            user_list = local_git.get_contributors()
+        else:
+            users: dict[str, UserRecord] = {}
+            for pr in self.repo_prs:
+                users.setdefault(pr.user.login, pr.user)
+            user_list = self.resolve_names(list(users.values()))
         rprint(self.done_str)
 
         rprint("  [green]->[/green] Sorting Contributors ... ", end="")
@@ -269,27 +633,81 @@ class ChangeLog:
 
         return user_list
 
+    def open_local_git(self, repo_data: Repository | RepoRecord) -> LocalGit:
+        """Return the local clone, once we know it is of this repository."""
+        local_git = LocalGit(repo_data.html_url, self.folder)
+        local_git.check_clone(repo_data.name)
+        return local_git
+
+    def resolve_names(self, users: list[UserRecord]) -> list[UserRecord]:
+        """Fill in the display name of each user, where we don't have it.
+
+        GraphQL records already carry the names, and so do snapshots as they
+        were resolved when it was saved. Otherwise they are read from the
+        profile cache, and any that are not there (or are too old) are looked
+        up in batches.
+        """
+        if self.graphql or self.snapshot:
+            return users
+        logins = {
+            user.login
+            for user in users
+            if not user.name and user.login not in IGNORED_CONTRIBUTORS
+        }
+        if not logins:
+            return users
+
+        cache = self.profile_cache
+        if cache is None and self.settings.profile_cache_days > 0:
+            cache = ProfileCache(
+                get_cache_dir(self.settings.cache_dir) / PROFILE_CACHE_FILE,
+                self.settings.profile_cache_days * 24 * 60 * 60,
+            )
+        names = cache.get_names(logins) if cache else {}
+        missing = logins - names.keys()
+        if missing:
+            try:
+                fetched = fetch_names(self.git.requester, missing)
+            except GithubException as exc:
+                git_error(exc)
+            names.update(fetched)
+            if cache:
+                cache.update(fetched)
+                cache.save()
+        return [
+            replace(user, name=names[user.login])
+            if user.login in names
+            else user
+            for user in users
+        ]
+
     def update_contributors(self) -> None:
         """Update the CONTRIBUTORS.md file."""
         rprint("  [green]->[/green] Updating CONTRIBUTORS.md ... ", end="")
-        with Path(Path.cwd() / CONTRIBUTORS_FILE).open(
-            mode="w",
-            encoding="utf-8",
-        ) as f:
-            f.write("# Contributors\n\n")
+        f = io.StringIO()
+        f.write("# Contributors\n\n")
+        f.write(
+            "The following people have contributed to the development "
+            f"of {self.repo_data.name}:\n\n"
+        )
+        for contributor in self.contributors:
+            if contributor.login in IGNORED_CONTRIBUTORS:
+                continue
+            name = contributor.name or contributor.login
+            if not contributor.login:
+                # an author from the git history, with no known GitHub login.
+                f.write(f"- {name}\n")
+                continue
             f.write(
-                "The following people have contributed to the development "
-                f"of {self.repo_data.name}:\n\n"
+                f"- {name} ([@{contributor.login}]({contributor.html_url}))\n",
             )
-            for contributor in self.contributors:
-                if contributor.login in IGNORED_CONTRIBUTORS:
-                    continue
-                name = contributor.name or contributor.login
-                f.write(
-                    f"- {name} "
-                    f"([@{contributor.login}]({contributor.html_url}))\n",
-                )
-        rprint(self.done_str, "\n")
+        self.contributors_changed = write_atomic(
+            self.local_path(CONTRIBUTORS_FILE), f.getvalue()
+        )
+        if self.contributors_changed:
+            rprint(self.done_str, "\n")
+        else:
+            rprint("[green]Unchanged[/green]", "\n")
 
     def generate_changelog(self) -> None:
         """Generate a markdown changelog using the data we have gererated."""
@@ -299,49 +717,189 @@ class ChangeLog:
                 f"{', '.join(self.options['skip_releases'])}",
             )
 
+        output_path = self.local_path(self.options["output_file"])
+        tail = self.existing_tail(output_path)
+
         rprint("  [green]->[/green] Generating Changelog ... ", end="")
 
-        with Path(Path.cwd() / self.options["output_file"]).open(
-            mode="w",
-            encoding="utf-8",
-        ) as f:
-            f.write("# Changelog\n\n")
+        # the whole changelog is built in memory and then written in one go,
+        # so a failed run never leaves a half-written file behind.
+        f = io.StringIO()
+        f.write("# Changelog\n\n")
 
-            if self.settings.intro_text:
-                f.write(f"{self.settings.intro_text}\n\n")
+        if self.settings.intro_text:
+            f.write(f"{self.settings.intro_text}\n\n")
 
-            if not self.options["show_depends"]:
-                f.write(
-                    "*Dependency updates are excluded from this changelog, "
-                    "check each `Full Changelog` for details.*\n\n "
-                )
+        if not self.options["show_depends"]:
+            f.write(
+                "*Dependency updates are excluded from this changelog, "
+                "check each `Full Changelog` for details.*\n\n "
+            )
 
-            self.prev_release = None
+        self.prev_release = None
 
-            if self.options["show_unreleased"]:
-                self.process_unreleased(f)
+        if self.options["show_unreleased"]:
+            self.process_unreleased(f)
 
-            for release in self.repo_releases:
-                self.process_release(f, release)
-                self.prev_release = release
+        fragments = self.open_fragment_cache()
+        boundary = self.boundary_release
+        for release in self.repo_releases:
+            if release is boundary:
+                break
+            self.render_release(f, release, fragments)
+            self.prev_release = release
 
-            # add a link to this generator at the bottom of the changelog
-            f.write(
-                "---\n"
-                "*This changelog was generated using "
-                "[github-changelog-md](http://changelog.seapagan.net/) "
-                "by [Seapagan](https://github.com/seapagan)*\n",
-            )
+        self.write_footer(f, tail)
+        self.changelog_changed = write_atomic(output_path, f.getvalue())
 
         rprint(self.done_str)
-        rprint(
-            f"  [green]->[/green] Changelog generated to "
-            f"[bold]{Path.cwd() / self.options['output_file']}[/bold]\n",
+        if self.changelog_changed:
+            rprint(
+                f"  [green]->[/green] Changelog generated to "
+                f"[bold]{output_path}[/bold]\n",
+            )
+        else:
+            rprint(
+                f"  [green]->[/green] Changelog unchanged, [bold]{output_path}"
+                "[/bold] was not rewritten\n",
+            )
+        if fragments and self.settings.fragment_cache:
+            self.save_fragments(fragments)
+        if fragments and fragments.hits:
+            rprint(
+                f"  [green]->[/green] Reused [green]{fragments.hits}[/green] "
+                f"of {len(self.repo_releases)} releases from the cache\n",
+            )
+
+    def save_fragments(self, fragments: FragmentCache) -> None:
+        """Save the release cache, after the changelog has been written.
+
+        The cache is only there to save time, so if it can't be written we
+        say so and carry on, and the next run renders every release.
+        """
+        try:
+            fragments.save()
+        except OSError as exc:
+            rprint(
+                "  [yellow]->[/yellow] Could not save the release cache to "
+                f"[bold]{fragments.path}[/bold]: {exc}\n",
+            )
+
+    def write_footer(self, f: TextIO, tail: str | None) -> None:
+        """Finish the changelog, with the older releases if we kept them."""
+        boundary = self.boundary_release
+        if boundary and tail is not None:
+            # the older releases are kept as they are, after the link to the
+            # diff of the last release we rendered.
+            self.process_release_start(f, boundary)
+            f.write(tail)
+            return
+        # add a link to this generator at the bottom of the changelog
+        f.write(
+            "---\n"
+            "*This changelog was generated using "
+            "[github-changelog-md](http://changelog.seapagan.net/) "
+            "by [Seapagan](https://github.com/seapagan)*\n",
+        )
+
+    def open_fragment_cache(self) -> FragmentCache | None:
+        """Open the cache of rendered releases, if it is turned on.
+
+        Everything that affects every release is hashed once here, and each
+        release then adds its own inputs to this in 'fragment_key'.
+        """
+        if not self.settings.fragment_cache and self.fragments is None:
+            return None
+        self.fragment_base = digest(
+            {
+                "version": FRAGMENT_VERSION,
+                "repo": self.repo_data.html_url,
+                "options": self.options,
+                "date_format": self.settings.date_format,
+                "sections": self.sections,
+                "ignored_labels": sorted(self.plan.ignored_labels),
+            }
         )
+        if self.fragments is not None:
+            # kept in memory between renders by 'serve'.
+            self.fragments.restart()
+            return self.fragments
+        return FragmentCache(self.fragment_path)
+
+    @property
+    def fragment_path(self) -> Path:
+        """Return where the rendered releases are saved between runs."""
+        return (
+            get_cache_dir(self.settings.cache_dir)
+            / FRAGMENT_DIR
+            / f"{self.repo_data.full_name.replace('/', '--')}.json"
+        )
+
+    def fragment_key(
+        self, release: ReleaseRecord, fragments: FragmentCache
+    ) -> str:
+        """Return the hash of everything that goes into rendering 'release'.
+
+        Each record is hashed once by 'fragments', and this is the hash of
+        those hashes with everything else the release depends on.
+        """
+        tag = release.tag_name
+        text = self.release_text_cache
+        issues = self.issue_by_release.get(release.id, [])
+        closers = [self.issue_closers.get(issue.number) for issue in issues]
+        return digest_repr(
+            (
+                self.fragment_base,
+                fragments.record_digest(release),
+                (
+                    self.prev_release.tag_name
+                    if isinstance(self.prev_release, ReleaseRecord)
+                    else self.prev_release
+                ),
+                tuple(
+                    fragments.record_digest(pr)
+                    for pr in self.pr_by_release.get(release.id, [])
+                ),
+                # who closed each issue is in 'closers', however it was found.
+                tuple(
+                    fragments.record_digest(issue, ("closed_by",))
+                    for issue in issues
+                ),
+                tuple(
+                    fragments.record_digest(closer) if closer else None
+                    for closer in closers
+                ),
+                (
+                    text.yanked_by_release.get(tag),
+                    text.release_text_before_by_release.get(tag),
+                    text.release_text_by_release.get(tag),
+                    text.release_overrides_by_release.get(tag),
+                ),
+            )
+        )
+
+    def render_release(
+        self,
+        f: TextIO,
+        release: ReleaseRecord,
+        fragments: FragmentCache | None,
+    ) -> None:
+        """Write a release, reusing the cached markdown if nothing changed."""
+        if fragments is None:
+            self.process_release(f, release)
+            return
+        key = self.fragment_key(release, fragments)
+        text = fragments.get(key)
+        if text is None:
+            buffer = io.StringIO()
+            self.process_release(buffer, release)
+            text = buffer.getvalue()
+            fragments.put(key, text)
+        f.write(text)
 
     def process_unreleased(
         self,
-        f: TextIOWrapper,
+        f: TextIO,
     ) -> None:
         """Process the unreleased PRs and Issues into the changelog."""
         if self.unreleased or self.unreleased_issues:
@@ -377,20 +935,13 @@ class ChangeLog:
 
     def process_release(
         self,
-        f: TextIOWrapper,
-        release: GitRelease,
+        f: TextIO,
+        release: ReleaseRecord,
     ) -> None:
         """Process a single release."""
-        if (
-            self.options["skip_releases"]
-            and release.tag_name.strip() in self.options["skip_releases"]
-        ):
+        if self.is_skipped(release):
             return
-        if self.prev_release:
-            self.generate_diff_url(f, self.prev_release, release)
-
-        # show any text before this release if it exists
-        self.show_before_text(f, release)
+        self.process_release_start(f, release)
 
         text_date = release.created_at.date().strftime(
             self.settings.date_format
@@ -408,8 +959,8 @@ class ChangeLog:
         if title_unique(release):
             f.write(f"**_{cap_first_letter(release.title.strip())}_**\n\n")
 
-        pr_list: list[PullRequest] = self.pr_by_release.get(release.id, [])
-        issue_list: list[Issue] = self.issue_by_release.get(release.id, [])
+        pr_list = self.pr_by_release.get(release.id, [])
+        issue_list = self.issue_by_release.get(release.id, [])
 
         # show any release text that is defined for this release
         self.show_release_text(f, release)
@@ -433,7 +984,19 @@ class ChangeLog:
         if not issue_list and not pr_list:
             self.get_release_body(f, release)
 
-    def check_yanked(self, f: TextIOWrapper, release: GitRelease) -> None:
+    def process_release_start(self, f: TextIO, release: ReleaseRecord) -> None:
+        """Write what comes before the heading of a release.
+
+        That is the diff link for the newer release above it, and any text
+        to show before this release.
+        """
+        if self.prev_release:
+            self.generate_diff_url(f, self.prev_release, release)
+
+        # show any text before this release if it exists
+        self.show_before_text(f, release)
+
+    def check_yanked(self, f: TextIO, release: ReleaseRecord) -> None:
         """Note if this release has been yanked, and the reason why."""
         if release.tag_name in self.release_text_cache.yanked_by_release:
             f.write(" **[`YANKED`]**\n\n")
@@ -444,7 +1007,7 @@ class ChangeLog:
                 f"{self.release_text_cache.yanked_by_release[release.tag_name]}"
             )
 
-    def show_before_text(self, f: TextIOWrapper, release: GitRelease) -> None:
+    def show_before_text(self, f: TextIO, release: ReleaseRecord) -> None:
         """Shows text before this release if it exists."""
         if (
             release.tag_name
@@ -460,14 +1023,11 @@ class ChangeLog:
 
     def show_release_text(
         self,
-        f: TextIOWrapper,
-        release: str | GitRelease,
+        f: TextIO,
+        release: str | ReleaseRecord,
     ) -> None:
         """Print the release_text if it exists."""
-        if isinstance(release, GitRelease):
-            tag_name = release.tag_name
-        else:
-            tag_name = release
+        tag_name = release if isinstance(release, str) else release.tag_name
 
         if tag_name in self.release_text_cache.release_text_by_release:
             f.write(self.release_text_cache.release_text_by_release[tag_name])
@@ -475,8 +1035,8 @@ class ChangeLog:
 
     def get_release_body(
         self,
-        f: TextIOWrapper,
-        release: GitRelease,
+        f: TextIO,
+        release: ReleaseRecord,
     ) -> None:
         """Read the GitHub release body.
 
@@ -503,8 +1063,8 @@ class ChangeLog:
 
     def rprint_issues(
         self,
-        f: TextIOWrapper,
-        issue_list: list[Issue],
+        f: TextIO,
+        issue_list: list[IssueRecord],
     ) -> None:
         """Print all the closed issues for a given release."""
         visible_issues = self.ignore_items(list(issue_list))
@@ -513,22 +1073,19 @@ class ChangeLog:
 
         f.write("**Closed Issues**\n\n")
         for issue in self.get_sorted_items(visible_issues):
-            if any(
-                label.name.lower() in self.ignored_labels
-                for label in issue.labels
-            ):
+            if self.plan.is_ignored(issue):
                 continue
             escaped_title = cap_first_letter(
                 issue.title.replace("__", "\\_\\_").strip(),
             )
-            try:
+            closed_by = self.issue_closers.get(issue.number)
+            if closed_by:
                 f.write(
                     f"- {escaped_title} "
                     f"([#{issue.number}]({issue.html_url})) "
-                    f"by [{issue.closed_by.login}]"
-                    f"({issue.closed_by.html_url})\n",
+                    f"by [{closed_by.login}]({closed_by.html_url})\n",
                 )
-            except AttributeError:
+            else:
                 # this means the issue was closed by a user who has since been
                 # deleted, or it was converted to a discussion. We can't get any
                 # info on them.
@@ -539,12 +1096,12 @@ class ChangeLog:
 
     def generate_diff_url(
         self,
-        f: TextIOWrapper,
-        prev_release: GitRelease | str,
-        release_tag: GitRelease,
+        f: TextIO,
+        prev_release: ReleaseRecord | str,
+        release_tag: ReleaseRecord,
     ) -> None:
         """Generate a GitHub 3-dots link to the diff between two releases."""
-        if isinstance(prev_release, GitRelease):
+        if not isinstance(prev_release, str):
             prev_release = prev_release.tag_name
         elif self.options["next_release"]:
             prev_release = self.options["next_release"]
@@ -567,8 +1124,8 @@ class ChangeLog:
 
     def rprint_prs(
         self,
-        f: TextIOWrapper,
-        pr_list: list[PullRequest],
+        f: TextIO,
+        pr_list: list[PRRecord],
     ) -> None:
         """Print all the PRs for a given release.
 
@@ -579,30 +1136,6 @@ class ChangeLog:
 
         release_sections = self.get_release_sections(pr_list)
 
-        # default section for PRs that don't have any of the specific labels we
-        # have defined for section headings. This may be able to be merged with
-        # the above dict comprehension?
-
-        # find the new section title
-
-        merged_section_title = next(
-            (section[0] for section in self.sections if section[1] is None),
-            "Merged Pull Requests",
-        )
-        release_sections[merged_section_title] = [
-            pr
-            for pr in pr_list
-            if not any(
-                section_label
-                in [pr_label.name.lower() for pr_label in pr.labels]
-                for _, section_label in self.sections
-            )
-            and not any(
-                pr_label.name.lower() in self.ignored_labels
-                for pr_label in pr.labels
-            )
-        ]
-
         for heading, prs in release_sections.items():
             is_dependencies = heading == get_section_name("dependencies")
             if is_dependencies and not self.options["show_depends"]:
@@ -639,18 +1172,9 @@ class ChangeLog:
                     )
                 f.write("\n")
 
-    def ignore_items(
-        self, items: list[PullRequest | Issue]
-    ) -> list[PullRequest | Issue]:
+    def ignore_items(self, items: list[Any]) -> list[Any]:
         """Ignore any PRs or Issues that have been marked as hidden."""
-        if not self.options["ignore_items"]:
-            return items
-        return [
-            item
-            for item in items
-            if item.number not in self.options["ignore_items"]
-            and "[no changelog]" not in item.title.lower()
-        ]
+        return [item for item in items if not self.plan.is_hidden(item)]
 
     def get_sorted_items(self, items: list[Any]) -> list[Any]:
         """Sort the PRs or Issues into the required order."""
@@ -662,28 +1186,16 @@ class ChangeLog:
         return items
 
     def get_release_sections(
-        self, pr_list: list[PullRequest]
-    ) -> dict[str, list[PullRequest]]:
+        self, pr_list: list[PRRecord]
+    ) -> dict[str, list[PRRecord]]:
         """Return a dictionary of PRs sorted into sections.
 
-        This handles the PRs that have a label, we handle the PRs that don't
-        have a label separately.
+        PRs that don't have any of the section labels go in the default
+        'Merged Pull Requests' section (or whatever it has been renamed to).
         """
-        return {
-            heading: [
-                pr
-                for pr in pr_list
-                if section_label
-                in [pr_label.name.lower() for pr_label in pr.labels]
-                and not any(
-                    pr_label.name.lower() in self.ignored_labels
-                    for pr_label in pr.labels
-                )
-            ]
-            for heading, section_label in self.sections
-        }
+        return self.plan.classify(pr_list)
 
-    def link_issues(self) -> dict[int, list[Issue]]:
+    def link_issues(self) -> dict[int, list[IssueRecord]]:
         """Link Issues to their respective Release.
 
         This will create a dictionary with the key on the release id and
@@ -694,48 +1206,101 @@ class ChangeLog:
             "Release ... ",
             end="",
         )
-        issue_by_release: dict[int, list[Issue]] = {}
-        seen: set[int] = set()
-        for release in self.repo_releases[::-1]:
-            issue_by_release[release.id] = []
-            for issue in self.filtered_repo_issues:
-                if (
-                    issue.closed_at
-                    and issue.closed_at <= release.created_at
-                    and issue.id not in seen
-                    and issue.user.login not in self.settings.ignored_users
-                ):
-                    issue_by_release[release.id].append(issue)
-                    seen.add(issue.id)
+        # Any issue more recent than the last release goes in a specific list.
+        # We need some special handling if there are no releases yet.
+        issue_by_release, self.unreleased_issues = link_to_releases(
+            self.repo_releases,
+            (
+                issue
+                for issue in self.filtered_repo_issues
+                if issue.user.login not in self.settings.ignored_users
+            ),
+            lambda issue: issue.closed_at,
+            self.get_latest_release_date(),
+        )
 
-        # Add any issue more recent than the last release to a specific
-        # list. We need some special handling if there are no releases yet.
-        last_release_date = self.get_latest_release_date()
+        rprint(self.done_str)
+        return issue_by_release
+
+    def get_issue_closers(self) -> dict[int, UserRecord | None]:
+        """Resolve who closed each issue that will be in the changelog.
+
+        This is done in bulk before rendering, since reading 'closed_by' from a
+        REST issue makes PyGithub fetch the whole issue again, one by one.
+        """
+        if not self.options["show_issues"]:
+            return {}
 
-        self.unreleased_issues = [
+        linked_issues = [
             issue
-            for issue in self.filtered_repo_issues
-            if issue.closed_at
-            and issue.closed_at > last_release_date
-            and issue.id not in seen
-            and issue.user.login not in self.settings.ignored_users
+            for issue_list in self.issue_by_release.values()
+            for issue in issue_list
+        ] + self.unreleased_issues
+        return self.resolve_closers(linked_issues)
+
+    def resolve_closers(
+        self, issues: list[IssueRecord]
+    ) -> dict[int, UserRecord | None]:
+        """Return who closed each of the issues.
+
+        When rendering a snapshot these were all resolved when it was saved,
+        so we never ask GitHub.
+        """
+        rprint("  [green]->[/green] Resolving Issue closers ... ", end="")
+        # GraphQL records (and any saved in the local store) may already carry
+        # the closer, so there is no need to ask for those again.
+        closers: dict[int, UserRecord | None] = {
+            issue.number: issue.closed_by for issue in issues if issue.closed_by
+        }
+        missing = [
+            issue.number
+            for issue in issues
+            if issue.number not in closers
+            and issue.number not in self.known_closers
         ]
-
+        if missing and not self.graphql and not self.snapshot:
+            try:
+                resolved = GraphQLFetcher(
+                    self.git.requester,
+                    self.github_repo.owner.login,
+                    self.github_repo.name,
+                ).get_issue_closers(missing)
+            except GithubException as exc:
+                git_error(exc)
+            closers.update(resolved)
+            if self.store:
+                self.store.save(
+                    self.repo_data.full_name,
+                    ISSUE,
+                    [
+                        replace(issue, closed_by=resolved[issue.number])
+                        for issue in issues
+                        if resolved.get(issue.number)
+                    ],
+                )
+                self.store.commit()
         rprint(self.done_str)
-        return issue_by_release
+        return closers
 
-    def get_latest_release_date(self) -> datetime.date:
+    def get_latest_release_date(self) -> datetime.datetime:
         """Return the date of the latest release."""
         try:
             last_release_date = self.repo_releases[-1].created_at
         except IndexError:
             # there have been no releases yet, so we need to get the date of
             # the first commit.
-            first_commit: Commit = self.repo_data.get_commits().reversed[0]
+            if (
+                isinstance(self.repo_data, RepoRecord)
+                and self.repo_data.first_commit_at
+            ):
+                return self.repo_data.first_commit_at
+            if self.local_git:
+                return self.local_git.first_commit_date()
+            first_commit: Commit = self.github_repo.get_commits().reversed[0]
             last_release_date = first_commit.commit.committer.date
         return last_release_date
 
-    def link_pull_requests(self) -> dict[int, list[PullRequest]]:
+    def link_pull_requests(self) -> dict[int, list[PRRecord]]:
         """Link Pull Requests to their respective Release.
 
         This will create a dictionary with the key on the release id and
@@ -746,35 +1311,22 @@ class ChangeLog:
             "Release ... ",
             end="",
         )
-        pr_by_release: dict[int, list[PullRequest]] = {}
-        seen: set[int] = set()
-        for release in self.repo_releases[::-1]:
-            pr_by_release[release.id] = []
-            for pr in self.repo_prs:
-                if (
-                    pr.merged_at
-                    and pr.merged_at <= release.created_at
-                    and pr.id not in seen
-                    and pr.user.login not in self.settings.ignored_users
-                ):
-                    pr_by_release[release.id].append(pr)
-                    seen.add(pr.id)
-        # Add any pull request more recent than the last release to a specific
+        # Any pull request more recent than the last release goes in a specific
         # list. We need some special handling if there are no releases yet.
-        last_release_date = self.get_latest_release_date()
-
-        self.unreleased = [
-            pr
-            for pr in self.repo_prs
-            if pr.merged_at
-            and pr.merged_at > last_release_date
-            and pr.id not in seen
-            and pr.user.login not in self.settings.ignored_users
-        ]
+        pr_by_release, self.unreleased = link_to_releases(
+            self.repo_releases,
+            (
+                pr
+                for pr in self.repo_prs
+                if pr.user.login not in self.settings.ignored_users
+            ),
+            lambda pr: pr.merged_at,
+            self.get_latest_release_date(),
+        )
         rprint(self.done_str)
         return pr_by_release
 
-    def filter_issues(self) -> list[Issue]:
+    def filter_issues(self) -> list[IssueRecord]:
         """Filter out non-merged PRs and actual issues."""
         rprint("\n  [green]->[/green] Filtering Issues from PRs... ", end="")
         filtered_repo_issues = [
@@ -789,43 +1341,319 @@ class ChangeLog:
         )
         return filtered_repo_issues
 
-    def get_closed_issues(self) -> PaginatedList[Issue]:
+    def sync_local_store(
+        self, store: LocalStore
+    ) -> tuple[list[ReleaseRecord], list[PRRecord], list[IssueRecord]]:
+        """Update the local store from GitHub and return its contents."""
+        rprint("  [green]->[/green] Syncing local store ... ", end="")
+        try:
+            result = store.sync(self.github_repo)
+        except GithubException as exc:
+            git_error(exc)
+        rprint(f"[green]{result.updated} Updated[/green]")
+        rprint(
+            f"  [green]->[/green] Found [green]{len(result.releases)}[/green] "
+            f"Releases, [green]{len(result.pull_requests)}[/green] PRs and "
+            f"[green]{len(result.issues)}[/green] Issues",
+        )
+        return list(result.releases), result.pull_requests, result.issues
+
+    def get_closed_issues(self) -> list[IssueRecord]:
         """Get info on all the closed issues from GitHub."""
-        rprint("  [green]->[/green] Getting Closed Issues ... ", end="")
+        checkpoint: Checkpoint | None = None
         try:
-            repo_issues = self.repo_data.get_issues(
-                state="closed",
-                sort="created",
-            )
+            if self.graphql:
+                checkpoint = self.open_checkpoint("Closed Issues")
+                issues = list(self.graphql.get_issues(checkpoint))
+            elif self.search:
+                issues = list(self.search.get_issues())
+            elif self.pages:
+                checkpoint = self.open_checkpoint("Closed Issues", IssueRecord)
+                issues = self.pages.fetch(
+                    closed_issues,
+                    closed_issues(self.github_repo).totalCount,
+                    IssueRecord,
+                    checkpoint,
+                )
+            else:
+                issues = as_records(
+                    closed_issues(self.github_repo), IssueRecord
+                )
         except GithubException as exc:
             git_error(exc)
         else:
-            rprint(f"[green]{repo_issues.totalCount} Found[/green]")
-            return repo_issues
+            if checkpoint:
+                checkpoint.remove()
+            self.print_found("Closed Issues", len(issues))
+            return issues
 
-    def get_closed_prs(self) -> PaginatedList[PullRequest]:
+    def get_closed_prs(self) -> list[PRRecord]:
         """Get info on all the closed PRs from GitHub."""
-        rprint("  [green]->[/green] Getting Closed PRs ... ", end="")
+        checkpoint: Checkpoint | None = None
         try:
-            repo_prs = self.repo_data.get_pulls(
-                state="closed", sort="created", direction="desc"
+            if self.graphql:
+                checkpoint = self.open_checkpoint("Closed PRs")
+                prs = list(self.graphql.get_pull_requests(checkpoint))
+            elif self.search:
+                prs = list(self.search.get_pull_requests())
+            elif self.pages:
+                checkpoint = self.open_checkpoint("Closed PRs", PRRecord)
+                prs = self.pages.fetch(
+                    closed_prs,
+                    closed_prs(self.github_repo).totalCount,
+                    PRRecord,
+                    checkpoint,
+                )
+            else:
+                prs = as_records(closed_prs(self.github_repo), PRRecord)
+        except GithubException as exc:
+            git_error(exc)
+        else:
+            if checkpoint:
+                checkpoint.remove()
+            self.print_found("Closed PRs", len(prs))
+            return prs
+
+    @overload
+    def open_checkpoint(self, name: str) -> Checkpoint | None: ...
+
+    @overload
+    def open_checkpoint(
+        self, name: str, record_type: type[PRRecord | IssueRecord]
+    ) -> RecordCheckpoint | None: ...
+
+    def open_checkpoint(
+        self,
+        name: str,
+        record_type: type[PRRecord | IssueRecord] | None = None,
+    ) -> Checkpoint | None:
+        """Open the checkpoint for one list, if checkpoints are turned on.
+
+        REST pages are saved as records of 'record_type', GraphQL pages as
+        they come back. Anything that changes what is in each page is part of
+        the key, so a checkpoint saved differently is not used.
+        """
+        if not self.settings.checkpoints:
+            return None
+        key = {
+            "repo": self.repo_data.full_name,
+            "list": name,
+            "backend": self.settings.backend,
+            "per_page": self.git.per_page,
+        }
+        path = (
+            get_cache_dir(self.settings.cache_dir)
+            / CHECKPOINT_DIR
+            / f"{self.repo_data.full_name.replace('/', '--')}-"
+            f"{name.lower().replace(' ', '-')}.jsonl"
+        )
+        checkpoint = (
+            RecordCheckpoint(path, key, record_type)
+            if record_type
+            else Checkpoint(path, key)
+        )
+        if checkpoint.pages:
+            rprint(
+                f"  [green]->[/green] Resuming {name} from "
+                f"[green]{len(checkpoint.pages)}[/green] saved pages"
             )
+        return checkpoint
+
+    def get_repo_releases(self) -> list[ReleaseRecord]:
+        """Get info on all the releases from GitHub, or the local tags."""
+        try:
+            if self.local_git:
+                releases = self.local_git.get_releases()
+            elif self.graphql:
+                releases = list(self.graphql.get_releases())
+            else:
+                releases = as_records(
+                    self.github_repo.get_releases(), ReleaseRecord
+                )
         except GithubException as exc:
             git_error(exc)
         else:
-            rprint(f"[green]{repo_prs.totalCount} Found[/green]")
-            return repo_prs
+            self.print_found("Releases", len(releases))
+            return releases
+
+    def fetch_repo_lists(
+        self,
+    ) -> tuple[list[ReleaseRecord], list[PRRecord], list[IssueRecord]]:
+        """Get the releases, closed PRs and closed issues at the same time.
 
-    def get_repo_releases(self) -> list[GitRelease]:
-        """Get info on all the releases from GitHub."""
-        rprint("  [green]->[/green] Getting Releases ... ", end="")
+        These don't depend on each other, so the total time is that of the
+        slowest one rather than all three added together.
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            releases = executor.submit(self.get_repo_releases)
+            prs = executor.submit(self.get_closed_prs)
+            issues = executor.submit(self.get_closed_issues)
+            return releases.result(), prs.result(), issues.result()
+
+    def is_skipped(self, release: ReleaseRecord) -> bool:
+        """Return True if the release is in 'skip_releases', so not shown."""
+        return release.tag_name.strip() in (self.options["skip_releases"] or [])
+
+    def boundary_index(
+        self, releases: list[ReleaseRecord], count: int
+    ) -> int | None:
+        """Return where the boundary release for 'count' is in 'releases'.
+
+        That is the first release after the newest 'count' that is not
+        skipped, as a skipped release has no heading in the changelog to keep
+        the older releases from. This is None if there isn't one.
+        """
+        return next(
+            (
+                index
+                for index in range(count, len(releases))
+                if not self.is_skipped(releases[index])
+            ),
+            None,
+        )
+
+    @property
+    def boundary_release(self) -> ReleaseRecord | None:
+        """Return the release just before the newest 'max_releases', if any.
+
+        This is None when every release is shown.
+        """
+        max_releases = self.options["max_releases"]
+        if not max_releases:
+            return None
+        index = self.boundary_index(self.repo_releases, max_releases)
+        return None if index is None else self.repo_releases[index]
+
+    def window_releases(
+        self, releases: list[ReleaseRecord]
+    ) -> list[ReleaseRecord]:
+        """Keep the newest 'max_releases' releases and the boundary release."""
+        if not self.options["max_releases"]:
+            return releases
+        return self.cut_at_boundary(releases, self.options["max_releases"])
+
+    def cut_at_boundary(
+        self, releases: list[ReleaseRecord], count: int
+    ) -> list[ReleaseRecord]:
+        """Return 'releases' up to and including the boundary for 'count'."""
+        index = self.boundary_index(releases, count)
+        return releases if index is None else releases[: index + 1]
+
+    def existing_tail(self, output_path: Path) -> str | None:
+        """Return the older releases from the changelog we are replacing.
+
+        This is everything from the heading of the boundary release onwards,
+        or None when all releases are rendered. If that heading can't be
+        found, we can't build the full changelog so stop with an error.
+        """
+        boundary = self.boundary_release
+        if boundary is None:
+            return None
         try:
-            repo_releases = self.repo_data.get_releases()
+            tail = find_tail(
+                output_path.read_text(encoding="utf-8"), boundary.tag_name
+            )
+        except OSError:
+            tail = None
+        if tail is None:
+            rprint(
+                f"[red]  X  Error: Release '[bold]{boundary.tag_name}[/bold]' "
+                f"not found in {output_path}, run once without "
+                "--max-releases to generate the whole Changelog\n",
+                file=sys.stderr,
+            )
+            raise typer.Exit(ExitErrors.MISSING_HISTORY)
+        return tail
+
+    def fetch_recent_lists(
+        self, count: int
+    ) -> tuple[list[ReleaseRecord], list[PRRecord], list[IssueRecord]]:
+        """Get only the newest 'count' releases, and the PRs and Issues needed.
+
+        With a 'count' of 0 this is just what is needed for the unreleased
+        changes. This always uses the REST API. If there is no release before
+        the newest 'count', everything is needed so is fetched as usual.
+        """
+        releases = self.get_recent_releases(count)
+        if self.boundary_index(releases, count) is None:
+            return releases, self.get_closed_prs(), self.get_closed_issues()
+
+        since = releases[-1].created_at
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            prs = executor.submit(
+                self.get_updated_since, updated_prs, PRRecord, since
+            )
+            issues = executor.submit(
+                self.get_updated_since, updated_issues, IssueRecord, since
+            )
+            return releases, prs.result(), issues.result()
+
+    def get_recent_releases(self, count: int) -> list[ReleaseRecord]:
+        """Get the newest 'count' releases and the boundary release.
+
+        Skipped releases can come before the boundary, so we ask for enough
+        to get past all of them.
+        """
+        limit = count + 1 + len(self.options["skip_releases"] or [])
+        if self.local_git:
+            releases = self.local_git.get_releases()[:limit]
+        else:
+            try:
+                releases = as_records(
+                    itertools.islice(self.github_repo.get_releases(), limit),
+                    ReleaseRecord,
+                )
+            except GithubException as exc:
+                git_error(exc)
+        releases = self.cut_at_boundary(releases, count)
+        self.print_found("Releases", len(releases))
+        return releases
+
+    def get_updated_since(
+        self,
+        get_list: Callable[[Repository], PaginatedList[PullRequest]]
+        | Callable[[Repository], PaginatedList[Issue]],
+        record_type: type[R],
+        since: datetime.datetime,
+    ) -> list[R]:
+        """Get the closed PRs or Issues last updated on or after 'since'."""
+        name = "Closed PRs" if record_type is PRRecord else "Closed Issues"
+        try:
+            items = as_records(
+                updated_since(
+                    get_list(self.github_repo),
+                    since,
+                    lambda item: item.updated_at,
+                ),
+                record_type,
+            )
         except GithubException as exc:
             git_error(exc)
         else:
-            rprint(f"[green]{repo_releases.totalCount} Found[/green]")
-            return list(repo_releases)
+            self.print_found(name, len(items))
+            return items
+
+    @staticmethod
+    def print_budget() -> None:
+        """Print how many requests are left before we hit the rate limit."""
+        scheduler = SharedConnection.scheduler
+        if scheduler is not None and (summary := scheduler.summary()):
+            rprint(
+                f"  [green]->[/green] API requests left : [green]{summary}"
+                "[/green]"
+            )
+
+    @staticmethod
+    def print_found(name: str, count: int) -> None:
+        """Print how many of something were found.
+
+        The whole line is printed at once, since the lists are fetched at the
+        same time and we don't want their output mixed up.
+        """
+        rprint(
+            f"  [green]->[/green] Getting {name} ... "
+            f"[green]{count} Found[/green]"
+        )
 
     def get_repo_data(self) -> Repository:
         """Read the repository data from GitHub."""
@@ -837,6 +1665,27 @@ class ChangeLog:
         except GithubException as exc:
             git_error(exc)
         else:
+            if self.settings.release_source == "tags":
+                self.local_git = self.open_local_git(repo_data)
+            if self.settings.backend == "graphql":
+                self.graphql = GraphQLFetcher(
+                    self.git.requester, repo_data.owner.login, repo_data.name
+                )
+            elif self.settings.backend == "search":
+                self.search = SearchFetcher(
+                    self.git.requester,
+                    repo_data.full_name,
+                    repo_data.created_at,
+                    self.settings.ignored_users,
+                    self.ignored_labels,
+                )
+            elif self.settings.fetch_workers > 1 or self.settings.checkpoints:
+                # fetching page by page lets us save each one as it arrives.
+                self.pages = PageFetcher(
+                    self.git.requester,
+                    repo_data.full_name,
+                    max(self.settings.fetch_workers, 1),
+                )
             rprint(self.done_str)
             rprint(
                 "  [green]->[/green] Repository : "
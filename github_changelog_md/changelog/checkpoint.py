@@ -0,0 +1,162 @@
+"""Save the pages of a list as they are fetched, so a rerun can resume.
+
+Fetching every PR and Issue of a big repository can take a long time, and if
+the run is killed (or gives up on a rate limit) part way through, everything
+fetched so far would be lost. Instead, each page is appended to a JSON Lines
+file in the cache folder as soon as it arrives, along with the cursor for the
+next page. A rerun reads these back rather than asking GitHub again, and the
+file is removed once the whole list has been fetched.
+
+The first line of the file describes what is being fetched. If that does not
+match (eg a different backend or page size), or the checkpoint is too old to
+trust, it is thrown away and the fetch starts from the beginning.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+import json
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+from github_changelog_md.changelog.records import (
+    IssueRecord,
+    PRRecord,
+    to_dict,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+    from pathlib import Path
+
+CHECKPOINT_VERSION = 1
+# an older checkpoint may be missing items closed since it was started.
+MAX_AGE = datetime.timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class SavedPage:
+    """A page that was fetched before.
+
+    'count' is how many items GitHub returned, which can be more than were
+    saved, and 'cursor' is where the next page starts (None if this was the
+    last page).
+    """
+
+    items: list[Any]
+    count: int
+    cursor: Optional[str] = None
+
+
+class Checkpoint:
+    """The pages of one list fetched so far, saved as they arrive."""
+
+    def __init__(self, path: Path, key: dict[str, Any]) -> None:
+        """Load the checkpoint at 'path' if it was saved for the same 'key'."""
+        self.path = path
+        self.key = key
+        self.pages: dict[int, SavedPage] = {}
+        self.lock = threading.Lock()
+        if not self.load():
+            self.start()
+
+    def load(self) -> bool:
+        """Read back any saved pages, returning False if there are none.
+
+        A line that can't be read is where a previous run was killed part way
+        through writing it, so we stop there.
+        """
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+            header = json.loads(lines[0])
+            started_at = datetime.datetime.fromisoformat(header["started_at"])
+        except (OSError, IndexError, KeyError, TypeError, ValueError):
+            return False
+
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        if (
+            header.get("version") != CHECKPOINT_VERSION
+            or header.get("key") != self.key
+            or now - started_at > MAX_AGE
+        ):
+            return False
+
+        with contextlib.suppress(KeyError, TypeError, ValueError):
+            for line in lines[1:]:
+                page = json.loads(line)
+                self.pages[page["page"]] = SavedPage(
+                    page["items"], page["count"], page["cursor"]
+                )
+        return True
+
+    def start(self) -> None:
+        """Start a new, empty checkpoint file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "version": CHECKPOINT_VERSION,
+            "key": self.key,
+            "started_at": datetime.datetime.now(
+                tz=datetime.timezone.utc
+            ).isoformat(),
+        }
+        self.path.write_text(f"{json.dumps(header)}\n", encoding="utf-8")
+
+    def get_page(self, page: int) -> SavedPage | None:
+        """Return a page saved earlier, or None if it still needs fetching."""
+        return self.pages.get(page)
+
+    def save_page(
+        self,
+        page: int,
+        items: list[Any],
+        count: int,
+        cursor: str | None = None,
+    ) -> None:
+        """Append a page that has just been fetched to the checkpoint file."""
+        line = json.dumps(
+            {"page": page, "count": count, "cursor": cursor, "items": items}
+        )
+        with self.lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(f"{line}\n")
+            self.pages[page] = SavedPage(items, count, cursor)
+
+    def remove(self) -> None:
+        """Remove the checkpoint once the list has been fetched."""
+        self.path.unlink(missing_ok=True)
+
+
+class RecordCheckpoint(Checkpoint):
+    """A checkpoint for REST pages, which are saved as records."""
+
+    def __init__(
+        self,
+        path: Path,
+        key: dict[str, Any],
+        record_type: type[PRRecord | IssueRecord],
+    ) -> None:
+        """Load the checkpoint, saving items as 'record_type'."""
+        super().__init__(path, key)
+        self.record_type = record_type
+
+    def get_records(self, page: int) -> tuple[list[Any], int] | None:
+        """Return the records and item count of a saved page, if there is one.
+
+        Issues that are really PRs are dropped before they are saved, so the
+        count can be more than the number of records.
+        """
+        saved = self.get_page(page)
+        if saved is None:
+            return None
+        records = [self.record_type.from_dict(item) for item in saved.items]
+        return records, saved.count
+
+    def save_records(
+        self,
+        page: int,
+        records: Sequence[PRRecord | IssueRecord],
+        count: int,
+    ) -> None:
+        """Save a page of records, along with how many items GitHub sent."""
+        self.save_page(page, [to_dict(record) for record in records], count)
@@ -0,0 +1,151 @@
+"""A PyGithub connection class that can be used from several threads.
+
+PyGithub's HTTPS connection saves the details of a request on itself between
+'request()' and 'getresponse()', so two threads using the same client can
+overwrite each other's request. This connection keeps those details per
+thread instead. It also shares one requests session (and so its pool of open
+sockets) between every connection, since PyGithub creates a new connection
+for each request once the connection class has been replaced.
+
+As every request passes through here, this is also where requests are
+scheduled around the rate limits (see 'ratelimit.py').
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from github.Requester import (
+    HTTPRequestsConnectionClass,
+    HTTPSRequestsConnectionClass,
+    Requester,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterator
+
+    import requests
+    from github.Requester import RequestsResponse
+
+    from github_changelog_md.changelog.ratelimit import RateLimitScheduler
+
+
+def thread_local_attribute(name: str) -> Any:  # noqa: ANN401
+    """Return a property that stores its value per thread."""
+
+    def getter(self: SharedConnection) -> Any:  # noqa: ANN401
+        return getattr(self.state, name)
+
+    def setter(self: SharedConnection, value: Any) -> None:  # noqa: ANN401
+        setattr(self.state, name, value)
+
+    return property(getter, setter)
+
+
+class SharedConnection(HTTPSRequestsConnectionClass):
+    """An HTTPS connection that is safe to share between threads."""
+
+    shared_session: ClassVar[requests.Session | None] = None
+    installed: ClassVar[bool] = False
+    scheduler: ClassVar[RateLimitScheduler | None] = None
+    session_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    verb = thread_local_attribute("verb")
+    url = thread_local_attribute("url")
+    input = thread_local_attribute("input")
+    headers = thread_local_attribute("headers")
+    stream = thread_local_attribute("stream")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Create the connection, reusing the shared session."""
+        self.state = threading.local()
+        super().__init__(*args, **kwargs)
+        with SharedConnection.session_lock:
+            if SharedConnection.shared_session is None:
+                SharedConnection.shared_session = self.session
+                return
+        self.session.close()
+        self.session = SharedConnection.shared_session
+
+    def close(self) -> None:
+        """Leave the shared session open for the next request."""
+
+    def getresponse(self) -> RequestsResponse:
+        """Send the request, waiting for and retrying around rate limits."""
+        scheduler = SharedConnection.scheduler
+        if scheduler is None:
+            return super().getresponse()
+
+        attempt = 0
+        while True:
+            resource = scheduler.acquire(self.url)
+            headers: Any = {}
+            try:
+                response = super().getresponse()
+                headers = response.headers
+            finally:
+                scheduler.release(resource, headers)
+
+            body = (
+                response.read()
+                if response.status == HTTPStatus.FORBIDDEN
+                else ""
+            )
+            delay = scheduler.retry_delay(
+                response.status, headers, body, attempt
+            )
+            if delay is None:
+                return response
+            time.sleep(delay)
+            attempt += 1
+
+    @classmethod
+    def close_session(cls) -> None:
+        """Close the shared session once we are finished with it."""
+        with SharedConnection.session_lock:
+            if SharedConnection.shared_session is not None:
+                SharedConnection.shared_session.close()
+                SharedConnection.shared_session = None
+
+
+def retry_args() -> dict[str, Any]:
+    """Return the 'retry' argument for a new client, if it needs one.
+
+    By default PyGithub retries a rate limited request itself, sleeping
+    until the limit resets however long that is. With a scheduler in place
+    it decides whether to wait (up to 'rate_limit_wait'), so the client's
+    own retries are turned off.
+    """
+    return {"retry": None} if SharedConnection.scheduler is not None else {}
+
+
+@contextlib.contextmanager
+def shared_connections(
+    connection_class: type[SharedConnection] = SharedConnection,
+    scheduler: RateLimitScheduler | None = None,
+) -> Iterator[None]:
+    """Use 'connection_class' for all clients created inside this block.
+
+    If a 'scheduler' is given, every request is sent through it. Inside
+    another of these blocks this does nothing, so the outer one keeps its
+    settings.
+    """
+    if SharedConnection.installed:
+        yield
+        return
+    SharedConnection.installed = True
+    SharedConnection.scheduler = scheduler
+    Requester.injectConnectionClasses(
+        HTTPRequestsConnectionClass, connection_class
+    )
+    try:
+        yield
+    finally:
+        Requester.resetConnectionClasses()
+        SharedConnection.scheduler = None
+        SharedConnection.close_session()
+        SharedConnection.installed = False
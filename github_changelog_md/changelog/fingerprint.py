@@ -0,0 +1,124 @@
+"""Tell, with a couple of cheap requests, if anything changed since last run.
+
+Fetching every Release, PR and Issue is wasted work if nothing has happened
+since the changelog was last generated. Before fetching, we ask GitHub for
+just the newest release and the most recently updated PR or Issue (the REST
+Issues list includes PRs, and any edit, label change, merge or close bumps
+'updated_at'). Together with the settings used and the files we wrote, these
+make a fingerprint that is saved after each run. If the next run gets the
+same fingerprint, there is nothing new to show.
+
+Only the newest release is checked, so editing or deleting an older release
+is not noticed. Run without the quick check to pick up a change like that.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from github.Requester import Requester
+
+FINGERPRINT_VERSION = 1
+RELEASE_FIELDS = ("id", "tag_name", "name", "body", "created_at")
+
+
+def digest(value: Any) -> str:  # noqa: ANN401
+    """Return a short, stable hash of any JSON-serializable value."""
+    data = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_repr(value: Any) -> str:  # noqa: ANN401
+    """Return the hash of a value made of tuples, strings, numbers and dates.
+
+    This skips JSON altogether, so it is much quicker than 'digest', but the
+    value must have the same 'repr' every run (so no sets or dicts).
+    """
+    return hashlib.sha256(repr(value).encode("utf-8")).hexdigest()
+
+
+def digest_files(paths: Iterable[Path]) -> str:
+    """Return a hash of the contents of the files, missing files included."""
+    sha = hashlib.sha256()
+    for path in paths:
+        sha.update(file_digest(path))
+    return sha.hexdigest()
+
+
+def file_digest(path: Path) -> bytes:
+    """Return the hash of a single file, or a marker if it can't be read."""
+    try:
+        return hashlib.sha256(path.read_bytes()).digest()
+    except OSError:
+        return b"missing"
+
+
+def probe_remote(requester: Requester, repo_url: str) -> dict[str, Any]:
+    """Return the newest release and the last update to any PR or Issue.
+
+    This is two requests, each for a single item.
+    """
+    _, releases = requester.requestJsonAndCheck(
+        "GET", f"{repo_url}/releases", parameters={"per_page": 1}
+    )
+    _, items = requester.requestJsonAndCheck(
+        "GET",
+        f"{repo_url}/issues",
+        parameters={
+            "state": "all",
+            "sort": "updated",
+            "direction": "desc",
+            "per_page": 1,
+        },
+    )
+    return {
+        "release": (
+            {field: releases[0].get(field) for field in RELEASE_FIELDS}
+            if releases
+            else None
+        ),
+        "updated": (
+            {"number": items[0]["number"], "at": items[0]["updated_at"]}
+            if items
+            else None
+        ),
+    }
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """What the changelog was last built from, and what it wrote.
+
+    'remote' is the probe of GitHub, 'config' covers the settings and options
+    used, and 'output' is the contents of the files written.
+    """
+
+    remote: str
+    config: str
+    output: str
+
+    def save(self, path: Path) -> None:
+        """Write the fingerprint to 'path'."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"version": FINGERPRINT_VERSION, **asdict(self)}),
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Fingerprint | None:
+        """Read the fingerprint saved by the last run, if there is one."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.pop("version") != FINGERPRINT_VERSION:
+                return None
+            return cls(**data)
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
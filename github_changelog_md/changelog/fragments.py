@@ -0,0 +1,114 @@
+"""Keep the rendered markdown of each release between runs.
+
+Old releases hardly ever change, so there is no need to render them again
+every time. The markdown for each release is saved under a hash of
+everything that went into it: the release itself, its PRs and Issues (and
+who closed them), the release before it and the settings and options used.
+On the next run a release whose hash is already saved is copied from the
+cache rather than rendered.
+
+Hashing every record costs about as much as rendering it, so across
+separate runs this saves little, and the cache is off by default. Under
+'serve' the hash of each record is kept between renders too (see
+'record_digest'), so only the records an event replaced are hashed again.
+
+Only the fragments used in a run are saved again, so those for releases that
+have changed (or gone) are dropped rather than building up over time.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from github_changelog_md.changelog.fingerprint import digest_repr
+from github_changelog_md.changelog.records import record_key
+from github_changelog_md.helpers import write_atomic
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pathlib import Path
+
+    from github_changelog_md.changelog.records import (
+        IssueRecord,
+        PRRecord,
+        ReleaseRecord,
+        UserRecord,
+    )
+
+# bump this whenever the markdown for a release changes, so older fragments
+# are not used.
+FRAGMENT_VERSION = 2
+
+
+class FragmentCache:
+    """The rendered markdown for each release, keyed on a hash of its inputs."""
+
+    def __init__(self, path: Path) -> None:
+        """Load the fragments saved by the last run, if there are any."""
+        self.path = path
+        self.saved: dict[str, str] = {}
+        self.used: dict[str, str] = {}
+        self.hits = 0
+        # the hash of each record, by 'id', with the record so it is kept
+        # alive and the id can't be reused.
+        self.digests: dict[int, tuple[object, str]] = {}
+        self.digests_used: dict[int, tuple[object, str]] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data["version"] == FRAGMENT_VERSION:
+                self.saved = data["fragments"]
+        except (OSError, KeyError, TypeError, ValueError):
+            pass
+
+    def get(self, key: str) -> str | None:
+        """Return the saved fragment for 'key', or None if there isn't one."""
+        text = self.saved.get(key)
+        if text is not None:
+            self.hits += 1
+            self.used[key] = text
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        """Add a newly rendered fragment."""
+        self.used[key] = text
+
+    def record_digest(
+        self,
+        record: ReleaseRecord | PRRecord | IssueRecord | UserRecord,
+        skip: tuple[str, ...] = (),
+    ) -> str:
+        """Return the hash of a record, working it out once for each record.
+
+        Records are never changed, only replaced, so under 'serve' the hash
+        of a record is reused by every render until the record is replaced.
+        """
+        entry = self.digests_used.get(id(record)) or self.digests.get(
+            id(record)
+        )
+        if entry is None or entry[0] is not record:
+            entry = (record, digest_repr(record_key(record, skip)))
+        self.digests_used[id(record)] = entry
+        return entry[1]
+
+    def restart(self) -> None:
+        """Start another run in this process, from the fragments used so far.
+
+        This is how 'serve' keeps the fragments in memory between renders.
+        """
+        if self.used:
+            self.saved = self.used
+        self.used = {}
+        self.hits = 0
+        self.digests = self.digests_used
+        self.digests_used = {}
+
+    def save(self) -> None:
+        """Save the fragments used in this run, dropping any others."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(
+            self.path,
+            json.dumps(
+                {"version": FRAGMENT_VERSION, "fragments": self.used},
+                separators=(",", ":"),
+            ),
+        )
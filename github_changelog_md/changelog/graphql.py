@@ -0,0 +1,266 @@
+"""Fetch Releases, Pull Requests and Issues using the GitHub GraphQL API.
+
+The REST API returns full objects at 30 per page, then lazily fetches any
+attribute that was not in the list response. Here we ask for exactly the fields
+the changelog needs, 100 items at a time, and return them as records.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from github import GithubException
+
+from github_changelog_md.changelog.records import (
+    GHOST_USER,
+    IssueRecord,
+    PRRecord,
+    ReleaseRecord,
+    UserRecord,
+    label_names,
+    parse_datetime,
+    parse_optional_datetime,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable, Iterator
+
+    from github.Requester import Requester
+
+    from github_changelog_md.changelog.checkpoint import Checkpoint
+
+PAGE_SIZE = 100
+# number of aliased 'issue' lookups to send in a single closer query
+CLOSER_BATCH_SIZE = 50
+
+USER_FIELDS = "__typename login url ... on User { name }"
+
+RELEASES_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    releases(first: $first, after: $cursor,
+             orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { databaseId tagName name description url createdAt }
+    }
+  }
+}
+"""
+
+PULL_REQUESTS_QUERY = f"""
+query($owner: String!, $name: String!, $first: Int!, $cursor: String) {{
+  repository(owner: $owner, name: $name) {{
+    pullRequests(first: $first, after: $cursor, states: [CLOSED, MERGED],
+                 orderBy: {{field: CREATED_AT, direction: DESC}}) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{
+        databaseId number title url mergedAt
+        author {{ {USER_FIELDS} }}
+        labels(first: 100) {{ nodes {{ name }} }}
+      }}
+    }}
+  }}
+}}
+"""
+
+CLOSED_EVENT_FIELDS = f"""
+timelineItems(itemTypes: [CLOSED_EVENT], last: 1) {{
+  nodes {{ ... on ClosedEvent {{ actor {{ {USER_FIELDS} }} }} }}
+}}
+"""
+
+ISSUES_QUERY = f"""
+query($owner: String!, $name: String!, $first: Int!, $cursor: String) {{
+  repository(owner: $owner, name: $name) {{
+    issues(first: $first, after: $cursor, states: [CLOSED],
+           orderBy: {{field: CREATED_AT, direction: DESC}}) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{
+        databaseId number title url closedAt
+        author {{ {USER_FIELDS} }}
+        labels(first: 100) {{ nodes {{ name }} }}
+        {CLOSED_EVENT_FIELDS}
+      }}
+    }}
+  }}
+}}
+"""
+
+
+def to_user(data: dict[str, Any] | None) -> UserRecord | None:
+    """Convert a GraphQL actor into a UserRecord.
+
+    The REST API adds '[bot]' to the login of a bot, but GraphQL does not, so
+    we add it here to match.
+    """
+    if not data:
+        return None
+    login = data["login"]
+    if data.get("__typename") == "Bot":
+        login = f"{login}[bot]"
+    return UserRecord(
+        login=login,
+        html_url=data["url"],
+        name=data.get("name") or None,
+    )
+
+
+def to_closer(data: dict[str, Any]) -> UserRecord | None:
+    """Return the actor of the last ClosedEvent in a timeline connection."""
+    closed_events = data["timelineItems"]["nodes"]
+    if not closed_events:
+        return None
+    return to_user(closed_events[-1].get("actor"))
+
+
+def to_labels(data: dict[str, Any]) -> frozenset[str]:
+    """Return the lowercased names in a GraphQL label connection."""
+    return label_names(label["name"] for label in data["nodes"])
+
+
+class GraphQLFetcher:
+    """Bulk-fetch the changelog data for a single repository."""
+
+    def __init__(self, requester: Requester, owner: str, name: str) -> None:
+        """Initialize the fetcher for the given 'owner/name' repository."""
+        self.requester = requester
+        self.owner = owner
+        self.name = name
+
+    def paginate(
+        self,
+        query: str,
+        connection: str,
+        checkpoint: Checkpoint | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every node from a paginated repository connection.
+
+        Pages already in the 'checkpoint' are read from there instead, and
+        those that are fetched are added to it along with the next cursor.
+        """
+        cursor: str | None = None
+        page_number = 0
+        while True:
+            saved = checkpoint.get_page(page_number) if checkpoint else None
+            if saved is None:
+                _, data = self.requester.graphql_query(
+                    query,
+                    {
+                        "owner": self.owner,
+                        "name": self.name,
+                        "first": PAGE_SIZE,
+                        "cursor": cursor,
+                    },
+                )
+                page = data["data"]["repository"][connection]
+                nodes = page["nodes"]
+                next_cursor = (
+                    page["pageInfo"]["endCursor"]
+                    if page["pageInfo"]["hasNextPage"]
+                    else None
+                )
+                if checkpoint is not None:
+                    checkpoint.save_page(
+                        page_number, nodes, len(nodes), next_cursor
+                    )
+            else:
+                nodes, next_cursor = saved.items, saved.cursor
+            yield from nodes
+            if next_cursor is None:
+                return
+            cursor = next_cursor
+            page_number += 1
+
+    def get_releases(self) -> list[ReleaseRecord]:
+        """Return all releases, newest first."""
+        return [
+            ReleaseRecord(
+                id=node["databaseId"],
+                tag_name=node["tagName"],
+                title=node["name"] or "",
+                body=node["description"] or "",
+                html_url=node["url"],
+                created_at=parse_datetime(node["createdAt"]),
+            )
+            for node in self.paginate(RELEASES_QUERY, "releases")
+        ]
+
+    def get_pull_requests(
+        self, checkpoint: Checkpoint | None = None
+    ) -> list[PRRecord]:
+        """Return all closed (including merged) PRs, newest first."""
+        return [
+            PRRecord(
+                id=node["databaseId"],
+                number=node["number"],
+                title=node["title"],
+                html_url=node["url"],
+                user=to_user(node["author"]) or GHOST_USER,
+                merged_at=parse_optional_datetime(node["mergedAt"]),
+                labels=to_labels(node["labels"]),
+            )
+            for node in self.paginate(
+                PULL_REQUESTS_QUERY, "pullRequests", checkpoint
+            )
+        ]
+
+    def get_issues(
+        self, checkpoint: Checkpoint | None = None
+    ) -> list[IssueRecord]:
+        """Return all closed issues, newest first.
+
+        Unlike the REST API, these never include Pull Requests, and the user
+        who closed each issue comes back in the same response.
+        """
+        return [
+            IssueRecord(
+                id=node["databaseId"],
+                number=node["number"],
+                title=node["title"],
+                html_url=node["url"],
+                user=to_user(node["author"]) or GHOST_USER,
+                closed_at=parse_optional_datetime(node["closedAt"]),
+                closed_by=to_closer(node),
+                labels=to_labels(node["labels"]),
+            )
+            for node in self.paginate(ISSUES_QUERY, "issues", checkpoint)
+        ]
+
+    def get_issue_closers(
+        self, numbers: Iterable[int]
+    ) -> dict[int, UserRecord | None]:
+        """Return the user who closed each of the given issue numbers.
+
+        The REST API does not include this in the issue list, so PyGithub
+        would otherwise fetch every issue again. Here we look up to
+        CLOSER_BATCH_SIZE issues per request using aliased fields. An issue
+        that can't be read (eg one that was transferred or deleted) comes
+        back as an error alongside the other results, and gets None.
+        """
+        unique_numbers = sorted(set(numbers))
+        closers: dict[int, UserRecord | None] = {}
+        for start in range(0, len(unique_numbers), CLOSER_BATCH_SIZE):
+            batch = unique_numbers[start : start + CLOSER_BATCH_SIZE]
+            fields = "\n".join(
+                f"i{number}: issue(number: {number}) "
+                f"{{ {CLOSED_EVENT_FIELDS} }}"
+                for number in batch
+            )
+            try:
+                _, data = self.requester.graphql_query(
+                    "query($owner: String!, $name: String!) {\n"
+                    "  repository(owner: $owner, name: $name) {\n"
+                    f"{fields}\n"
+                    "  }\n"
+                    "}\n",
+                    {"owner": self.owner, "name": self.name},
+                )
+            except GithubException as exc:
+                if not isinstance(exc.data, dict) or not exc.data.get("data"):
+                    raise
+                data = exc.data
+            repository = data["data"]["repository"] or {}
+            for number in batch:
+                issue = repository.get(f"i{number}")
+                closers[number] = to_closer(issue) if issue else None
+        return closers
@@ -0,0 +1,239 @@
+"""Cache GitHub API responses on disk, revalidating them with ETags.
+
+GitHub answers a conditional request ('If-None-Match' or 'If-Modified-Since')
+with '304 Not Modified' if nothing has changed, and those responses do not
+count against the rate limit. We save every cacheable GET response, send the
+validators the next time the same URL is requested, and replay the saved body
+when GitHub says it has not changed.
+
+This hooks in under PyGithub by swapping the HTTPS connection class that its
+Requester uses (see 'connection.py'), so the rest of the code does not need to
+know about it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import requests
+from github.Requester import RequestsResponse
+from requests.structures import CaseInsensitiveDict
+
+from github_changelog_md.changelog.connection import (
+    SharedConnection,
+    shared_connections,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from github_changelog_md.changelog.ratelimit import RateLimitScheduler
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+"""
+
+# headers that describe the cached body, and so are kept from the original
+# response when replaying it. Everything else (eg the rate limit headers) comes
+# from the fresh 304 response.
+BODY_HEADERS = {
+    "content-type",
+    "etag",
+    "last-modified",
+    "link",
+}
+
+
+def cache_key(url: str, headers: dict[str, str]) -> str:
+    """Return the cache key for a request.
+
+    The 'Authorization' header is part of the key so that responses are never
+    shared between tokens, which may be able to see different data.
+    """
+    scope = "\n".join(
+        (
+            headers.get("Authorization", ""),
+            headers.get("Accept", ""),
+            url,
+        )
+    )
+    return hashlib.sha256(scope.encode()).hexdigest()
+
+
+class ResponseCache:
+    """A size-bounded, least-recently-used store of HTTP responses."""
+
+    def __init__(self, path: Path, max_size: int) -> None:
+        """Open (creating if needed) the cache at 'path'.
+
+        'max_size' is the total size of the saved bodies in bytes. When it is
+        exceeded, the least recently used responses are removed.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the saved response for 'key', marking it as recently used."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT etag, last_modified, headers, body FROM responses "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        etag, last_modified, headers, body = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": json.loads(headers),
+            "body": body,
+        }
+
+    def put(
+        self, key: str, headers: CaseInsensitiveDict[str], body: bytes
+    ) -> None:
+        """Save a response, then evict old ones if the cache is too big."""
+        if len(body) > self.max_size:
+            return
+        saved_headers = {
+            name.lower(): value
+            for name, value in headers.items()
+            if name.lower() in BODY_HEADERS
+        }
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, etag, last_modified, headers, body, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    json.dumps(saved_headers),
+                    body,
+                    len(body),
+                    time.time(),
+                ),
+            )
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used responses until we fit."""
+        (total,) = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_size:
+            return
+        rows = self.connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        expired: list[tuple[str]] = []
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            expired.append((key,))
+            total -= size
+        self.connection.executemany(
+            "DELETE FROM responses WHERE key = ?", expired
+        )
+
+
+class CachingConnection(SharedConnection):
+    """A PyGithub HTTPS connection that revalidates cached responses."""
+
+    cache: ClassVar[ResponseCache | None] = None
+
+    def getresponse(self) -> RequestsResponse:
+        """Send the request, answering it from the cache where possible.
+
+        Only plain GET requests are cached. If PyGithub has already added
+        its own validators we leave the request alone.
+        """
+        cache = CachingConnection.cache
+        if (
+            cache is None
+            or self.verb != "GET"
+            or self.stream
+            or "If-None-Match" in self.headers
+            or "If-Modified-Since" in self.headers
+        ):
+            return super().getresponse()
+
+        key = cache_key(self.url, self.headers)
+        cached = cache.get(key)
+        if cached:
+            self.headers = dict(self.headers)
+            if cached["etag"]:
+                self.headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                self.headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = super().getresponse()
+
+        if cached and response.status == HTTPStatus.NOT_MODIFIED:
+            return self.replay(response, cached)
+        if response.status == HTTPStatus.OK and (
+            "ETag" in response.headers or "Last-Modified" in response.headers
+        ):
+            cache.put(key, response.headers, response.response.content)
+        return response
+
+    @staticmethod
+    def replay(
+        not_modified: RequestsResponse, cached: dict[str, Any]
+    ) -> RequestsResponse:
+        """Return the cached response, with the fresh 304 headers merged in."""
+        replayed = requests.Response()
+        replayed.status_code = HTTPStatus.OK
+        replayed.headers = CaseInsensitiveDict(not_modified.headers)
+        replayed.headers.update(cached["headers"])
+        replayed.encoding = "utf-8"
+        replayed._content = cached["body"]  # noqa: SLF001
+        return RequestsResponse(replayed)
+
+
+@contextlib.contextmanager
+def response_cache(
+    path: Path,
+    max_size: int,
+    scheduler: RateLimitScheduler | None = None,
+) -> Iterator[ResponseCache]:
+    """Cache all PyGithub requests made inside this block."""
+    cache = ResponseCache(path, max_size)
+    CachingConnection.cache = cache
+    try:
+        with shared_connections(CachingConnection, scheduler):
+            yield cache
+    finally:
+        CachingConnection.cache = None
+        cache.close()
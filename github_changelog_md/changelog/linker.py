@@ -0,0 +1,77 @@
+"""Link Pull Requests and Issues to the release they first shipped in.
+
+An item belongs to the earliest release (in the order the releases are walked,
+oldest first) that was created on or after the item was merged or closed. Only
+releases newer than every release walked before them can ever be that 'first'
+release, and those form a sorted timeline. We build that timeline once, then
+place each item with a binary search, which is O((R + P) log R) rather than
+checking every item against every release.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from collections.abc import Iterable, Sequence
+
+    from github_changelog_md.changelog.records import ReleaseRecord
+
+T = TypeVar("T")
+
+
+class ReleaseTimeline:
+    """A sorted view of the release dates, used to place items by date."""
+
+    def __init__(self, releases: Sequence[ReleaseRecord]) -> None:
+        """Build the timeline from releases as returned by GitHub.
+
+        GitHub returns the newest release first, so we walk them in reverse,
+        keeping only those that are newer than any release seen so far.
+        """
+        self.dates: list[datetime.datetime] = []
+        self.release_ids: list[int] = []
+        for release in releases[::-1]:
+            if not self.dates or release.created_at > self.dates[-1]:
+                self.dates.append(release.created_at)
+                self.release_ids.append(release.id)
+
+    def find(self, when: datetime.datetime) -> int | None:
+        """Return the id of the release 'when' belongs to, if any."""
+        index = bisect_left(self.dates, when)
+        if index < len(self.release_ids):
+            return self.release_ids[index]
+        return None
+
+
+def link_to_releases(
+    releases: Sequence[ReleaseRecord],
+    items: Iterable[T],
+    get_date: Callable[[T], datetime.datetime | None],
+    last_release_date: datetime.datetime,
+) -> tuple[dict[int, list[T]], list[T]]:
+    """Bucket items by release, returning the buckets and unreleased items.
+
+    Items without a date (eg PRs closed without merging) are dropped. Items
+    newer than every release are unreleased if they are also newer than
+    'last_release_date'. Each bucket keeps the original order of the items.
+    """
+    timeline = ReleaseTimeline(releases)
+    by_release: dict[int, list[T]] = {
+        release.id: [] for release in releases[::-1]
+    }
+    unreleased: list[T] = []
+
+    for item in items:
+        item_date = get_date(item)
+        if not item_date:
+            continue
+        release_id = timeline.find(item_date)
+        if release_id is not None:
+            by_release[release_id].append(item)
+        elif item_date > last_release_date:
+            unreleased.append(item)
+
+    return by_release, unreleased
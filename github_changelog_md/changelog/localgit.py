@@ -0,0 +1,218 @@
+"""Read the releases from the tags in the local clone of the repository.
+
+Many projects tag their releases without creating a GitHub Release for each,
+and even when they do, listing the releases (or walking back through every
+commit to find the first one) costs requests that the local clone can answer
+straight away. With 'release_source' set to 'tags', each tag becomes a release
+dated when it was made (or when the commit was, for a lightweight tag), and
+the date of the root commit stands in for the first release.
+
+With 'contributors_source' set to 'git', the contributors are the authors in
+the local history (as mapped by any '.mailmap') rather than those of the PRs,
+so no requests are needed at all.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import re
+import subprocess
+import sys
+from shutil import which
+from typing import TYPE_CHECKING, NoReturn
+
+import typer
+from rich import print as rprint
+
+from github_changelog_md.changelog.records import (
+    ReleaseRecord,
+    UserRecord,
+    parse_datetime,
+)
+from github_changelog_md.constants import IGNORED_CONTRIBUTORS, ExitErrors
+from github_changelog_md.helpers import get_repo_name
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterator
+    from pathlib import Path
+
+FIELD_SEPARATOR = "\x00"
+RECORD_SEPARATOR = "\x1e"
+
+# one record per tag, newest first: the name, date, type of object the tag
+# points at, and for an annotated tag its message.
+TAG_FORMAT = (
+    "%(refname:short)%00%(creatordate:iso-strict)%00%(objecttype)%00"
+    "%(contents:subject)%00%(contents:body)%1e"
+)
+
+# GitHub gives each user an address like '123+login@users.noreply.github.com'
+# (or 'login@...' for older accounts) to use for commits.
+NOREPLY_EMAIL = re.compile(
+    r"^(?:\d+\+)?(?P<login>[^@]+)@users\.noreply\.github\.com$",
+    re.IGNORECASE,
+)
+
+
+def local_git_error(message: str) -> NoReturn:
+    """Show a problem with the local clone, and exit."""
+    rprint(f"\n[red]  X  Error: {message}\n", file=sys.stderr)
+    raise typer.Exit(ExitErrors.LOCAL_GIT_ERROR)
+
+
+def login_from_email(email: str) -> str | None:
+    """Return the GitHub login for a noreply address, otherwise None."""
+    match = NOREPLY_EMAIL.match(email)
+    return match.group("login") if match else None
+
+
+def tag_id(tag_name: str) -> int:
+    """Return a stable id for a tag, to use as the release id."""
+    return int(hashlib.sha256(tag_name.encode("utf-8")).hexdigest()[:15], 16)
+
+
+class LocalGit:
+    """Get the releases and first commit from a local clone."""
+
+    def __init__(self, html_url: str, folder: Path | None = None) -> None:
+        """Find git, using 'html_url' (the repository on GitHub) for links.
+
+        The clone is in 'folder', or the current folder if that isn't given.
+        """
+        git_executable = which("git")
+        if git_executable is None:
+            local_git_error("Cannot find 'git', which is needed to read tags")
+        self.git = git_executable
+        self.html_url = html_url
+        self.folder = folder
+
+    def run(self, *args: str) -> str:
+        """Run a git command in the clone and return its output."""
+        try:
+            return subprocess.run(  # noqa: S603
+                [self.git, *args],
+                cwd=self.folder,
+                check=True,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+            ).stdout
+        except (subprocess.CalledProcessError, OSError) as exc:
+            stderr = getattr(exc, "stderr", None) or exc
+            local_git_error(f"'git {args[0]}' failed : {stderr}")
+
+    def check_clone(self, repo_name: str) -> None:
+        """Make sure the clone is of 'repo_name', with its full history.
+
+        Otherwise we would quietly use the tags and authors of another
+        repository, or of a shallow clone (as CI usually checks out) that has
+        no tags and only the last commit.
+        """
+        origin = get_repo_name(self.folder)
+        if origin is None or origin.lower() != repo_name.lower():
+            local_git_error(
+                f"The local clone is of '{origin}', not '{repo_name}'. Run "
+                "this from a clone of the repository, with an 'origin' remote"
+            )
+        if self.run("rev-parse", "--is-shallow-repository").strip() == "true":
+            local_git_error(
+                "The local clone is shallow, fetch the full history with "
+                "'git fetch --unshallow --tags' (or 'fetch-depth: 0' in CI)"
+            )
+
+    def get_releases(self) -> list[ReleaseRecord]:
+        """Return a release for each tag, newest first."""
+        output = self.run(
+            "for-each-ref",
+            "--sort=-creatordate",
+            f"--format={TAG_FORMAT}",
+            "refs/tags",
+        )
+        releases = []
+        for record in output.split(RECORD_SEPARATOR):
+            if not record.strip():
+                continue
+            tag_name, date, object_type, subject, body = record.lstrip(
+                "\n"
+            ).split(FIELD_SEPARATOR)
+            # a lightweight tag has the message of the commit it points at,
+            # which is not release notes.
+            notes = (
+                f"{subject}\n\n{body}".strip() if object_type == "tag" else ""
+            )
+            releases.append(
+                ReleaseRecord(
+                    id=tag_id(tag_name),
+                    tag_name=tag_name,
+                    title="",
+                    body=notes,
+                    html_url=f"{self.html_url}/releases/tag/{tag_name}",
+                    created_at=parse_datetime(date).astimezone(
+                        datetime.timezone.utc
+                    ),
+                )
+            )
+        return releases
+
+    def first_commit_date(self) -> datetime.datetime:
+        """Return the date of the root commit (the oldest if there are more)."""
+        output = self.run("rev-list", "--max-parents=0", "--format=%cI", "HEAD")
+        dates = [
+            parse_datetime(line)
+            for line in output.splitlines()
+            if line and not line.startswith("commit ")
+        ]
+        if not dates:
+            local_git_error("The local repository has no commits")
+        return min(dates)
+
+    def authors(self) -> Iterator[tuple[str, str]]:
+        """Yield the name and email of the author of every commit.
+
+        Names and emails are mapped with any '.mailmap', and the log is read
+        as it is written rather than all at once.
+        """
+        try:
+            with subprocess.Popen(  # noqa: S603
+                [self.git, "log", "--use-mailmap", "--format=%aN%x00%aE"],
+                cwd=self.folder,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+            ) as process:
+                for line in process.stdout or ():
+                    name, _, email = line.rstrip("\n").partition("\x00")
+                    yield name, email
+        except OSError as exc:
+            local_git_error(f"'git log' failed : {exc}")
+        if process.returncode:
+            local_git_error("'git log' failed, is this a git repository?")
+
+    def get_contributors(self) -> list[UserRecord]:
+        """Return each author in the history once, in the order first seen.
+
+        Authors are the same person if they have the same GitHub login (from
+        a noreply address) or the same email. Those without a login are left
+        out if someone with a login has the same name, as that is usually the
+        same person committing from another address.
+        """
+        users: dict[str, UserRecord] = {}
+        for name, email in self.authors():
+            login = login_from_email(email)
+            if login in IGNORED_CONTRIBUTORS or name in IGNORED_CONTRIBUTORS:
+                continue
+            key = login.lower() if login else email.lower()
+            if key not in users:
+                users[key] = UserRecord(
+                    login=login or "",
+                    html_url=f"https://github.com/{login}" if login else "",
+                    name=name or None,
+                )
+        named = {user.name for user in users.values() if user.login}
+        return [
+            user
+            for user in users.values()
+            if user.login or user.name not in named
+        ]
@@ -0,0 +1,116 @@
+"""Download the pages of a REST list in parallel.
+
+Iterating a PyGithub 'PaginatedList' fetches one page at a time, but once we
+know the total count we know every page we need, so can ask for them all at
+once with a small pool of threads.
+
+Each page is turned into records as soon as it arrives, so only one page of
+PyGithub objects per thread is kept at a time. It can also be saved to a
+checkpoint, so that an interrupted run can pick up where it left off (see
+'checkpoint.py').
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from github import Github
+
+from github_changelog_md.changelog.connection import retry_args
+from github_changelog_md.changelog.records import (
+    IssueRecord,
+    PRRecord,
+    as_records,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from github.Issue import Issue
+    from github.PaginatedList import PaginatedList
+    from github.PullRequest import PullRequest
+    from github.Repository import Repository
+    from github.Requester import Requester
+
+    from github_changelog_md.changelog.checkpoint import RecordCheckpoint
+
+R = TypeVar("R", PRRecord, IssueRecord)
+
+
+class PageFetcher:
+    """Fetch every page of a repository list using a pool of threads."""
+
+    def __init__(
+        self, requester: Requester, repo_name: str, workers: int
+    ) -> None:
+        """Copy the client settings used to create a client per thread."""
+        self.client_args: dict[str, Any] = {
+            **requester.kwargs,
+            **retry_args(),
+            "lazy": True,
+        }
+        self.per_page: int = requester.per_page
+        self.repo_name = repo_name
+        self.workers = workers
+        self.local = threading.local()
+
+    def get_repo(self) -> Repository:
+        """Return a lazy Repository object for the current thread.
+
+        A PyGithub client keeps the details of the request in progress on its
+        connection, so a client can't be shared between threads. Being lazy,
+        this does not make any requests itself.
+        """
+        if not hasattr(self.local, "repo"):
+            self.local.repo = Github(**self.client_args).get_repo(
+                self.repo_name
+            )
+        repo: Repository = self.local.repo
+        return repo
+
+    def fetch(
+        self,
+        get_list: Callable[[Repository], PaginatedList[PullRequest]]
+        | Callable[[Repository], PaginatedList[Issue]],
+        total: int,
+        record_type: type[R],
+        checkpoint: RecordCheckpoint | None = None,
+    ) -> list[R]:
+        """Return every item in the list as a record, in the order GitHub gives.
+
+        'get_list' creates the list from a Repository, and 'total' is its
+        'totalCount'. Items added while we are fetching can push others onto
+        a later page, so we keep going while the last page is full, and drop
+        any item we have already seen.
+
+        Pages already in the 'checkpoint' are read from there instead, and
+        those that are fetched are added to it.
+        """
+
+        def get_page(page: int) -> tuple[list[R], int]:
+            if checkpoint is not None:
+                saved = checkpoint.get_records(page)
+                if saved is not None:
+                    return saved
+            items = get_list(self.get_repo()).get_page(page)
+            records = as_records(items, record_type)
+            if checkpoint is not None:
+                checkpoint.save_records(page, records, len(items))
+            return records, len(items)
+
+        page_count = math.ceil(total / self.per_page)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pages = list(executor.map(get_page, range(page_count)))
+
+        while pages and pages[-1][1] == self.per_page:
+            pages.append(get_page(len(pages)))
+
+        items: list[R] = []
+        seen: set[int] = set()
+        for page, _ in pages:
+            for item in page:
+                if item.id not in seen:
+                    seen.add(item.id)
+                    items.append(item)
+        return items
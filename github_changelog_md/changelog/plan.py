@@ -0,0 +1,106 @@
+"""Turn the section and ignore settings into lookups used while rendering.
+
+The sections, ignored labels and hidden items don't change while a changelog
+is rendered, so they are compiled once into a 'RenderPlan'. Each PR is then
+sorted into its sections with one lookup per label, rather than checking
+every label of every PR against every section for each release.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+
+    from github_changelog_md.changelog.records import IssueRecord, PRRecord
+    from github_changelog_md.constants import SectionHeadings
+
+MERGED_HEADING = "Merged Pull Requests"
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """The compiled sections and ignore rules for one changelog.
+
+    'headings' are in the order they are shown, 'section_by_label' gives the
+    headings for each (lowercase) label and 'merged_heading' is where PRs
+    without any of those labels go.
+    """
+
+    headings: tuple[str, ...]
+    section_by_label: dict[str, tuple[str, ...]]
+    merged_heading: str
+    ignored_labels: frozenset[str]
+    hidden_numbers: frozenset[int]
+
+    @classmethod
+    def compile(
+        cls,
+        sections: list[SectionHeadings],
+        ignored_labels: Iterable[str],
+        ignore_items: Iterable[int] | None = None,
+    ) -> RenderPlan:
+        """Compile the plan from the sections and ignore settings."""
+        section_by_label: dict[str, tuple[str, ...]] = {}
+        for heading, label in sections:
+            if label is not None:
+                section_by_label[label] = (
+                    *section_by_label.get(label, ()),
+                    heading,
+                )
+        merged_heading = next(
+            (heading for heading, label in sections if label is None),
+            MERGED_HEADING,
+        )
+        headings = tuple(dict.fromkeys([h for h, _ in sections]))
+        if merged_heading not in headings:
+            headings = (*headings, merged_heading)
+        return cls(
+            headings=headings,
+            section_by_label=section_by_label,
+            merged_heading=merged_heading,
+            ignored_labels=frozenset(ignored_labels),
+            hidden_numbers=frozenset(ignore_items or ()),
+        )
+
+    def is_ignored(self, item: PRRecord | IssueRecord) -> bool:
+        """Return True if the item has any of the ignored labels."""
+        return not self.ignored_labels.isdisjoint(item.labels)
+
+    def is_hidden(self, item: Any) -> bool:  # noqa: ANN401
+        """Return True if the item has been marked as hidden.
+
+        Like the 'ignore_items' setting itself, '[no changelog]' in the title
+        is only checked when some items are being ignored.
+        """
+        if not self.hidden_numbers:
+            return False
+        return (
+            item.number in self.hidden_numbers
+            or "[no changelog]" in item.title.lower()
+        )
+
+    def classify(
+        self, pr_list: Iterable[PRRecord]
+    ) -> dict[str, list[PRRecord]]:
+        """Sort the PRs into their sections in a single pass.
+
+        A PR with labels for more than one section is shown in each of them,
+        and those with an ignored label are left out altogether.
+        """
+        sections: dict[str, list[PRRecord]] = {
+            heading: [] for heading in self.headings
+        }
+        for pr in pr_list:
+            if self.is_ignored(pr):
+                continue
+            headings = dict.fromkeys(
+                heading
+                for label in pr.labels
+                for heading in self.section_by_label.get(label, ())
+            )
+            for heading in headings or (self.merged_heading,):
+                sections[heading].append(pr)
+        return sections
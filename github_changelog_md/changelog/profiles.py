@@ -0,0 +1,129 @@
+"""Look up the display names of contributors in batches, and remember them.
+
+The REST API only gives the login of each PR author, so the name needs the
+user's full profile: one request for every contributor, on every run. Here
+the names are looked up PROFILE_BATCH_SIZE at a time with aliased GraphQL
+'user' fields, and saved in the cache folder for 'profile_cache_days' days so
+a later run only looks up contributors that are new (or due a refresh).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from github import GithubException
+
+from github_changelog_md.helpers import write_atomic
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from github.Requester import Requester
+
+PROFILE_VERSION = 1
+# number of aliased 'user' lookups to send in a single query
+PROFILE_BATCH_SIZE = 50
+
+
+def build_query(count: int) -> str:
+    """Return a query looking up the names of 'count' users at once."""
+    params = ", ".join(f"$l{index}: String!" for index in range(count))
+    fields = "\n".join(
+        f"  u{index}: user(login: $l{index}) {{ name }}"
+        for index in range(count)
+    )
+    return f"query({params}) {{\n{fields}\n}}"
+
+
+def fetch_names(
+    requester: Requester, logins: Iterable[str]
+) -> dict[str, str | None]:
+    """Return the display name of each login, None if they haven't set one.
+
+    A login that isn't a user (such as an app like 'renovate[bot]') comes
+    back as an error alongside the other results, and also gets None.
+    """
+    unique_logins = sorted(set(logins))
+    names: dict[str, str | None] = {}
+    for start in range(0, len(unique_logins), PROFILE_BATCH_SIZE):
+        batch = unique_logins[start : start + PROFILE_BATCH_SIZE]
+        variables = {f"l{index}": login for index, login in enumerate(batch)}
+        try:
+            _, response = requester.graphql_query(
+                build_query(len(batch)), variables
+            )
+        except GithubException as exc:
+            if not isinstance(exc.data, dict) or not exc.data.get("data"):
+                raise
+            response = exc.data
+        data = response["data"]
+        for index, login in enumerate(batch):
+            user = data.get(f"u{index}")
+            names[login] = (user or {}).get("name") or None
+    return names
+
+
+class ProfileCache:
+    """The names looked up for each login, and when they were looked up.
+
+    One cache can be shared by changelogs built at the same time in several
+    threads.
+    """
+
+    def __init__(self, path: Path, max_age: float) -> None:
+        """Load the saved names, dropping any older than 'max_age' seconds."""
+        self.path = path
+        self.lock = threading.Lock()
+        self.profiles: dict[str, tuple[str | None, float]] = {}
+        oldest = time.time() - max_age
+        try:
+            data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+            if data["version"] == PROFILE_VERSION:
+                self.profiles = {
+                    login: (name, fetched_at)
+                    for login, (name, fetched_at) in data["profiles"].items()
+                    if fetched_at >= oldest
+                }
+        except (OSError, KeyError, TypeError, ValueError):
+            pass
+
+    def get_names(self, logins: Iterable[str]) -> dict[str, str | None]:
+        """Return the saved names for any of the logins we have."""
+        with self.lock:
+            return {
+                login: self.profiles[login][0]
+                for login in logins
+                if login in self.profiles
+            }
+
+    def update(self, names: dict[str, str | None]) -> None:
+        """Add names that have just been looked up."""
+        now = time.time()
+        with self.lock:
+            self.profiles.update(
+                {login: (name, now) for login, name in names.items()}
+            )
+
+    def save(self) -> None:
+        """Save the names, so the next run doesn't need to look them up."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            write_atomic(
+                self.path,
+                json.dumps(
+                    {
+                        "version": PROFILE_VERSION,
+                        "profiles": {
+                            login: [name, fetched_at]
+                            for login, (name, fetched_at) in (
+                                self.profiles.items()
+                            )
+                        },
+                    },
+                    separators=(",", ":"),
+                ),
+            )
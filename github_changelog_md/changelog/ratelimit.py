@@ -0,0 +1,202 @@
+"""Schedule requests around the GitHub rate limits.
+
+Every response tells us how many requests are left for that kind of request
+('core', 'search' or 'graphql') and when the count resets. We use this to send
+fewer requests at once as the budget runs low, to wait for the reset rather
+than fail when it is used up, and to back off (with some random jitter, so
+that parallel requests don't all retry at once) when GitHub asks us to slow
+down.
+
+If a shared bucket is given (see 'bucket.py'), each request also takes a
+token from it first, so that other processes using the same PAT are allowed
+for too.
+"""
+
+from __future__ import annotations
+
+import datetime
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from rich import print as rprint
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Mapping
+
+    from github_changelog_md.changelog.bucket import SharedBucket
+
+# we allow one request in flight for every this many requests left, so fewer
+# requests are sent at once as the budget runs low.
+BUDGET_PER_REQUEST = 10
+# how many times to retry a request that was rate limited.
+MAX_RETRIES = 5
+# the first backoff for a secondary rate limit, doubled on each retry.
+BACKOFF_SECONDS = 5.0
+MAX_BACKOFF_SECONDS = 300.0
+
+
+@dataclass
+class Budget:
+    """The rate limit for one kind of request, as last reported by GitHub."""
+
+    limit: int
+    remaining: int
+    reset: float
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> Budget | None:
+        """Read the budget from the 'X-RateLimit-*' response headers."""
+        try:
+            return cls(
+                limit=int(headers["X-RateLimit-Limit"]),
+                remaining=int(headers["X-RateLimit-Remaining"]),
+                reset=float(headers["X-RateLimit-Reset"]),
+            )
+        except (KeyError, ValueError):
+            return None
+
+    def seconds_to_reset(self) -> float:
+        """Return how long until the budget resets, allowing for rounding."""
+        return max(self.reset + 1 - time.time(), 0)
+
+
+def get_resource(url: str) -> str:
+    """Return the rate limit resource that a request URL counts against."""
+    if url.startswith(("/search/", "/api/v3/search/")):
+        return "search"
+    if url.endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def format_wait(seconds: float) -> str:
+    """Format a wait in seconds as minutes and seconds."""
+    minutes, seconds = divmod(round(seconds), 60)
+    return f"{minutes}m {seconds}s" if minutes else f"{seconds}s"
+
+
+class RateLimitScheduler:
+    """Decide when each request may be sent, shared by every thread."""
+
+    def __init__(
+        self, max_wait: float, bucket: SharedBucket | None = None
+    ) -> None:
+        """Create the scheduler.
+
+        'max_wait' is the longest we will wait for a rate limit to reset, in
+        seconds. If the reset is further away, the request is sent anyway and
+        fails as it would without the scheduler. Every request takes a token
+        from 'bucket' first, if there is one.
+        """
+        self.max_wait = max_wait
+        self.bucket = bucket
+        self.budgets: dict[str, Budget] = {}
+        self.in_flight: dict[str, int] = {}
+        self.reported: set[tuple[str, float]] = set()
+        self.condition = threading.Condition()
+
+    def allowed_in_flight(self, resource: str) -> int:
+        """Return how many requests may be in flight for this resource.
+
+        Until the first response tells us the budget, requests are sent one
+        at a time.
+        """
+        budget = self.budgets.get(resource)
+        if budget is None:
+            return 1
+        return max(1, budget.remaining // BUDGET_PER_REQUEST)
+
+    def reset_wait(self, resource: str) -> float:
+        """Return how long to wait for the budget to reset, if it is used up."""
+        budget = self.budgets.get(resource)
+        if budget is None or budget.remaining > self.in_flight[resource]:
+            return 0
+        return budget.seconds_to_reset()
+
+    def acquire(self, url: str) -> str:
+        """Wait until a request to 'url' may be sent, returning its resource."""
+        resource = get_resource(url)
+        if self.bucket is not None:
+            # waited for outside the lock, so responses can still come back.
+            time.sleep(self.bucket.take())
+        with self.condition:
+            self.in_flight.setdefault(resource, 0)
+            while True:
+                wait = self.reset_wait(resource)
+                if 0 < wait <= self.max_wait:
+                    self.report_wait(resource, wait)
+                    self.condition.wait(wait)
+                elif self.in_flight[resource] < self.allowed_in_flight(
+                    resource
+                ):
+                    self.in_flight[resource] += 1
+                    return resource
+                else:
+                    self.condition.wait()
+
+    def release(self, resource: str, headers: Mapping[str, str]) -> None:
+        """Record the budget from a response, and let the next request go."""
+        budget = Budget.from_headers(headers)
+        with self.condition:
+            self.in_flight[resource] -= 1
+            if budget is not None:
+                self.budgets[resource] = budget
+            self.condition.notify_all()
+
+    def retry_delay(
+        self, status: int, headers: Mapping[str, str], body: str, attempt: int
+    ) -> float | None:
+        """Return how long to wait before retrying, or None to not retry.
+
+        We retry when GitHub sends 'Retry-After', when the primary limit is
+        used up and resets soon enough, and back off on a secondary limit. A
+        403 for any other reason (eg no permission) is not retried.
+        """
+        if attempt >= MAX_RETRIES or status not in {
+            HTTPStatus.FORBIDDEN,
+            HTTPStatus.TOO_MANY_REQUESTS,
+        }:
+            return None
+        if "Retry-After" in headers:
+            return float(headers["Retry-After"])
+        budget = Budget.from_headers(headers)
+        if budget is not None and budget.remaining == 0:
+            wait = budget.seconds_to_reset()
+            return wait if wait <= self.max_wait else None
+        if (
+            status == HTTPStatus.TOO_MANY_REQUESTS
+            or "secondary rate limit" in body.lower()
+        ):
+            backoff = min(BACKOFF_SECONDS * 2.0**attempt, MAX_BACKOFF_SECONDS)
+            return backoff * random.uniform(0.5, 1.5)  # noqa: S311
+        return None
+
+    def report_wait(self, resource: str, wait: float) -> None:
+        """Print that we are waiting for a rate limit to reset, once."""
+        budget = self.budgets[resource]
+        if (resource, budget.reset) in self.reported:
+            return
+        self.reported.add((resource, budget.reset))
+        reset = (
+            datetime.datetime.fromtimestamp(
+                budget.reset, tz=datetime.timezone.utc
+            )
+            .astimezone()
+            .strftime("%H:%M:%S")
+        )
+        rprint(
+            f"  [yellow]->[/yellow] Rate limit for '{resource}' requests used "
+            f"up, waiting {format_wait(wait)} until {reset} ..."
+        )
+
+    def summary(self) -> str:
+        """Return the remaining budget for each resource used so far."""
+        with self.condition:
+            return ", ".join(
+                f"{budget.remaining}/{budget.limit} {resource}"
+                for resource, budget in sorted(self.budgets.items())
+            )
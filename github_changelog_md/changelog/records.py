@@ -0,0 +1,327 @@
+"""Define lightweight records for Releases, Pull Requests and Issues.
+
+Everything fetched from GitHub is turned into these records as soon as it
+arrives (see 'as_records'), so the linking and rendering code only ever sees
+records. A PyGithub object keeps the whole API response it was built from,
+while a record only holds the handful of fields the changelog needs, in
+'__slots__' rather than a per-object '__dict__'. Label names are lowercased
+once here, into a frozenset, rather than every time they are compared.
+
+The records keep the attribute names of the PyGithub classes they replace.
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import asdict, dataclass, fields
+from typing import TYPE_CHECKING, Any, Optional, TypeVar, cast
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+
+    from github.GitRelease import GitRelease
+    from github.Issue import Issue
+    from github.Label import Label
+    from github.NamedUser import NamedUser
+    from github.PullRequest import PullRequest
+    from github.Repository import Repository
+
+C = TypeVar("C")
+
+
+def slotted(cls: type[C]) -> type[C]:
+    """Rebuild a dataclass with '__slots__' for its fields.
+
+    This is what 'dataclass(slots=True)' does, which needs Python 3.10. A
+    slotted class can't have class attributes with the same names, so the
+    field defaults are removed, but they live on in the '__init__' that the
+    dataclass has already generated.
+
+    Like the standard library, we add '__getstate__' and '__setstate__', as
+    the default way that 'copy' and 'pickle' restore slots would assign to
+    the frozen fields.
+    """
+    names = tuple(f.name for f in fields(cls))  # type: ignore[arg-type]
+
+    def getstate(self: object) -> list[Any]:
+        return [getattr(self, name) for name in names]
+
+    def setstate(self: object, state: list[Any]) -> None:
+        for name, value in zip(names, state):
+            object.__setattr__(self, name, value)
+
+    namespace = {
+        key: value
+        for key, value in cls.__dict__.items()
+        if key not in {*names, "__dict__", "__weakref__"}
+    }
+    namespace["__slots__"] = names
+    namespace["__getstate__"] = getstate
+    namespace["__setstate__"] = setstate
+    return cast("type[C]", type(cls.__name__, cls.__bases__, namespace))
+
+
+def label_names(names: Iterable[str]) -> frozenset[str]:
+    """Return the label names, lowercased, ready to compare."""
+    return frozenset(name.lower() for name in names)
+
+
+def labels_from_github(labels: Iterable[Label]) -> frozenset[str]:
+    """Return the lowercased names of a list of PyGithub Labels."""
+    return label_names(label.name for label in labels)
+
+
+def parse_labels(data: Iterable[Any]) -> frozenset[str]:
+    """Read saved labels, also accepting the older '{"name": ...}' form."""
+    return label_names(
+        label["name"] if isinstance(label, dict) else label for label in data
+    )
+
+
+@slotted
+@dataclass(frozen=True)
+class UserRecord:
+    """A GitHub user (or bot) that authored or closed an item."""
+
+    login: str
+    html_url: str
+    name: Optional[str] = None
+
+    @classmethod
+    def from_github(cls, user: NamedUser | None) -> UserRecord:
+        """Convert a PyGithub NamedUser.
+
+        We don't read 'name' here, as it is not in the list responses and
+        PyGithub would fetch the full user profile to get it.
+        """
+        if user is None:
+            return GHOST_USER
+        return cls(login=user.login, html_url=user.html_url)
+
+
+# GitHub shows deleted accounts as the 'ghost' user, we do the same.
+GHOST_USER = UserRecord(login="ghost", html_url="https://github.com/ghost")
+
+
+@slotted
+@dataclass(frozen=True)
+class ReleaseRecord:
+    """A single GitHub Release."""
+
+    id: int
+    tag_name: str
+    title: str
+    body: str
+    html_url: str
+    created_at: datetime.datetime
+
+    @classmethod
+    def from_github(cls, release: GitRelease) -> ReleaseRecord:
+        """Convert a PyGithub GitRelease."""
+        return cls(
+            id=release.id,
+            tag_name=release.tag_name,
+            title=release.title or "",
+            body=release.body or "",
+            html_url=release.html_url,
+            created_at=release.created_at,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ReleaseRecord:
+        """Rebuild a record saved with 'to_dict'."""
+        return cls(**{**data, "created_at": parse_datetime(data["created_at"])})
+
+
+@slotted
+@dataclass(frozen=True)
+class PRRecord:
+    """A single closed Pull Request."""
+
+    id: int
+    number: int
+    title: str
+    html_url: str
+    user: UserRecord
+    merged_at: Optional[datetime.datetime]
+    labels: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_github(cls, pr: PullRequest) -> PRRecord:
+        """Convert a PyGithub PullRequest."""
+        return cls(
+            id=pr.id,
+            number=pr.number,
+            title=pr.title,
+            html_url=pr.html_url,
+            user=UserRecord.from_github(pr.user),
+            merged_at=pr.merged_at,
+            labels=labels_from_github(pr.labels),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PRRecord:
+        """Rebuild a record saved with 'to_dict'."""
+        return cls(
+            **{
+                **data,
+                "user": UserRecord(**data["user"]),
+                "merged_at": parse_optional_datetime(data["merged_at"]),
+                "labels": parse_labels(data["labels"]),
+            }
+        )
+
+
+@slotted
+@dataclass(frozen=True)
+class IssueRecord:
+    """A single closed Issue."""
+
+    id: int
+    number: int
+    title: str
+    html_url: str
+    user: UserRecord
+    closed_at: Optional[datetime.datetime]
+    closed_by: Optional[UserRecord] = None
+    labels: frozenset[str] = frozenset()
+    pull_request: None = None
+
+    @classmethod
+    def from_github(cls, issue: Issue) -> IssueRecord:
+        """Convert a PyGithub Issue.
+
+        'closed_by' is left empty, as reading it would fetch the full issue.
+        """
+        return cls(
+            id=issue.id,
+            number=issue.number,
+            title=issue.title,
+            html_url=issue.html_url,
+            user=UserRecord.from_github(issue.user),
+            closed_at=issue.closed_at,
+            labels=labels_from_github(issue.labels),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> IssueRecord:
+        """Rebuild a record saved with 'to_dict'."""
+        closed_by = data["closed_by"]
+        return cls(
+            **{
+                **data,
+                "user": UserRecord(**data["user"]),
+                "closed_at": parse_optional_datetime(data["closed_at"]),
+                "closed_by": UserRecord(**closed_by) if closed_by else None,
+                "labels": parse_labels(data["labels"]),
+            }
+        )
+
+
+@slotted
+@dataclass(frozen=True)
+class RepoRecord:
+    """The details of a repository needed to render its changelog.
+
+    'first_commit_at' is only needed (and so only saved) when there are no
+    releases yet.
+    """
+
+    full_name: str
+    name: str
+    html_url: str
+    first_commit_at: Optional[datetime.datetime] = None
+
+    @classmethod
+    def from_github(
+        cls,
+        repo: Repository,
+        first_commit_at: datetime.datetime | None = None,
+    ) -> RepoRecord:
+        """Convert a PyGithub Repository."""
+        return cls(
+            full_name=repo.full_name,
+            name=repo.name,
+            html_url=repo.html_url,
+            first_commit_at=first_commit_at,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> RepoRecord:
+        """Rebuild a record saved with 'to_dict'."""
+        return cls(
+            **{
+                **data,
+                "first_commit_at": parse_optional_datetime(
+                    data["first_commit_at"]
+                ),
+            }
+        )
+
+
+R = TypeVar("R", ReleaseRecord, PRRecord, IssueRecord)
+
+
+def as_records(items: Iterable[Any], record_type: type[R]) -> list[R]:
+    """Convert the items fetched from GitHub into records.
+
+    Items that are already records are kept as they are. The REST API
+    returns PRs in the list of Issues too, and those are dropped here.
+    """
+    return [
+        item if isinstance(item, record_type) else record_type.from_github(item)
+        for item in items
+        if record_type is not IssueRecord or not item.pull_request
+    ]
+
+
+def to_dict(
+    record: ReleaseRecord | PRRecord | IssueRecord | RepoRecord | UserRecord,
+) -> dict[str, Any]:
+    """Convert a record into a JSON-serializable dict."""
+    return {key: to_json(value) for key, value in asdict(record).items()}
+
+
+def record_key(
+    record: ReleaseRecord | PRRecord | IssueRecord | UserRecord,
+    skip: tuple[str, ...] = (),
+) -> tuple[Any, ...]:
+    """Return the fields of a record as a tuple that is the same every run.
+
+    This is far cheaper to hash than 'to_dict'. Label names are sorted, as
+    the order of a frozenset changes from one run to the next. Fields named
+    in 'skip' are left out.
+    """
+    return tuple(
+        key_value(getattr(record, field.name))
+        for field in fields(record)
+        if field.name not in skip
+    )
+
+
+def key_value(value: Any) -> Any:  # noqa: ANN401
+    """Convert a single record value for 'record_key'."""
+    if isinstance(value, frozenset):
+        return tuple(sorted(value))
+    if isinstance(value, UserRecord):
+        return record_key(value)
+    return value
+
+
+def to_json(value: Any) -> Any:  # noqa: ANN401
+    """Convert a single record value into something JSON can store."""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, frozenset):
+        return sorted(value)
+    return value
+
+
+def parse_datetime(value: str) -> datetime.datetime:
+    """Convert a GitHub ISO-8601 timestamp into an aware datetime."""
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def parse_optional_datetime(value: str | None) -> datetime.datetime | None:
+    """Convert an optional GitHub timestamp, keeping missing values as None."""
+    return parse_datetime(value) if value else None
@@ -0,0 +1,199 @@
+"""Fetch merged Pull Requests and closed Issues using the GitHub search API.
+
+The list endpoints return every closed PR (including those that were never
+merged) and mix PRs in with the Issues, and we throw a lot of that away. The
+search API lets GitHub do that filtering for us: we turn the settings into
+search qualifiers ('is:merged', '-author:', '-label:' and so on) so only the
+items that can appear in the changelog are downloaded.
+
+A search only ever returns the first 1000 results, so we split the history
+into 'created:' date windows, halving any window that has more than that.
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+from typing import TYPE_CHECKING, Any
+
+from github_changelog_md.changelog.records import (
+    GHOST_USER,
+    IssueRecord,
+    PRRecord,
+    UserRecord,
+    label_names,
+    parse_optional_datetime,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable, Iterator
+
+    from github.Requester import Requester
+
+PAGE_SIZE = 100
+# GitHub will not return more than this many results for a single search.
+SEARCH_LIMIT = 1000
+# GitHub rejects search queries longer than this.
+MAX_QUERY_LENGTH = 256
+# the smallest window we will split; anything smaller would overlap itself.
+MIN_WINDOW = datetime.timedelta(seconds=1)
+
+PULL_REQUESTS = ("is:pr", "is:merged")
+ISSUES = ("is:issue", "is:closed")
+
+
+def format_date(when: datetime.datetime) -> str:
+    """Format a datetime the way the search API expects it."""
+    return when.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def quote(value: str) -> str:
+    """Quote a qualifier value if it contains spaces."""
+    return f'"{value}"' if " " in value else value
+
+
+def build_query(
+    required: Iterable[str],
+    exclusions: Iterable[str],
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> str:
+    """Return a search query for items created between 'start' and 'end'.
+
+    The exclusions only save bandwidth, since the same items are filtered out
+    again later. If there are too many to fit in a query, we add as many as we
+    can and leave the rest to be filtered out locally.
+    """
+    query = " ".join(
+        (*required, f"created:{format_date(start)}..{format_date(end)}")
+    )
+    for exclusion in exclusions:
+        if len(query) + len(exclusion) + 1 > MAX_QUERY_LENGTH:
+            break
+        query = f"{query} {exclusion}"
+    return query
+
+
+def to_user(data: dict[str, Any] | None) -> UserRecord:
+    """Convert a search result user into a UserRecord."""
+    if not data:
+        return GHOST_USER
+    return UserRecord(login=data["login"], html_url=data["html_url"])
+
+
+def to_labels(data: list[dict[str, Any]]) -> frozenset[str]:
+    """Return the lowercased names of the search result labels."""
+    return label_names(label["name"] for label in data)
+
+
+class SearchFetcher:
+    """Search for the merged PRs and closed Issues of a single repository."""
+
+    def __init__(
+        self,
+        requester: Requester,
+        repo_name: str,
+        created_at: datetime.datetime,
+        ignored_users: Iterable[str] = (),
+        ignored_labels: Iterable[str] = (),
+    ) -> None:
+        """Initialize the fetcher for the 'owner/name' repository.
+
+        'created_at' is when the repository was created, which is where the
+        first date window starts.
+        """
+        self.requester = requester
+        self.repo_name = repo_name
+        self.created_at = created_at
+        self.exclusions = [
+            *(f"-author:{quote(user)}" for user in ignored_users),
+            *(f"-label:{quote(label)}" for label in ignored_labels),
+        ]
+
+    def search(self, query: str, page: int) -> dict[str, Any]:
+        """Return one page of search results, newest first."""
+        _, data = self.requester.requestJsonAndCheck(
+            "GET",
+            "/search/issues",
+            parameters={
+                "q": query,
+                "sort": "created",
+                "order": "desc",
+                "per_page": PAGE_SIZE,
+                "page": page,
+            },
+        )
+        result: dict[str, Any] = data
+        return result
+
+    def plan(self, required: tuple[str, ...]) -> Iterator[dict[str, Any]]:
+        """Yield every search result, splitting windows that are too big.
+
+        The first page of each window tells us how many results it has. If
+        that is over the limit, we split the window in half and try again,
+        newest half first, so results still come back newest first.
+        """
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        windows = [(self.created_at, now)]
+        while windows:
+            start, end = windows.pop()
+            query = build_query(required, self.exclusions, start, end)
+            first_page = self.search(query, 1)
+            total = first_page["total_count"]
+            if total > SEARCH_LIMIT and end - start > MIN_WINDOW:
+                middle = start + (end - start) / 2
+                windows.append((start, middle))
+                windows.append((middle + MIN_WINDOW, end))
+                continue
+            yield from first_page["items"]
+            page_count = math.ceil(min(total, SEARCH_LIMIT) / PAGE_SIZE)
+            for page in range(2, page_count + 1):
+                yield from self.search(query, page)["items"]
+
+    def unique(self, required: tuple[str, ...]) -> Iterator[dict[str, Any]]:
+        """Yield each search result once.
+
+        An item created while we are searching can push another onto the
+        next page, so the same item could otherwise be returned twice.
+        """
+        seen: set[int] = set()
+        for item in self.plan(required):
+            if item["id"] not in seen:
+                seen.add(item["id"])
+                yield item
+
+    def get_pull_requests(self) -> list[PRRecord]:
+        """Return all merged PRs, newest first.
+
+        The search API returns PRs as issues, so the 'id' is that of the
+        issue rather than the PR. It is only used to tell records apart.
+        """
+        return [
+            PRRecord(
+                id=item["id"],
+                number=item["number"],
+                title=item["title"],
+                html_url=item["html_url"],
+                user=to_user(item["user"]),
+                merged_at=parse_optional_datetime(
+                    item["pull_request"].get("merged_at")
+                ),
+                labels=to_labels(item["labels"]),
+            )
+            for item in self.unique((f"repo:{self.repo_name}", *PULL_REQUESTS))
+        ]
+
+    def get_issues(self) -> list[IssueRecord]:
+        """Return all closed issues (without any PRs), newest first."""
+        return [
+            IssueRecord(
+                id=item["id"],
+                number=item["number"],
+                title=item["title"],
+                html_url=item["html_url"],
+                user=to_user(item["user"]),
+                closed_at=parse_optional_datetime(item["closed_at"]),
+                labels=to_labels(item["labels"]),
+            )
+            for item in self.unique((f"repo:{self.repo_name}", *ISSUES))
+        ]
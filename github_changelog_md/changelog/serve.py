@@ -0,0 +1,314 @@
+"""Keep the changelog up to date from GitHub webhook events.
+
+'serve' fetches everything once and writes the changelog, then keeps the
+releases, PRs and Issues in memory and listens for the 'pull_request',
+'issues' and 'release' webhooks. The payload of each event has everything we
+need, so the item it is about is updated in memory without asking GitHub for
+anything, and the changelog is written again. The markdown of each release is
+kept in memory too (see 'fragments.py'), so only the releases the event
+changed are rendered again.
+
+Events are handled one at a time, in the order they arrive. If a
+'webhook_secret' is set, events without a matching signature are refused.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import sys
+from dataclasses import replace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import TYPE_CHECKING, Any, TypeVar
+from urllib.parse import parse_qs
+
+import typer
+from rich import print as rprint
+
+from github_changelog_md.changelog.records import (
+    GHOST_USER,
+    IssueRecord,
+    PRRecord,
+    ReleaseRecord,
+    UserRecord,
+    parse_datetime,
+    parse_labels,
+    parse_optional_datetime,
+)
+from github_changelog_md.constants import ExitErrors
+
+if TYPE_CHECKING:  # pragma: no cover
+    from github_changelog_md.changelog.changelog import ChangeLog
+
+T = TypeVar("T", ReleaseRecord, PRRecord, IssueRecord)
+
+EVENT_HEADER = "X-GitHub-Event"
+SIGNATURE_HEADER = "X-Hub-Signature-256"
+
+
+def user_from_payload(data: dict[str, Any] | None) -> UserRecord:
+    """Return the user in a payload, or the 'ghost' user if there isn't one."""
+    if not data:
+        return GHOST_USER
+    return UserRecord(login=data["login"], html_url=data["html_url"])
+
+
+def release_from_payload(data: dict[str, Any]) -> ReleaseRecord:
+    """Return the release in a 'release' event."""
+    return ReleaseRecord(
+        id=data["id"],
+        tag_name=data["tag_name"],
+        title=data.get("name") or "",
+        body=data.get("body") or "",
+        html_url=data["html_url"],
+        created_at=parse_datetime(data["created_at"]),
+    )
+
+
+def pr_from_payload(data: dict[str, Any]) -> PRRecord:
+    """Return the pull request in a 'pull_request' event."""
+    return PRRecord(
+        id=data["id"],
+        number=data["number"],
+        title=data["title"],
+        html_url=data["html_url"],
+        user=user_from_payload(data.get("user")),
+        merged_at=parse_optional_datetime(data.get("merged_at")),
+        labels=parse_labels(data.get("labels") or []),
+    )
+
+
+def issue_from_payload(
+    data: dict[str, Any], closed_by: UserRecord | None
+) -> IssueRecord:
+    """Return the issue in an 'issues' event."""
+    return IssueRecord(
+        id=data["id"],
+        number=data["number"],
+        title=data["title"],
+        html_url=data["html_url"],
+        user=user_from_payload(data.get("user")),
+        closed_at=parse_optional_datetime(data.get("closed_at")),
+        closed_by=closed_by,
+        labels=parse_labels(data.get("labels") or []),
+    )
+
+
+def replace_item(items: list[T], item_id: int, item: T | None) -> list[T]:
+    """Return 'items' with the one with 'item_id' replaced by 'item'.
+
+    The item is added if it wasn't there, and removed if 'item' is None.
+    """
+    kept: list[T] = [existing for existing in items if existing.id != item_id]
+    if item is not None:
+        kept.append(item)
+    return kept
+
+
+def parse_payload(body: bytes, content_type: str) -> dict[str, Any]:
+    """Read the payload, sent as JSON or (if set up that way) as a form."""
+    text = body.decode("utf-8")
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        text = parse_qs(text).get("payload", [""])[0]
+    payload = json.loads(text)
+    if not isinstance(payload, dict):
+        msg = "The payload is not a JSON object"
+        raise TypeError(msg)
+    return payload
+
+
+class LiveChangelog:
+    """A changelog that has been loaded, and is updated by each event."""
+
+    def __init__(self, changelog: ChangeLog, secret: str | None) -> None:
+        """Wrap a changelog that 'load' has already been called on."""
+        self.changelog = changelog
+        self.secret = secret
+        self.keep_closers()
+
+    def verify(self, body: bytes, signature: str | None) -> bool:
+        """Return True if the event was signed with our secret (if any)."""
+        if not self.secret:
+            return True
+        expected = hmac.new(
+            self.secret.encode("utf-8"), body, hashlib.sha256
+        ).hexdigest()
+        return hmac.compare_digest(f"sha256={expected}", signature or "")
+
+    def keep_closers(self) -> None:
+        """Save who closed each issue on the issues themselves.
+
+        They were looked up for the last render, and the next render would
+        otherwise look them up again. Those where nobody was found are
+        remembered too, so they are not looked up again either.
+        """
+        changelog = self.changelog
+        changelog.known_closers.update(changelog.issue_closers)
+        changelog.repo_issues = [
+            replace(issue, closed_by=changelog.issue_closers[issue.number])
+            if not issue.closed_by and changelog.issue_closers.get(issue.number)
+            else issue
+            for issue in changelog.repo_issues
+        ]
+
+    def apply(self, event: str, payload: dict[str, Any]) -> bool:
+        """Update the data from an event, returning False if it was ignored."""
+        changelog = self.changelog
+        action = payload.get("action")
+        repo = payload.get("repository") or {}
+        if (
+            str(repo.get("full_name", "")).lower()
+            != changelog.repo_data.full_name.lower()
+        ):
+            return False
+
+        if event == "release":
+            data = payload["release"]
+            release = (
+                None
+                if action in {"deleted", "unpublished"} or data.get("draft")
+                else release_from_payload(data)
+            )
+            changelog.repo_releases = sorted(
+                replace_item(changelog.repo_releases, data["id"], release),
+                key=lambda release: release.created_at,
+                reverse=True,
+            )
+        elif event == "pull_request":
+            data = payload["pull_request"]
+            pr = pr_from_payload(data) if data["state"] == "closed" else None
+            changelog.repo_prs = sorted(
+                replace_item(changelog.repo_prs, data["id"], pr),
+                key=lambda pr: pr.number,
+                reverse=True,
+            )
+        elif event == "issues":
+            data = payload["issue"]
+            changelog.repo_issues = sorted(
+                replace_item(
+                    changelog.repo_issues, data["id"], self.get_issue(payload)
+                ),
+                key=lambda issue: issue.number,
+                reverse=True,
+            )
+        else:
+            return False
+        return True
+
+    def get_issue(self, payload: dict[str, Any]) -> IssueRecord | None:
+        """Return the issue in an 'issues' event, or None if it isn't closed.
+
+        Whoever sent a 'closed' event closed the issue. For other events we
+        keep the closer we already had.
+        """
+        data = payload["issue"]
+        if (
+            payload.get("action") in {"deleted", "transferred"}
+            or data["state"] != "closed"
+        ):
+            return None
+        if payload.get("action") == "closed":
+            closed_by: UserRecord | None = user_from_payload(
+                payload.get("sender")
+            )
+        else:
+            closed_by = next(
+                (
+                    issue.closed_by
+                    for issue in self.changelog.repo_issues
+                    if issue.id == data["id"]
+                ),
+                None,
+            )
+        return issue_from_payload(data, closed_by)
+
+    def handle(self, event: str, payload: dict[str, Any]) -> str:
+        """Apply an event and write the changelog, returning what happened."""
+        if event == "ping":
+            return "pong"
+        if not self.apply(event, payload):
+            return f"Ignored '{event}' event"
+        self.changelog.render()
+        self.keep_closers()
+        state = "updated" if self.changelog.changelog_changed else "unchanged"
+        return f"Changelog {state} for '{event}' event"
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Handle each webhook event POSTed to the server."""
+
+    server: WebhookServer
+
+    def do_POST(self) -> None:
+        """Check and apply the event, and tell GitHub how it went."""
+        live = self.server.live
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not live.verify(body, self.headers.get(SIGNATURE_HEADER)):
+            self.reply(HTTPStatus.UNAUTHORIZED, "Bad signature")
+            return
+        try:
+            payload = parse_payload(
+                body, self.headers.get("Content-Type", "application/json")
+            )
+        except (TypeError, ValueError):
+            self.reply(HTTPStatus.BAD_REQUEST, "Bad payload")
+            return
+
+        event = self.headers.get(EVENT_HEADER, "")
+        try:
+            message = live.handle(event, payload)
+        except (KeyError, TypeError, ValueError):
+            self.reply(HTTPStatus.BAD_REQUEST, f"Bad '{event}' payload")
+            return
+        except typer.Exit:
+            # the error has already been shown.
+            self.reply(
+                HTTPStatus.INTERNAL_SERVER_ERROR, "Could not update Changelog"
+            )
+            return
+        rprint(f"  [green]->[/green] {message}")
+        self.reply(HTTPStatus.OK, message)
+
+    def reply(self, status: HTTPStatus, message: str) -> None:
+        """Send a short plain text response."""
+        data = f"{message}\n".encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Leave out the request log, each event is reported instead."""
+
+
+class WebhookServer(HTTPServer):
+    """An HTTP server that applies each webhook event to a changelog."""
+
+    def __init__(self, address: tuple[str, int], live: LiveChangelog) -> None:
+        """Listen on 'address', updating the 'live' changelog."""
+        super().__init__(address, WebhookHandler)
+        self.live = live
+
+
+def serve_forever(live: LiveChangelog, host: str, port: int) -> None:
+    """Listen for webhook events until interrupted."""
+    try:
+        server = WebhookServer((host, port), live)
+    except OSError as exc:
+        rprint(
+            f"\n[red]  X  Error: Cannot listen on {host}:{port} : {exc}\n",
+            file=sys.stderr,
+        )
+        raise typer.Exit(ExitErrors.OS_ERROR) from exc
+    with server:
+        rprint(
+            f"  [green]->[/green] Listening for webhooks on [bold]http://"
+            f"{host}:{server.server_port}/[/bold], press Ctrl+C to stop\n"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            rprint("\n  [green]->[/green] Stopped\n")
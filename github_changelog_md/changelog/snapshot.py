@@ -0,0 +1,102 @@
+"""Save everything needed to render a changelog to a single file.
+
+The 'fetch' command writes the repository details, releases, PRs and Issues
+(with the user who closed each issue already resolved) to a snapshot, and the
+'render' command builds the changelog from that snapshot without talking to
+GitHub at all. Changing how the changelog looks then doesn't mean downloading
+everything again.
+
+The snapshot is compact JSON, with a version number so that a snapshot
+written by a different version of this tool is rejected rather than misread.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NoReturn
+
+import typer
+from rich import print as rprint
+
+from github_changelog_md.changelog.records import (
+    IssueRecord,
+    PRRecord,
+    ReleaseRecord,
+    RepoRecord,
+    parse_datetime,
+    to_dict,
+)
+from github_changelog_md.constants import ExitErrors
+
+if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from pathlib import Path
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """The data for one repository, as fetched from GitHub."""
+
+    repo: RepoRecord
+    fetched_at: datetime.datetime
+    releases: list[ReleaseRecord]
+    pull_requests: list[PRRecord]
+    issues: list[IssueRecord]
+
+    def save(self, path: Path) -> None:
+        """Write the snapshot to 'path'."""
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "fetched_at": self.fetched_at.isoformat(),
+            "repo": to_dict(self.repo),
+            "releases": [to_dict(release) for release in self.releases],
+            "pull_requests": [to_dict(pr) for pr in self.pull_requests],
+            "issues": [to_dict(issue) for issue in self.issues],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(data, separators=(",", ":")), encoding="utf-8"
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Snapshot:
+        """Read a snapshot written by 'save', exiting if we can't."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            snapshot_error(f"Cannot read snapshot '{path}' : {exc}")
+
+        if data.get("version") != SNAPSHOT_VERSION:
+            snapshot_error(
+                f"Snapshot '{path}' is version {data.get('version')}, but "
+                f"version {SNAPSHOT_VERSION} is needed. Please run 'fetch' "
+                "again."
+            )
+
+        try:
+            return cls(
+                repo=RepoRecord.from_dict(data["repo"]),
+                fetched_at=parse_datetime(data["fetched_at"]),
+                releases=[
+                    ReleaseRecord.from_dict(release)
+                    for release in data["releases"]
+                ],
+                pull_requests=[
+                    PRRecord.from_dict(pr) for pr in data["pull_requests"]
+                ],
+                issues=[
+                    IssueRecord.from_dict(issue) for issue in data["issues"]
+                ],
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            snapshot_error(f"Snapshot '{path}' is damaged : {exc!r}")
+
+
+def snapshot_error(message: str) -> NoReturn:
+    """Show a snapshot error and exit."""
+    rprint(f"\n[red]  X  Error: {message}\n", file=sys.stderr)
+    raise typer.Exit(ExitErrors.BAD_SNAPSHOT)
@@ -0,0 +1,245 @@
+"""Keep a local copy of the Releases, PRs and Issues between runs.
+
+The first run downloads the full history as usual. After that, we only ask
+GitHub for the PRs and Issues updated since the last sync (using 'since' for
+Issues and 'updated' sort ordering for PRs), merge those into the store, and
+hand the full lists to the rest of the changelog code. Releases are always
+fetched in full, as they have no reliable 'updated' date.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import sqlite3
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from github_changelog_md.changelog.records import (
+    IssueRecord,
+    PRRecord,
+    ReleaseRecord,
+    parse_datetime,
+    to_dict,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pathlib import Path
+
+    from github.Repository import Repository
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    repo TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (repo, kind, id)
+);
+CREATE TABLE IF NOT EXISTS sync (
+    repo TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+"""
+
+RELEASE = "release"
+PULL_REQUEST = "pr"
+ISSUE = "issue"
+
+# items updated while a sync is running may be missed, so the next sync starts
+# a little before the last one did. Saving an item twice is harmless.
+SYNC_OVERLAP = datetime.timedelta(minutes=5)
+
+
+@dataclass
+class SyncResult:
+    """The merged contents of the store after a sync."""
+
+    releases: list[ReleaseRecord]
+    pull_requests: list[PRRecord]
+    issues: list[IssueRecord]
+    updated: int
+
+
+@dataclass
+class StoreChanges:
+    """The records of one kind to save, and the ids of those to remove."""
+
+    kind: str
+    records: list[ReleaseRecord] | list[PRRecord] | list[IssueRecord]
+    deleted: list[int]
+
+    @property
+    def count(self) -> int:
+        """Return how many items were updated."""
+        return len(self.records) + len(self.deleted)
+
+
+class LocalStore:
+    """A SQLite store of normalized records, keyed by repository."""
+
+    def __init__(self, path: Path) -> None:
+        """Open (creating if needed) the store at 'path'."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def get_synced_at(self, repo: str) -> datetime.datetime | None:
+        """Return when this repository was last synced, if ever."""
+        row = self.connection.execute(
+            "SELECT synced_at FROM sync WHERE repo = ?", (repo,)
+        ).fetchone()
+        return parse_datetime(row[0]) if row else None
+
+    def set_synced_at(self, repo: str, synced_at: datetime.datetime) -> None:
+        """Record when this repository was last synced."""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO sync (repo, synced_at) VALUES (?, ?)",
+            (repo, synced_at.isoformat()),
+        )
+
+    def save(
+        self,
+        repo: str,
+        kind: str,
+        records: list[ReleaseRecord] | list[PRRecord] | list[IssueRecord],
+    ) -> None:
+        """Insert or update records of the given kind."""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO items (repo, kind, id, data) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (repo, kind, record.id, json.dumps(to_dict(record)))
+                for record in records
+            ],
+        )
+
+    def delete(self, repo: str, kind: str, ids: list[int]) -> None:
+        """Remove records of the given kind, eg issues that were reopened."""
+        self.connection.executemany(
+            "DELETE FROM items WHERE repo = ? AND kind = ? AND id = ?",
+            [(repo, kind, item_id) for item_id in ids],
+        )
+
+    def load(self, repo: str, kind: str) -> list[dict[str, Any]]:
+        """Return the saved data for every record of the given kind."""
+        rows = self.connection.execute(
+            "SELECT data FROM items WHERE repo = ? AND kind = ? "
+            "ORDER BY id DESC",
+            (repo, kind),
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def commit(self) -> None:
+        """Commit any pending changes."""
+        self.connection.commit()
+
+    def sync(self, repo: Repository) -> SyncResult:
+        """Bring the store up to date with GitHub, and return its contents.
+
+        Nothing is committed unless the whole sync succeeds, so an interrupted
+        run just repeats the same sync next time. Everything is fetched before
+        anything is written, so the database is only locked for a moment and
+        other runs sharing the store are not kept waiting.
+        """
+        name = repo.full_name
+        started_at = datetime.datetime.now(tz=datetime.timezone.utc)
+        synced_at = self.get_synced_at(name)
+
+        changes = [
+            self.sync_releases(repo),
+            self.sync_pull_requests(repo, synced_at),
+            self.sync_issues(repo, synced_at),
+        ]
+        for change in changes:
+            self.save(name, change.kind, change.records)
+            self.delete(name, change.kind, change.deleted)
+        self.set_synced_at(name, started_at - SYNC_OVERLAP)
+        self.commit()
+
+        releases = [
+            ReleaseRecord.from_dict(data) for data in self.load(name, RELEASE)
+        ]
+        releases.sort(key=lambda release: release.created_at, reverse=True)
+        return SyncResult(
+            releases=releases,
+            pull_requests=[
+                PRRecord.from_dict(data)
+                for data in self.load(name, PULL_REQUEST)
+            ],
+            issues=[
+                IssueRecord.from_dict(data) for data in self.load(name, ISSUE)
+            ],
+            updated=sum(change.count for change in changes),
+        )
+
+    def sync_releases(self, repo: Repository) -> StoreChanges:
+        """Return the changes to the saved releases, fetching them all.
+
+        A release's 'created_at' is the date of its commit rather than when it
+        was published, and releases can be edited or deleted, so they are
+        always fetched in full. There are only ever a few pages of them.
+        """
+        name = repo.full_name
+        saved = {
+            data["id"]: ReleaseRecord.from_dict(data)
+            for data in self.load(name, RELEASE)
+        }
+        releases = [
+            ReleaseRecord.from_github(release)
+            for release in repo.get_releases()
+        ]
+        changed = [
+            release for release in releases if saved.get(release.id) != release
+        ]
+        deleted = sorted(saved.keys() - {release.id for release in releases})
+        return StoreChanges(RELEASE, changed, deleted)
+
+    def sync_pull_requests(
+        self, repo: Repository, synced_at: datetime.datetime | None
+    ) -> StoreChanges:
+        """Return closed PRs updated since the last sync, and reopened ones."""
+        if synced_at is None:
+            pulls = repo.get_pulls(state="closed", sort="created")
+            prs = [PRRecord.from_github(pr) for pr in pulls]
+            return StoreChanges(PULL_REQUEST, prs, [])
+
+        closed: list[PRRecord] = []
+        reopened: list[int] = []
+        for pr in repo.get_pulls(state="all", sort="updated", direction="desc"):
+            if pr.updated_at is not None and pr.updated_at < synced_at:
+                break
+            if pr.state == "closed":
+                closed.append(PRRecord.from_github(pr))
+            else:
+                reopened.append(pr.id)
+        return StoreChanges(PULL_REQUEST, closed, reopened)
+
+    def sync_issues(
+        self, repo: Repository, synced_at: datetime.datetime | None
+    ) -> StoreChanges:
+        """Return closed issues updated since the last sync, and reopened ones.
+
+        The issues endpoint also returns PRs, which we skip.
+        """
+        if synced_at is None:
+            issues = repo.get_issues(state="closed", sort="created")
+        else:
+            issues = repo.get_issues(
+                state="all", sort="updated", since=synced_at
+            )
+
+        closed: list[IssueRecord] = []
+        reopened: list[int] = []
+        for issue in issues:
+            if issue.pull_request:
+                continue
+            if issue.state == "closed":
+                closed.append(IssueRecord.from_github(issue))
+            else:
+                reopened.append(issue.id)
+        return StoreChanges(ISSUE, closed, reopened)
@@ -0,0 +1,51 @@
+"""Fetch and render only the newest releases, keeping the rest of the file.
+
+With 'max_releases' set we fetch the newest N releases, plus the one before
+them (the 'boundary' release). Anything merged or closed before the boundary
+was created can't be in the newest N releases, so PRs and Issues are fetched
+most recently updated first and we stop at the first one last updated before
+then (merging or closing an item always updates it, so nothing newer can come
+after that).
+
+Only the newest N releases are rendered. Everything from the boundary
+release's heading onwards is copied from the existing changelog unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from collections.abc import Iterable, Iterator
+
+T = TypeVar("T")
+
+
+def updated_since(
+    items: Iterable[T],
+    since: datetime.datetime,
+    get_updated: Callable[[T], datetime.datetime],
+) -> Iterator[T]:
+    """Yield items (most recently updated first) until one is before 'since'.
+
+    Stopping here means the pages after it are never requested.
+    """
+    for item in items:
+        if get_updated(item) < since:
+            return
+        yield item
+
+
+def find_tail(text: str, tag_name: str) -> str | None:
+    """Return 'text' from the heading of release 'tag_name' to the end.
+
+    This is None if the release has no heading in the text.
+    """
+    match = re.search(
+        rf"^## \[{re.escape(tag_name)}\]\(", text, flags=re.MULTILINE
+    )
+    if match is None:
+        return None
+    return text[match.start() :]
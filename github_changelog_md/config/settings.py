@@ -49,6 +49,22 @@ class Settings(TOMLSettings):
     release_text: Optional[list[dict[str, str]]] = None
     release_text_before: Optional[list[dict[str, str]]] = None
     release_overrides: Optional[list[dict[str, str]]] = None
+    backend: str = "rest"
+    release_source: str = "github"
+    contributors_source: str = "github"
+    profile_cache_days: int = 7
+    local_store: bool = False
+    cache_dir: Optional[str] = None
+    http_cache: bool = True
+    http_cache_size: int = 100
+    fetch_workers: int = 4
+    rate_limit_wait: int = 60
+    shared_rate_limit: int = 0
+    checkpoints: bool = True
+    quick_check: bool = False
+    fragment_cache: bool = False
+    max_releases: Optional[int] = None
+    webhook_secret: Optional[str] = None
 
 
 def get_settings_object() -> Settings:
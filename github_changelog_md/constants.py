@@ -25,6 +25,8 @@ class ChangelogOptions(TypedDict):
     max_depends: int
     show_diff: bool
     show_patch: bool
+    quick_check: bool
+    max_releases: int | None
 
 
 class ExitErrors(IntEnum):
@@ -40,6 +42,14 @@ class ExitErrors(IntEnum):
     INVALID_ACTION = 5
     NO_PAT = 6
     BAD_SCHEMA = 7
+    BAD_SNAPSHOT = 8
+    # not an error, only used with '--exit-code' when nothing was changed.
+    UNCHANGED = 9
+    MISSING_HISTORY = 10
+    LOCAL_GIT_ERROR = 11
+    BAD_MANIFEST = 12
+    # at least one repository in a batch failed.
+    BATCH_FAILED = 13
 
 
 # label names should be lowercase
@@ -70,3 +80,17 @@ IGNORED_CONTRIBUTORS: list[str] = [
 CONFIG_FILE: str = ".changelog_generator.toml"
 OUTPUT_FILE: str = "CHANGELOG.md"
 CONTRIBUTORS_FILE: str = "CONTRIBUTORS.md"
+
+# folder name (under the user cache folder) for the local store and caches.
+CACHE_DIR_NAME: str = "github-changelog-md"
+STORE_FILE: str = "store.sqlite3"
+HTTP_CACHE_FILE: str = "http-cache.sqlite3"
+CHECKPOINT_DIR: str = "checkpoints"
+SNAPSHOT_FILE: str = "changelog-snapshot.json"
+FINGERPRINT_DIR: str = "fingerprints"
+FRAGMENT_DIR: str = "fragments"
+PROFILE_CACHE_FILE: str = "profiles.json"
+RATE_LIMIT_DIR: str = "rate-limits"
+BATCH_FILE: str = "changelog-batch.toml"
+SERVE_HOST: str = "127.0.0.1"
+SERVE_PORT: int = 8080
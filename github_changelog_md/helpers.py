@@ -2,20 +2,38 @@
 
 from __future__ import annotations
 
+import os
 import subprocess
 import sys
+import tempfile
 from importlib import metadata, resources
 from pathlib import Path
-from shutil import which
+from shutil import copymode, which
 from typing import TYPE_CHECKING
 
 import rtoml
 from rich import print as rprint
 
-from github_changelog_md.constants import SECTIONS, ExitErrors, SectionHeadings
+from github_changelog_md.constants import (
+    CACHE_DIR_NAME,
+    SECTIONS,
+    ExitErrors,
+    SectionHeadings,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
-    from github.GitRelease import GitRelease
+    from github_changelog_md.changelog.records import ReleaseRecord
+
+
+def get_umask() -> int:
+    """Return the process umask, which can only be read by setting it."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# read once, as setting it again later is not safe with threads running.
+UMASK = get_umask()
 
 
 def get_toml_path() -> Path:
@@ -69,8 +87,8 @@ def header() -> None:
     )
 
 
-def get_repo_name() -> str | None:
-    """Return the name of the repository from the current directory."""
+def get_repo_name(folder: Path | None = None) -> str | None:
+    """Return the name of the repository in 'folder', or the current one."""
     git_executable = which("git")
     if git_executable is None:
         return None
@@ -78,6 +96,7 @@ def get_repo_name() -> str | None:
     try:
         remote_url = subprocess.run(  # noqa: S603
             [git_executable, "remote", "get-url", "origin"],
+            cwd=folder,
             check=True,
             capture_output=True,
             text=True,
@@ -93,6 +112,68 @@ def get_repo_name() -> str | None:
     return repo_name.strip() or None
 
 
+def get_cache_dir(cache_dir: str | None = None) -> Path:
+    """Return the folder used for the local store and any caches.
+
+    This is the 'cache_dir' setting if given, otherwise a folder under
+    '$XDG_CACHE_HOME' (or '~/.cache' if that is not set).
+    """
+    if cache_dir:
+        return Path(cache_dir).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / CACHE_DIR_NAME
+
+
+def write_atomic(path: Path, text: str) -> bool:
+    """Write 'text' to 'path' so that readers never see a partial file.
+
+    The text goes to a temporary file in the same folder, which then replaces
+    'path' in one step. If anything goes wrong, the old file is left as it
+    was. An existing file keeps its permissions, and a new one gets the
+    usual permissions for a new file.
+
+    If the file already holds exactly this text it is not touched at all (so
+    its modified time doesn't change), and False is returned.
+    """
+    data = text.replace("\n", os.linesep).encode("utf-8")
+    if file_matches(path, data):
+        return False
+
+    # a unique name, so a temp file left by a killed run is never in the way.
+    fd, temp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    temp_path = Path(temp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            copymode(path, temp_path)
+        else:
+            temp_path.chmod(0o666 & ~UMASK)
+        temp_path.replace(path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def file_matches(path: Path, data: bytes) -> bool:
+    """Return True if the file at 'path' holds exactly 'data'.
+
+    The sizes are compared first, so a changed file is usually caught
+    without reading it.
+    """
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except OSError:
+        return False
+
+
 def cap_first_letter(string: str) -> str:
     """Capitalize the first letter of a string only.
 
@@ -129,7 +210,7 @@ def strip_first_alpha_char(version_string: str) -> str:
     return version_string
 
 
-def title_unique(release: GitRelease) -> bool:
+def title_unique(release: ReleaseRecord) -> bool:
     """Ensures that the release title and tag name are not the same.
 
     It will remove the first alpha character from the title and tag (if it is a
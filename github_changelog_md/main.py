@@ -3,17 +3,48 @@
 # ruff: noqa: FBT001
 from __future__ import annotations
 
+import contextlib
 import sys
+from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
 import typer
 from rich import print as rprint
 
 from github_changelog_md.changelog import ChangeLog
+from github_changelog_md.changelog.batch import (
+    BatchJob,
+    BatchRunner,
+    Manifest,
+    repo_settings,
+)
+from github_changelog_md.changelog.bucket import SharedBucket, token_key
+from github_changelog_md.changelog.connection import shared_connections
+from github_changelog_md.changelog.http_cache import response_cache
+from github_changelog_md.changelog.ratelimit import RateLimitScheduler
+from github_changelog_md.changelog.serve import LiveChangelog, serve_forever
+from github_changelog_md.changelog.snapshot import Snapshot
 from github_changelog_md.config import get_settings
-from github_changelog_md.helpers import get_app_version, get_repo_name
+from github_changelog_md.constants import (
+    BATCH_FILE,
+    HTTP_CACHE_FILE,
+    RATE_LIMIT_DIR,
+    SERVE_HOST,
+    SERVE_PORT,
+    SNAPSHOT_FILE,
+    ExitErrors,
+)
+from github_changelog_md.helpers import (
+    get_app_version,
+    get_cache_dir,
+    get_repo_name,
+    write_atomic,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from github_changelog_md.config.settings import Settings
     from github_changelog_md.constants import ChangelogOptions
 
 app = typer.Typer(
@@ -24,143 +55,201 @@ app = typer.Typer(
 )
 
 
-@app.command()
-def main(
-    version: Optional[bool] = typer.Option(
-        None,
-        "-v",
-        "--version",
-        is_eager=True,
-    ),
-    repo: Optional[str] = typer.Option(
-        None,
-        "--repo",
-        "-r",
-        help="Name of the repository to generate the Changelog for.",
-        show_default=False,
-    ),
-    user: Optional[str] = typer.Option(
-        None,
-        "--user",
-        "-u",
-        help="Name of the user or organisation that owns the repository.",
-        show_default=False,
-    ),
-    next_release: Optional[str] = typer.Option(
-        None,
-        "--next-release",
-        "-n",
-        help="Name of the next release to generate the changelog for.",
-        show_default=False,
+# these options are shared by more than one command.
+REPO_OPTION = typer.Option(
+    None,
+    "--repo",
+    "-r",
+    help="Name of the repository to generate the Changelog for.",
+    show_default=False,
+)
+USER_OPTION = typer.Option(
+    None,
+    "--user",
+    "-u",
+    help="Name of the user or organisation that owns the repository.",
+    show_default=False,
+)
+NEXT_RELEASE_OPTION = typer.Option(
+    None,
+    "--next-release",
+    "-n",
+    help="Name of the next release to generate the changelog for.",
+    show_default=False,
+)
+UNRELEASED_OPTION = typer.Option(
+    default=None,
+    help=(
+        "Show unreleased changes in the Changelog, defaults to [bold]True"
+        "[/bold]."
     ),
-    unreleased: Optional[bool] = typer.Option(
-        default=None,
-        help=(
-            "Show unreleased changes in the Changelog, defaults to [bold]True"
-            "[/bold]."
-        ),
-        show_default=False,
+    show_default=False,
+)
+CONTRIB_OPTION = typer.Option(
+    default=None,
+    help="Update the CONTRIBUTORS.md file, defaults to [bold]False[/bold].",
+    show_default=False,
+)
+DEPENDS_OPTION = typer.Option(
+    default=None,
+    help=(
+        "Show dependency updates in the Changelog, defaults to [bold]True"
+        "[/bold]."
     ),
-    contrib: Optional[bool] = typer.Option(
-        default=None,
-        help="Update the CONTRIBUTORS.md file, defaults to [bold]False[/bold].",
-        show_default=False,
+    show_default=False,
+)
+OUTPUT_OPTION = typer.Option(
+    None,
+    "--output",
+    "-o",
+    help="Output file to write the Changelog to.",
+    show_default=False,
+)
+QUIET_OPTION = typer.Option(
+    None,
+    "--quiet",
+    "-q",
+    help="Suppress all output except errors.",
+    show_default=False,
+)
+SKIP_OPTION = typer.Option(
+    [],
+    "--skip",
+    "-s",
+    help="Skip the suplied tag. Can be specified multiple times",
+    show_default=False,
+)
+ISSUES_OPTION = typer.Option(
+    default=None,
+    help=(
+        "Show CLOSED issues in the Changelog, defaults to [bold]True[/bold]."
     ),
-    depends: Optional[bool] = typer.Option(
-        default=None,
-        help=(
-            "Show dependency updates in the Changelog, defaults to [bold]True"
-            "[/bold]."
-        ),
-        show_default=False,
+    show_default=False,
+)
+ITEM_ORDER_OPTION = typer.Option(
+    None,
+    "--item-order",
+    "-i",
+    help=(
+        "Order of PRs and Issues in a release section. "
+        "Valid options are [bold]'newest-first'[/bold] or [bold]'oldest-"
+        "first'[/bold]. Defaults to [bold]'newest-first'[/bold]."
     ),
-    output: Optional[str] = typer.Option(
-        None,
-        "--output",
-        "-o",
-        help="Output file to write the Changelog to.",
-        show_default=False,
+    show_default=False,
+)
+IGNORE_OPTION = typer.Option(
+    [],
+    "--ignore",
+    "-e",
+    help=(
+        "Ignore the supplied PR or Issue by its number. Can be specified "
+        "multiple times."
     ),
-    quiet: Optional[bool] = typer.Option(
-        None,
-        "--quiet",
-        "-q",
-        help="Suppress all output except errors.",
-        show_default=False,
+    show_default=False,
+)
+MAX_DEPENDS_OPTION = typer.Option(
+    None,
+    "--max-depends",
+    "-m",
+    help=(
+        "Maximum number of dependency updates to show in the Changelog. "
+        "Defaults to [bold]10[/bold]."
     ),
-    skip: Optional[list[str]] = typer.Option(  # noqa: B008
-        [],
-        "--skip",
-        "-s",
-        help="Skip the suplied tag. Can be specified multiple times",
-        show_default=False,
+    show_default=False,
+)
+SHOW_DIFF_OPTION = typer.Option(
+    default=None,
+    help=(
+        "Show the diff of the PRs and Issues in the Changelog, defaults "
+        "to [bold]True[/bold]."
     ),
-    issues: Optional[bool] = typer.Option(
-        default=None,
-        help=(
-            "Show CLOSED issues in the Changelog, defaults to [bold]True"
-            "[/bold]."
-        ),
-        show_default=False,
+    show_default=False,
+)
+SHOW_PATCH_OPTION = typer.Option(
+    default=None,
+    help=(
+        "Show the patch of the PRs and Issues in the Changelog, defaults "
+        "to [bold]True[/bold]."
     ),
-    item_order: Optional[str] = typer.Option(
-        None,
-        "--item-order",
-        "-i",
-        help=(
-            "Order of PRs and Issues in a release section. "
-            "Valid options are [bold]'newest-first'[/bold] or [bold]'oldest-"
-            "first'[/bold]. Defaults to [bold]'newest-first'[/bold]."
-        ),
-        show_default=False,
+    show_default=False,
+)
+CACHE_OPTION = typer.Option(
+    default=None,
+    help=(
+        "Cache GitHub responses and only download what has changed, "
+        "defaults to [bold]True[/bold]."
     ),
-    ignore: Optional[list[int]] = typer.Option(  # noqa: B008
-        [],
-        "--ignore",
-        "-e",
-        help=(
-            "Ignore the supplied PR or Issue by its number. Can be specified "
-            "multiple times."
-        ),
-        show_default=False,
+    show_default=False,
+)
+QUICK_CHECK_OPTION = typer.Option(
+    default=None,
+    help=(
+        "Check GitHub for changes first, and do nothing if there are none "
+        "since the last run. Defaults to [bold]False[/bold]."
     ),
-    max_depends: Optional[int] = typer.Option(
-        None,
-        "--max-depends",
-        "-m",
-        help=(
-            "Maximum number of dependency updates to show in the Changelog. "
-            "Defaults to [bold]10[/bold]."
-        ),
-        show_default=False,
+    show_default=False,
+)
+MAX_RELEASES_OPTION = typer.Option(
+    None,
+    "--max-releases",
+    help=(
+        "Only fetch and regenerate the newest N releases, keeping the older "
+        "ones from the existing Changelog."
     ),
-    show_diff: Optional[bool] = typer.Option(
-        default=None,
-        help=(
-            "Show the diff of the PRs and Issues in the Changelog, defaults "
-            "to [bold]True[/bold]."
-        ),
-        show_default=False,
+    show_default=False,
+)
+EXIT_CODE_OPTION = typer.Option(
+    False,
+    "--exit-code",
+    help=(
+        "Exit with code [bold]9[/bold] if no file was changed, so scripts "
+        "can skip rebuilding or committing them."
     ),
-    show_patch: Optional[bool] = typer.Option(
-        default=None,
-        help=(
-            "Show the patch of the PRs and Issues in the Changelog, defaults "
-            "to [bold]True[/bold]."
-        ),
-        show_default=False,
+    show_default=False,
+)
+UNRELEASED_OUTPUT_OPTION = typer.Option(
+    None,
+    "--output",
+    "-o",
+    help="File to write the Unreleased section to, instead of the screen.",
+    show_default=False,
+)
+MANIFEST_ARGUMENT = typer.Argument(
+    BATCH_FILE,
+    help="Manifest file listing the repositories to generate Changelogs for.",
+)
+JOBS_OPTION = typer.Option(
+    None,
+    "--jobs",
+    "-j",
+    min=1,
+    help=(
+        "How many repositories to work on at the same time. Defaults to the "
+        "'jobs' in the manifest, or [bold]4[/bold]."
     ),
-) -> None:
-    """Generate your CHANGELOG file Automatically from GitHub."""
-    if version:
-        rprint(
-            "\n[green]Github Changelog Markdown - "
-            "Generate your CHANGELOG file automatically."
-            f"\n[/green]Version: {get_app_version()}; "
-            "\u00a9 Grant Ramsay 2023\n",
-        )
-        raise typer.Exit
+    show_default=False,
+)
+HOST_OPTION = typer.Option(
+    SERVE_HOST,
+    "--host",
+    help="Address to listen for webhooks on.",
+)
+PORT_OPTION = typer.Option(
+    SERVE_PORT,
+    "--port",
+    "-p",
+    help="Port to listen for webhooks on.",
+)
+SNAPSHOT_OPTION = typer.Option(
+    SNAPSHOT_FILE,
+    "--snapshot",
+    "-f",
+    help="Snapshot file to save the fetched data to, or render from.",
+)
+
 
+def find_repo(repo: str | None) -> str:
+    """Return the repository name, from the current folder if not given."""
     if not repo:
         # Try to get the repo from the current directory.
         repo = get_repo_name()
@@ -173,10 +262,31 @@ def main(
                 file=sys.stderr,
             )
             raise typer.Exit
+    return repo
 
-    settings = get_settings()
 
-    options: ChangelogOptions = {
+def get_options(
+    settings: Settings,
+    *,
+    user: str | None = None,
+    next_release: str | None = None,
+    unreleased: bool | None = None,
+    contrib: bool | None = None,
+    depends: bool | None = None,
+    output: str | None = None,
+    quiet: bool | None = None,
+    skip: list[str] | None = None,
+    issues: bool | None = None,
+    item_order: str | None = None,
+    ignore: list[int] | None = None,
+    max_depends: int | None = None,
+    show_diff: bool | None = None,
+    show_patch: bool | None = None,
+    quick_check: bool | None = None,
+    max_releases: int | None = None,
+) -> ChangelogOptions:
+    """Merge the command line options over those in the settings file."""
+    return {
         "user_name": user,
         "next_release": next_release,
         "show_unreleased": (
@@ -186,16 +296,349 @@ def main(
         "output_file": settings.output_file if output is None else output,
         "contributors": settings.contrib if contrib is None else contrib,
         "quiet": settings.quiet if quiet is None else quiet,
-        "skip_releases": settings.skip_releases if skip == [] else skip,
+        "skip_releases": skip or settings.skip_releases,
         "show_issues": settings.show_issues if issues is None else issues,
         "item_order": settings.item_order if item_order is None else item_order,
-        "ignore_items": settings.ignore_items if ignore == [] else ignore,
+        "ignore_items": ignore or settings.ignore_items,
         "max_depends": settings.max_depends
         if max_depends is None
         else max_depends,
         "show_diff": settings.show_diff if show_diff is None else show_diff,
         "show_patch": settings.show_patch if show_patch is None else show_patch,
+        "quick_check": (
+            settings.quick_check if quick_check is None else quick_check
+        ),
+        "max_releases": (
+            settings.max_releases if max_releases is None else max_releases
+        ),
     }
 
-    changelog = ChangeLog(repo, options)
+
+def check_unchanged(changelog: ChangeLog, *, exit_code: bool) -> None:
+    """Exit with 'UNCHANGED' if asked to and no file we write was changed."""
+    if exit_code and not (
+        changelog.changelog_changed or changelog.contributors_changed
+    ):
+        raise typer.Exit(ExitErrors.UNCHANGED)
+
+
+@contextlib.contextmanager
+def github_connections(
+    settings: Settings, cache: bool | None
+) -> Iterator[None]:
+    """Set up the connections to GitHub used by clients made in this block."""
+    bucket = None
+    if settings.shared_rate_limit > 0:
+        pat = getattr(settings, "github_pat", "")
+        bucket = SharedBucket(
+            get_cache_dir(settings.cache_dir)
+            / RATE_LIMIT_DIR
+            / f"{token_key(pat)}.json",
+            settings.shared_rate_limit,
+        )
+    scheduler = RateLimitScheduler(
+        max_wait=settings.rate_limit_wait * 60, bucket=bucket
+    )
+    if settings.http_cache if cache is None else cache:
+        with response_cache(
+            get_cache_dir(settings.cache_dir) / HTTP_CACHE_FILE,
+            settings.http_cache_size * 1024 * 1024,
+            scheduler,
+        ):
+            yield
+    else:
+        with shared_connections(scheduler=scheduler):
+            yield
+
+
+@app.callback(invoke_without_command=True)
+def main(
+    ctx: typer.Context,
+    version: Optional[bool] = typer.Option(
+        None,
+        "-v",
+        "--version",
+        is_eager=True,
+    ),
+    repo: Optional[str] = REPO_OPTION,
+    user: Optional[str] = USER_OPTION,
+    next_release: Optional[str] = NEXT_RELEASE_OPTION,
+    unreleased: Optional[bool] = UNRELEASED_OPTION,
+    contrib: Optional[bool] = CONTRIB_OPTION,
+    depends: Optional[bool] = DEPENDS_OPTION,
+    output: Optional[str] = OUTPUT_OPTION,
+    quiet: Optional[bool] = QUIET_OPTION,
+    skip: Optional[list[str]] = SKIP_OPTION,
+    issues: Optional[bool] = ISSUES_OPTION,
+    item_order: Optional[str] = ITEM_ORDER_OPTION,
+    ignore: Optional[list[int]] = IGNORE_OPTION,
+    max_depends: Optional[int] = MAX_DEPENDS_OPTION,
+    show_diff: Optional[bool] = SHOW_DIFF_OPTION,
+    show_patch: Optional[bool] = SHOW_PATCH_OPTION,
+    cache: Optional[bool] = CACHE_OPTION,
+    quick_check: Optional[bool] = QUICK_CHECK_OPTION,
+    max_releases: Optional[int] = MAX_RELEASES_OPTION,
+    exit_code: bool = EXIT_CODE_OPTION,
+) -> None:
+    """Generate your CHANGELOG file Automatically from GitHub.
+
+    Use the [bold]fetch[/bold] and [bold]render[/bold] commands to do this in
+    two separate steps.
+    """
+    if version:
+        rprint(
+            "\n[green]Github Changelog Markdown - "
+            "Generate your CHANGELOG file automatically."
+            f"\n[/green]Version: {get_app_version()}; "
+            "\u00a9 Grant Ramsay 2023\n",
+        )
+        raise typer.Exit
+
+    if ctx.invoked_subcommand:
+        return
+
+    repo = find_repo(repo)
+    settings = get_settings()
+
+    options = get_options(
+        settings,
+        user=user,
+        next_release=next_release,
+        unreleased=unreleased,
+        contrib=contrib,
+        depends=depends,
+        output=output,
+        quiet=quiet,
+        skip=skip,
+        issues=issues,
+        item_order=item_order,
+        ignore=ignore,
+        max_depends=max_depends,
+        show_diff=show_diff,
+        show_patch=show_patch,
+        quick_check=quick_check,
+        max_releases=max_releases,
+    )
+
+    with github_connections(settings, cache):
+        changelog = ChangeLog(repo, options)
+        changelog.run()
+    check_unchanged(changelog, exit_code=exit_code)
+
+
+@app.command()
+def fetch(
+    repo: Optional[str] = REPO_OPTION,
+    user: Optional[str] = USER_OPTION,
+    quiet: Optional[bool] = QUIET_OPTION,
+    cache: Optional[bool] = CACHE_OPTION,
+    snapshot: str = SNAPSHOT_OPTION,
+) -> None:
+    """Fetch the data for the Changelog from GitHub into a snapshot file."""
+    repo = find_repo(repo)
+    settings = get_settings()
+    options = get_options(settings, user=user, quiet=quiet)
+
+    with github_connections(settings, cache):
+        changelog = ChangeLog(repo, options)
+        changelog.save_snapshot(Path(snapshot))
+
+
+@app.command()
+def render(
+    next_release: Optional[str] = NEXT_RELEASE_OPTION,
+    unreleased: Optional[bool] = UNRELEASED_OPTION,
+    contrib: Optional[bool] = CONTRIB_OPTION,
+    depends: Optional[bool] = DEPENDS_OPTION,
+    output: Optional[str] = OUTPUT_OPTION,
+    quiet: Optional[bool] = QUIET_OPTION,
+    skip: Optional[list[str]] = SKIP_OPTION,
+    issues: Optional[bool] = ISSUES_OPTION,
+    item_order: Optional[str] = ITEM_ORDER_OPTION,
+    ignore: Optional[list[int]] = IGNORE_OPTION,
+    max_depends: Optional[int] = MAX_DEPENDS_OPTION,
+    show_diff: Optional[bool] = SHOW_DIFF_OPTION,
+    show_patch: Optional[bool] = SHOW_PATCH_OPTION,
+    max_releases: Optional[int] = MAX_RELEASES_OPTION,
+    snapshot: str = SNAPSHOT_OPTION,
+    exit_code: bool = EXIT_CODE_OPTION,
+) -> None:
+    """Generate the CHANGELOG file from a snapshot, without using GitHub."""
+    settings = get_settings()
+    saved = Snapshot.load(Path(snapshot))
+    options = get_options(
+        settings,
+        next_release=next_release,
+        unreleased=unreleased,
+        contrib=contrib,
+        depends=depends,
+        output=output,
+        quiet=quiet,
+        skip=skip,
+        issues=issues,
+        item_order=item_order,
+        ignore=ignore,
+        max_depends=max_depends,
+        show_diff=show_diff,
+        show_patch=show_patch,
+        max_releases=max_releases,
+    )
+
+    changelog = ChangeLog(saved.repo.name, options, snapshot=saved)
     changelog.run()
+    check_unchanged(changelog, exit_code=exit_code)
+
+
+@app.command()
+def unreleased(
+    repo: Optional[str] = REPO_OPTION,
+    user: Optional[str] = USER_OPTION,
+    next_release: Optional[str] = NEXT_RELEASE_OPTION,
+    depends: Optional[bool] = DEPENDS_OPTION,
+    issues: Optional[bool] = ISSUES_OPTION,
+    item_order: Optional[str] = ITEM_ORDER_OPTION,
+    ignore: Optional[list[int]] = IGNORE_OPTION,
+    max_depends: Optional[int] = MAX_DEPENDS_OPTION,
+    cache: Optional[bool] = CACHE_OPTION,
+    output: Optional[str] = UNRELEASED_OUTPUT_OPTION,
+) -> None:
+    """Show only the Unreleased changes, quickly, eg for a PR comment.
+
+    Only the latest release and what changed since are fetched. Without
+    [bold]--output[/bold] just the markdown is printed, with no progress.
+    """
+    repo = find_repo(repo)
+    settings = get_settings()
+    options = get_options(
+        settings,
+        user=user,
+        next_release=next_release,
+        depends=depends,
+        quiet=True if output is None else None,
+        issues=issues,
+        item_order=item_order,
+        ignore=ignore,
+        max_depends=max_depends,
+    )
+
+    with github_connections(settings, cache):
+        changelog = ChangeLog(repo, options)
+        text = changelog.run_unreleased()
+
+    if output is None:
+        typer.echo(text, nl=False)
+        return
+    write_atomic(Path(output), text)
+    if not options["quiet"]:
+        rprint(
+            f"  [green]->[/green] Unreleased changes written to "
+            f"[bold]{output}[/bold]\n"
+        )
+
+
+@app.command()
+def batch(
+    manifest: str = MANIFEST_ARGUMENT,
+    jobs: Optional[int] = JOBS_OPTION,
+    contrib: Optional[bool] = CONTRIB_OPTION,
+    quiet: Optional[bool] = QUIET_OPTION,
+    cache: Optional[bool] = CACHE_OPTION,
+    quick_check: Optional[bool] = QUICK_CHECK_OPTION,
+) -> None:
+    """Generate the Changelogs for every repository in a manifest file.
+
+    The repositories are worked on together in one process, sharing the
+    connections to GitHub and the caches. Each can change any of the settings
+    just for itself in the manifest.
+    """
+    settings = get_settings()
+    batch_manifest = Manifest.load(Path(manifest))
+
+    batch_jobs = []
+    for repo in batch_manifest.repos:
+        job_settings = repo_settings(settings, repo.settings)
+        batch_jobs.append(
+            BatchJob(
+                repo,
+                job_settings,
+                get_options(
+                    job_settings,
+                    user=repo.owner,
+                    contrib=contrib,
+                    quick_check=quick_check,
+                ),
+            )
+        )
+
+    quiet = settings.quiet if quiet is None else quiet
+    with github_connections(settings, cache):
+        runner = BatchRunner(settings, jobs or batch_manifest.jobs)
+        results = runner.run(batch_jobs, quiet=quiet)
+
+    failed = [result.full_name for result in results if result.failed]
+    if not quiet:
+        rprint(
+            f"\n  [green]->[/green] Built {len(results) - len(failed)} of "
+            f"{len(results)} Changelogs\n"
+        )
+    if failed:
+        rprint(
+            f"[red]  X  These repositories failed: {', '.join(failed)}\n",
+            file=sys.stderr,
+        )
+        raise typer.Exit(ExitErrors.BATCH_FAILED)
+
+
+@app.command()
+def serve(
+    repo: Optional[str] = REPO_OPTION,
+    user: Optional[str] = USER_OPTION,
+    next_release: Optional[str] = NEXT_RELEASE_OPTION,
+    unreleased: Optional[bool] = UNRELEASED_OPTION,
+    depends: Optional[bool] = DEPENDS_OPTION,
+    output: Optional[str] = OUTPUT_OPTION,
+    quiet: Optional[bool] = QUIET_OPTION,
+    skip: Optional[list[str]] = SKIP_OPTION,
+    issues: Optional[bool] = ISSUES_OPTION,
+    item_order: Optional[str] = ITEM_ORDER_OPTION,
+    ignore: Optional[list[int]] = IGNORE_OPTION,
+    max_depends: Optional[int] = MAX_DEPENDS_OPTION,
+    show_diff: Optional[bool] = SHOW_DIFF_OPTION,
+    show_patch: Optional[bool] = SHOW_PATCH_OPTION,
+    cache: Optional[bool] = CACHE_OPTION,
+    max_releases: Optional[int] = MAX_RELEASES_OPTION,
+    host: str = HOST_OPTION,
+    port: int = PORT_OPTION,
+) -> None:
+    """Keep the Changelog up to date from GitHub webhooks, until stopped.
+
+    Everything is fetched once, then each [bold]pull_request[/bold],
+    [bold]issues[/bold] or [bold]release[/bold] event updates the Changelog
+    without fetching anything again.
+    """
+    repo = find_repo(repo)
+    settings = get_settings()
+    options = get_options(
+        settings,
+        user=user,
+        next_release=next_release,
+        unreleased=unreleased,
+        depends=depends,
+        output=output,
+        quiet=quiet,
+        skip=skip,
+        issues=issues,
+        item_order=item_order,
+        ignore=ignore,
+        max_depends=max_depends,
+        show_diff=show_diff,
+        show_patch=show_patch,
+        max_releases=max_releases,
+    )
+
+    with github_connections(settings, cache), contextlib.ExitStack() as stack:
+        changelog = ChangeLog(repo, options)
+        changelog.load(stack)
+        serve_forever(
+            LiveChangelog(changelog, settings.webhook_secret), host, port
+        )
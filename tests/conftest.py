@@ -6,7 +6,29 @@ from collections.abc import Generator
 import pytest
 
 from github_changelog_md.config.settings import Settings
-from github_changelog_md.constants import CONFIG_FILE
+from github_changelog_md.constants import CONFIG_FILE, ChangelogOptions
+
+
+def default_options() -> ChangelogOptions:
+    """Return the options used when nothing is given on the command line."""
+    return {
+        "user_name": None,
+        "next_release": None,
+        "show_unreleased": True,
+        "show_depends": True,
+        "output_file": "CHANGELOG.md",
+        "contributors": False,
+        "quiet": False,
+        "skip_releases": None,
+        "show_issues": True,
+        "item_order": "newest-first",
+        "ignore_items": None,
+        "max_depends": 10,
+        "show_diff": True,
+        "show_patch": True,
+        "quick_check": False,
+        "max_releases": None,
+    }
 
 
 @pytest.fixture(autouse=True)
@@ -0,0 +1,210 @@
+"""Test building the changelogs of several repositories at once."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+import typer
+
+from github_changelog_md.changelog.batch import (
+    BatchJob,
+    BatchRepo,
+    BatchRunner,
+    Manifest,
+    repo_settings,
+)
+from github_changelog_md.config import get_settings
+from github_changelog_md.constants import ExitErrors
+from tests.conftest import default_options
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+    from github_changelog_md.constants import ChangelogOptions
+
+OPTIONS: ChangelogOptions = {
+    **default_options(),
+    "user_name": "owner",
+    "quiet": True,
+}
+
+
+def _job(name: str, settings: MagicMock, root: Path) -> BatchJob:
+    """Return a job for the repository 'owner/<name>', in a folder of 'root'."""
+    return BatchJob(BatchRepo("owner", name, root / name), settings, OPTIONS)
+
+
+class TestManifest:
+    """Test loading the manifest file."""
+
+    def test_load(self, tmp_path: Path) -> None:
+        """Test each repository gets its folder and settings."""
+        path = tmp_path / "batch.toml"
+        path.write_text(
+            "jobs = 2\n\n"
+            '[[repos]]\nrepo = "owner/one"\n\n'
+            '[[repos]]\nrepo = "other/two"\nfolder = "code/two"\n'
+            "[repos.settings]\nshow_issues = false\n"
+        )
+
+        manifest = Manifest.load(path)
+
+        assert manifest.jobs == 2  # noqa: PLR2004
+        assert manifest.repos == [
+            BatchRepo("owner", "one", tmp_path / "one"),
+            BatchRepo(
+                "other", "two", tmp_path / "code/two", {"show_issues": False}
+            ),
+        ]
+        assert manifest.repos[1].full_name == "other/two"
+
+    @pytest.mark.parametrize(
+        "contents",
+        [
+            None,
+            "jobs = 4\n",
+            'jobs = 0\n[[repos]]\nrepo = "owner/one"\n',
+            '[[repos]]\nrepo = "one"\n',
+            '[[repos]]\nrepo = "owner/one"\nsettings = 1\n',
+            '[[repos]]\nrepo = "owner/one"\n[repos.settings]\nbad = 1\n',
+            (
+                '[[repos]]\nrepo = "owner/one"\n'
+                "[repos.settings]\nignored_users = []\n"
+            ),
+        ],
+    )
+    def test_bad_manifest(
+        self,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+        contents: str | None,
+    ) -> None:
+        """Test a missing or invalid manifest exits with BAD_MANIFEST."""
+        path = tmp_path / "batch.toml"
+        if contents is not None:
+            path.write_text(contents)
+
+        with pytest.raises(typer.Exit) as exc_info:
+            Manifest.load(path)
+
+        assert exc_info.value.exit_code == ExitErrors.BAD_MANIFEST
+        assert "Error in the manifest" in capsys.readouterr().err
+
+    @pytest.mark.usefixtures("config_file")
+    def test_repo_settings(self) -> None:
+        """Test a repository's settings are changed on a copy only."""
+        settings = get_settings()
+
+        changed = repo_settings(settings, {"show_issues": False})
+
+        assert changed.show_issues is False
+        assert settings.show_issues is True
+        assert changed.github_pat == settings.github_pat
+        assert repo_settings(settings, {}) is settings
+
+
+class TestBatchRunner:
+    """Test the BatchRunner class."""
+
+    def test_run(
+        self,
+        mocker: MockerFixture,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test each repository is built with the shared client."""
+        github = mocker.patch("github_changelog_md.changelog.batch.Github")
+        changelog_class = mocker.patch(
+            "github_changelog_md.changelog.batch.ChangeLog"
+        )
+        failing = MagicMock()
+        failing.run.side_effect = typer.Exit(ExitErrors.GIT_ERROR)
+        changelog_class.side_effect = [
+            MagicMock(changelog_changed=True),
+            failing,
+        ]
+        settings = MagicMock(github_pat="1234", profile_cache_days=0)
+
+        runner = BatchRunner(settings, jobs=1)
+        results = runner.run(
+            [_job("one", settings, tmp_path), _job("two", settings, tmp_path)],
+            quiet=False,
+        )
+
+        assert [result.full_name for result in results] == [
+            "owner/one",
+            "owner/two",
+        ]
+        assert results[0].changed
+        assert not results[0].failed
+        assert results[1].exit_code == ExitErrors.GIT_ERROR
+        github.assert_called_once()
+        changelog_class.assert_any_call(
+            "one",
+            {**OPTIONS, "quiet": False},
+            settings=settings,
+            client=github.return_value,
+            folder=tmp_path / "one",
+            profile_cache=None,
+        )
+        output = capsys.readouterr().out
+        assert "owner/one updated" in output
+        assert "owner/two failed (error 1)" in output
+
+    def test_separate_clients_for_each_pat(
+        self, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        """Test a repository with its own PAT gets its own client."""
+        github = mocker.patch("github_changelog_md.changelog.batch.Github")
+        mocker.patch("github_changelog_md.changelog.batch.ChangeLog")
+        settings = MagicMock(
+            github_pat="1234", profile_cache_days=1, cache_dir=str(tmp_path)
+        )
+        other_settings = MagicMock(github_pat="5678")
+
+        runner = BatchRunner(settings, jobs=2)
+        runner.run(
+            [
+                _job("one", settings, tmp_path),
+                _job("two", other_settings, tmp_path),
+                _job("three", settings, tmp_path),
+            ],
+            quiet=True,
+        )
+
+        assert github.call_count == 2  # noqa: PLR2004
+        assert runner.profile_cache is not None
+
+    def test_unexpected_error_only_fails_that_repository(
+        self,
+        mocker: MockerFixture,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test any error is reported, and the other repositories still run."""
+        mocker.patch("github_changelog_md.changelog.batch.Github")
+        changelog_class = mocker.patch(
+            "github_changelog_md.changelog.batch.ChangeLog"
+        )
+        failing = MagicMock()
+        failing.run.side_effect = FileNotFoundError("no such file")
+        changelog_class.side_effect = [failing, MagicMock()]
+        settings = MagicMock(github_pat="1234", profile_cache_days=0)
+        jobs = [
+            _job("one", settings, tmp_path / "new"),
+            _job("two", settings, tmp_path / "new"),
+        ]
+
+        results = BatchRunner(settings, jobs=1).run(jobs, quiet=True)
+
+        assert results[0].exit_code == ExitErrors.BATCH_FAILED
+        assert not results[1].failed
+        assert (tmp_path / "new" / "two").is_dir()
+        assert (
+            "Error while building owner/one : no such file"
+            in capsys.readouterr().err
+        )
@@ -0,0 +1,72 @@
+"""Test the request budget shared between processes."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from github_changelog_md.changelog.bucket import (
+    STALE_LOCK_SECONDS,
+    SharedBucket,
+    file_lock,
+    token_key,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestSharedBucket:
+    """Test the SharedBucket class and file lock."""
+
+    def test_tokens_are_shared(self, tmp_path: Path) -> None:
+        """Test buckets on the same file draw from the same tokens."""
+        path = tmp_path / "limits" / "bucket.json"
+        # a minute's worth, so 6 tokens, refilling at one every 10 seconds.
+        buckets = [SharedBucket(path, per_hour=360) for _ in range(3)]
+        waits: list[float] = []
+
+        def take_two(bucket: SharedBucket) -> None:
+            waits.extend(bucket.take() for _ in range(2))
+
+        threads = [
+            threading.Thread(target=take_two, args=(bucket,))
+            for bucket in buckets
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert waits == [0.0] * 6
+        assert 9 < buckets[0].take() <= 10  # noqa: PLR2004
+        assert 19 < buckets[1].take() <= 20  # noqa: PLR2004
+
+    def test_bad_file_is_a_full_bucket(self, tmp_path: Path) -> None:
+        """Test a missing or corrupt file starts with a full bucket."""
+        path = tmp_path / "bucket.json"
+        path.write_text("not json")
+        bucket = SharedBucket(path, per_hour=60)
+
+        assert bucket.capacity == 1
+        assert bucket.take() == 0
+        assert bucket.take() > 0
+
+    def test_stale_lock_is_removed(self, tmp_path: Path) -> None:
+        """Test a lock left by a killed process doesn't block forever."""
+        lock_path = tmp_path / "bucket.json.lock"
+        lock_path.touch()
+        old = time.time() - STALE_LOCK_SECONDS - 1
+        os.utime(lock_path, (old, old))
+
+        with file_lock(lock_path):
+            assert lock_path.exists()
+        assert not lock_path.exists()
+
+    def test_token_key(self) -> None:
+        """Test the key is stable and doesn't contain the PAT."""
+        assert token_key("ghp_secret") == token_key("ghp_secret")
+        assert token_key("ghp_secret") != token_key("ghp_other")
+        assert "secret" not in token_key("ghp_secret")
@@ -1,6 +1,11 @@
 """Test the ChangeLog class."""
 
+import contextlib
 import datetime
+import io
+import threading
+from collections.abc import Callable
+from dataclasses import replace
 from pathlib import Path
 from typing import Any, cast
 from unittest.mock import MagicMock
@@ -10,29 +15,48 @@ import typer
 from github import GithubException
 
 from github_changelog_md.changelog.changelog import ChangeLog, git_error
+from github_changelog_md.changelog.checkpoint import (
+    Checkpoint,
+    RecordCheckpoint,
+)
+from github_changelog_md.changelog.connection import SharedConnection
+from github_changelog_md.changelog.ratelimit import Budget, RateLimitScheduler
+from github_changelog_md.changelog.records import (
+    IssueRecord,
+    PRRecord,
+    ReleaseRecord,
+    RepoRecord,
+    UserRecord,
+)
+from github_changelog_md.changelog.snapshot import Snapshot
 from github_changelog_md.constants import ChangelogOptions, ExitErrors
+from tests.conftest import default_options
 
 
 def _default_options() -> ChangelogOptions:
-    return {
-        "user_name": "user",
-        "next_release": None,
-        "show_unreleased": True,
-        "show_depends": True,
-        "output_file": "CHANGELOG.md",
-        "contributors": False,
-        "quiet": False,
-        "skip_releases": None,
-        "show_issues": True,
-        "item_order": "newest-first",
-        "ignore_items": None,
-        "max_depends": 10,
-        "show_diff": True,
-        "show_patch": True,
-    }
-
-
-def _build_changelog(mocker, settings_overrides=None) -> ChangeLog:
+    return {**default_options(), "user_name": "user"}
+
+
+def _jan(day: int) -> datetime.datetime:
+    """Return a date in January 2024."""
+    return datetime.datetime(2024, 1, day, tzinfo=datetime.timezone.utc)
+
+
+def _release(number: int, day: int) -> ReleaseRecord:
+    """Return release 'v<number>', created on the given day of January 2024."""
+    return ReleaseRecord(
+        id=number,
+        tag_name=f"v{number}",
+        title="",
+        body="",
+        html_url=f"https://github.com/owner/repo/releases/tag/v{number}",
+        created_at=_jan(day),
+    )
+
+
+def _build_changelog(
+    mocker, settings_overrides=None, snapshot=None
+) -> ChangeLog:
     settings = MagicMock()
     settings.github_pat = "1234"
     settings.yanked = None
@@ -48,6 +72,15 @@ def _build_changelog(mocker, settings_overrides=None) -> ChangeLog:
     settings.ignored_labels = None
     settings.extend_ignored = None
     settings.allowed_labels = None
+    settings.backend = "rest"
+    settings.release_source = "github"
+    settings.contributors_source = "github"
+    settings.profile_cache_days = 0
+    settings.local_store = False
+    settings.fetch_workers = 1
+    settings.checkpoints = False
+    settings.fragment_cache = False
+    settings.cache_dir = None
     if settings_overrides:
         for key, value in settings_overrides.items():
             setattr(settings, key, value)
@@ -61,7 +94,7 @@ def _build_changelog(mocker, settings_overrides=None) -> ChangeLog:
         return_value=MagicMock(),
     )
 
-    return ChangeLog("repo", _default_options())
+    return ChangeLog("repo", _default_options(), snapshot)
 
 
 @pytest.fixture
@@ -242,6 +275,8 @@ class TestChangelog:
                     "max_depends": 10,
                     "show_diff": True,
                     "show_patch": True,
+                    "quick_check": False,
+                    "max_releases": None,
                 },
             )
 
@@ -249,12 +284,37 @@ class TestChangelog:
         assert exc.value.args[0] == ExitErrors.NO_PAT
         assert "No GitHub PAT found in settings file" in output.err
 
+    def test_shared_client_settings_and_folder(self, mocker) -> None:
+        """Test a batch can pass in the settings, client and folder to use."""
+        get_settings = mocker.patch(
+            "github_changelog_md.changelog.changelog.get_settings"
+        )
+        settings = MagicMock(yanked=None, release_text_before=None)
+        settings.release_text = settings.release_overrides = None
+        client = MagicMock()
+
+        changelog = ChangeLog(
+            "repo",
+            {**_default_options(), "contributors": True},
+            settings=settings,
+            client=client,
+            folder=Path("repos/repo"),
+        )
+
+        get_settings.assert_not_called()
+        assert changelog.settings is settings
+        assert changelog.git is client
+        assert changelog.output_paths() == [
+            Path("repos/repo/CHANGELOG.md"),
+            Path("repos/repo/CONTRIBUTORS.md"),
+        ]
+
+    @pytest.mark.usefixtures("config_file")
     def test_run(
         self,
         mock_repo_data,
         mock_repo,
         mocker,
-        config_file,  # noqa: ARG002
     ) -> None:
         """Test the overall run method."""
         mock_header = mocker.patch(
@@ -268,12 +328,10 @@ class TestChangelog:
             return_value=MagicMock(auth=mock_auth),
         )
 
-        mock_path = mocker.patch(
+        mocker.patch(
             "github_changelog_md.changelog.changelog.Path",
         )
-        mock_path.return_value.open.return_value.__enter__.return_value = (
-            MagicMock()
-        )
+        mocker.patch("github_changelog_md.changelog.changelog.write_atomic")
         changelog = ChangeLog(
             "repo",
             {
@@ -291,6 +349,8 @@ class TestChangelog:
                 "max_depends": 10,
                 "show_diff": True,
                 "show_patch": True,
+                "quick_check": False,
+                "max_releases": None,
             },
         )
         changelog.get_repo_data = MagicMock(return_value=mock_repo_data)
@@ -308,6 +368,7 @@ class TestChangelog:
         )
         changelog.link_pull_requests = MagicMock(return_value={})
         changelog.link_issues = MagicMock(return_value={})
+        changelog.get_issue_closers = MagicMock(return_value={})
         changelog.generate_changelog = MagicMock()
         changelog.run()
 
@@ -319,6 +380,7 @@ class TestChangelog:
         changelog.filter_issues.assert_called_once()
         changelog.link_pull_requests.assert_called_once()
         changelog.link_issues.assert_called_once()
+        changelog.get_issue_closers.assert_called_once()
         changelog.generate_changelog.assert_called_once()
 
     def test_build_release_cache_maps_are_created(self, mocker) -> None:
@@ -450,16 +512,14 @@ class TestChangelog:
             "github_changelog_md.changelog.changelog.Path",
         )
         mock_path.cwd.return_value = Path("test_cwd")
-        file_handle = MagicMock()
-        mock_path.return_value.open.return_value.__enter__.return_value = (
-            file_handle
+        write_atomic = mocker.patch(
+            "github_changelog_md.changelog.changelog.write_atomic"
         )
 
         changelog.update_contributors()
 
-        rendered = "".join(
-            call.args[0] for call in file_handle.write.call_args_list
-        )
+        path, rendered = write_atomic.call_args.args
+        assert path == Path("test_cwd") / "CONTRIBUTORS.md"
         assert "- McDonald ([@mcd](https://github.com/mcd))" in rendered
 
     def test_process_unreleased_writes_unreleased_heading(self, mocker) -> None:
@@ -545,11 +605,7 @@ class TestChangelog:
             ("Dependency Updates", "dependencies"),
         ]
         changelog.ignored_labels = []
-
-        dep_label_1 = MagicMock()
-        dep_label_1.name = "dependencies"
-        dep_label_2 = MagicMock()
-        dep_label_2.name = "dependencies"
+        changelog.plan = changelog.compile_plan()
 
         pr_old = MagicMock()
         pr_old.number = 1
@@ -558,7 +614,7 @@ class TestChangelog:
         pr_old.user = MagicMock(
             login="bot1", html_url="https://github.com/bot1"
         )
-        pr_old.labels = [dep_label_1]
+        pr_old.labels = frozenset({"dependencies"})
 
         pr_new = MagicMock()
         pr_new.number = 2
@@ -567,7 +623,7 @@ class TestChangelog:
         pr_new.user = MagicMock(
             login="bot2", html_url="https://github.com/bot2"
         )
-        pr_new.labels = [dep_label_2]
+        pr_new.labels = frozenset({"dependencies"})
 
         changelog.get_release_sections = MagicMock(
             return_value={"Dependency Updates": [pr_old, pr_new]}
@@ -650,6 +706,8 @@ class TestChangelog:
         changelog = _build_changelog(mocker)
         changelog.options["show_issues"] = True
         changelog.ignored_labels = []
+        changelog.sections = []
+        changelog.plan = changelog.compile_plan()
 
         issue = MagicMock()
         issue.number = 42
@@ -685,16 +743,14 @@ class TestChangelog:
             "github_changelog_md.changelog.changelog.Path",
         )
         mock_path.cwd.return_value = Path("test_cwd")
-        file_handle = MagicMock()
-        mock_path.return_value.open.return_value.__enter__.return_value = (
-            file_handle
+        write_atomic = mocker.patch(
+            "github_changelog_md.changelog.changelog.write_atomic"
         )
 
         changelog.generate_changelog()
 
-        rendered = "".join(
-            call.args[0] for call in file_handle.write.call_args_list
-        )
+        path, rendered = write_atomic.call_args.args
+        assert path == Path("test_cwd") / "CHANGELOG.md"
         assert rendered.startswith("# Changelog\n\n")
         assert "Intro line\n\n" in rendered
         assert "This changelog was generated using" in rendered
@@ -780,10 +836,59 @@ class TestChangelog:
 
         assert [u.login for u in contributors] == ["a-user", "b-user"]
 
+    def test_get_contributors_resolves_missing_names(
+        self, mocker, tmp_path
+    ) -> None:
+        """Test missing names are looked up in a batch, then cached."""
+        changelog = _build_changelog(
+            mocker, {"cache_dir": str(tmp_path), "profile_cache_days": 7}
+        )
+        named = UserRecord("z-user", "https://github.com/z-user", "Ann Z")
+        unnamed = UserRecord("b-user", "https://github.com/b-user")
+        bot = UserRecord("dependabot[bot]", "https://github.com/apps/d")
+        changelog.git = MagicMock()
+        query = changelog.git.requester.graphql_query
+        query.return_value = ({}, {"data": {"u0": {"name": "Bob"}}})
+        changelog.repo_prs = cast(
+            "Any",
+            [
+                MagicMock(user=named),
+                MagicMock(user=unnamed),
+                MagicMock(user=bot),
+            ],
+        )
+
+        contributors = changelog.get_contributors()
+
+        assert [u.name for u in contributors] == ["Ann Z", "Bob", None]
+        query.assert_called_once()
+        assert query.call_args.args[1] == {"l0": "b-user"}
+        changelog.git.get_user.assert_not_called()
+
+        # the name is saved, so the next run doesn't ask for it again.
+        assert [u.name for u in changelog.get_contributors()][1] == "Bob"
+        query.assert_called_once()
+        assert (tmp_path / "profiles.json").exists()
+
+        git_error_mock = mocker.patch(
+            "github_changelog_md.changelog.changelog.git_error",
+            side_effect=typer.Exit(ExitErrors.GIT_ERROR),
+        )
+        changelog.settings.profile_cache_days = 0
+        query.side_effect = GithubException(
+            status=502, data={"message": "gone"}
+        )
+        with pytest.raises(typer.Exit):
+            changelog.get_contributors()
+        assert git_error_mock.called
+
     def test_ignore_items_and_get_sorted_items(self, mocker) -> None:
         """Test ignore_items filtering and get_sorted_items ordering."""
         changelog = _build_changelog(mocker)
         changelog.options["ignore_items"] = [2]
+        changelog.sections = []
+        changelog.ignored_labels = []
+        changelog.plan = changelog.compile_plan()
         items = [
             MagicMock(number=1, title="One"),
             MagicMock(number=2, title="Two"),
@@ -804,17 +909,10 @@ class TestChangelog:
         changelog = _build_changelog(mocker)
         changelog.sections = [("Bug Fixes", "bug")]
         changelog.ignored_labels = ["wontfix"]
+        changelog.plan = changelog.compile_plan()
 
-        bug = MagicMock()
-        bug_label = MagicMock()
-        bug_label.name = "bug"
-        bug.labels = [bug_label]
-        ignored = MagicMock()
-        ignored_label_1 = MagicMock()
-        ignored_label_1.name = "bug"
-        ignored_label_2 = MagicMock()
-        ignored_label_2.name = "wontfix"
-        ignored.labels = [ignored_label_1, ignored_label_2]
+        bug = MagicMock(labels=frozenset({"bug"}))
+        ignored = MagicMock(labels=frozenset({"bug", "wontfix"}))
 
         grouped = changelog.get_release_sections([bug, ignored])
 
@@ -941,6 +1039,7 @@ class TestChangelog:
         changelog.filter_issues = MagicMock(return_value=[])
         changelog.link_pull_requests = MagicMock(return_value={})
         changelog.link_issues = MagicMock(return_value={})
+        changelog.get_issue_closers = MagicMock(return_value={})
         changelog.generate_changelog = MagicMock()
         changelog.get_contributors = MagicMock(return_value=[])
         changelog.update_contributors = MagicMock()
@@ -957,6 +1056,62 @@ class TestChangelog:
         changelog.get_contributors.assert_called_once()
         changelog.update_contributors.assert_called_once()
 
+    def test_run_quick_check_skips_when_nothing_changed(
+        self, mocker, tmp_path, monkeypatch, capsys
+    ) -> None:
+        """Test the quick check fetches only when something has changed."""
+        monkeypatch.chdir(tmp_path)
+        changelog = _build_changelog(mocker, {"cache_dir": str(tmp_path)})
+        changelog.options["quick_check"] = True
+        mocker.patch("github_changelog_md.changelog.changelog.header")
+        probe = mocker.patch(
+            "github_changelog_md.changelog.changelog.probe_remote",
+            return_value={"release": None, "updated": None},
+        )
+        changelog.get_repo_data = MagicMock(
+            return_value=MagicMock(full_name="owner/repo")
+        )
+        changelog.fetch_lists = MagicMock()
+        changelog.filter_issues = MagicMock(return_value=[])
+        changelog.link_pull_requests = MagicMock(return_value={})
+        changelog.link_issues = MagicMock(return_value={})
+        changelog.get_issue_closers = MagicMock(return_value={})
+        changelog.generate_changelog = MagicMock()
+
+        changelog.run()
+        assert changelog.fetch_lists.call_count == 1
+        assert changelog.fingerprint_path.exists()
+
+        changelog.run()
+        assert changelog.fetch_lists.call_count == 1
+        assert "Nothing has changed" in capsys.readouterr().out
+
+        # an edited changelog is generated again, as is a change on GitHub.
+        (tmp_path / "CHANGELOG.md").write_text("edited")
+        changelog.run()
+        assert changelog.fetch_lists.call_count == 2  # noqa: PLR2004
+
+        probe.return_value = {"release": None, "updated": {"number": 1}}
+        changelog.run()
+        assert changelog.fetch_lists.call_count == 3  # noqa: PLR2004
+
+    def test_get_fingerprint_git_error(self, mocker) -> None:
+        """Test a failed probe is reported as a git error."""
+        changelog = _build_changelog(mocker)
+        changelog.repo_data = MagicMock()
+        mocker.patch(
+            "github_changelog_md.changelog.changelog.probe_remote",
+            side_effect=GithubException(status=500, data={"message": "boom"}),
+        )
+        git_error_mock = mocker.patch(
+            "github_changelog_md.changelog.changelog.git_error",
+            side_effect=typer.Exit(ExitErrors.GIT_ERROR),
+        )
+
+        with pytest.raises(typer.Exit):
+            changelog.get_fingerprint()
+        assert git_error_mock.called
+
     def test_update_contributors_ignores_known_bots(self, mocker) -> None:
         """Test update_contributors skips IGNORED_CONTRIBUTORS logins."""
         changelog = _build_changelog(mocker)
@@ -975,17 +1130,17 @@ class TestChangelog:
 
         mock_path = mocker.patch("github_changelog_md.changelog.changelog.Path")
         mock_path.cwd.return_value = Path("test_cwd")
-        file_handle = MagicMock()
-        mock_path.return_value.open.return_value.__enter__.return_value = (
-            file_handle
+        write_atomic = mocker.patch(
+            "github_changelog_md.changelog.changelog.write_atomic"
         )
 
+        write_atomic.return_value = False
+
         changelog.update_contributors()
-        rendered = "".join(
-            call.args[0] for call in file_handle.write.call_args_list
-        )
+        _, rendered = write_atomic.call_args.args
         assert "dependabot[bot]" not in rendered
         assert "dev-user" in rendered
+        assert changelog.contributors_changed is False
 
     def test_generate_changelog_with_skip_and_no_depends(self, mocker) -> None:
         """Test generate_changelog skip message and depends warning block."""
@@ -1000,20 +1155,32 @@ class TestChangelog:
 
         mock_path = mocker.patch("github_changelog_md.changelog.changelog.Path")
         mock_path.cwd.return_value = Path("test_cwd")
-        file_handle = MagicMock()
-        mock_path.return_value.open.return_value.__enter__.return_value = (
-            file_handle
+        write_atomic = mocker.patch(
+            "github_changelog_md.changelog.changelog.write_atomic"
         )
 
         changelog.generate_changelog()
-        rendered = "".join(
-            call.args[0] for call in file_handle.write.call_args_list
-        )
+        _, rendered = write_atomic.call_args.args
         assert "Dependency updates are excluded" in rendered
         changelog.process_unreleased.assert_called_once()
         changelog.process_release.assert_called_once()
         assert changelog.prev_release == changelog.repo_releases[0]
 
+    def test_generate_changelog_reports_unchanged(self, mocker, capsys) -> None:
+        """Test an unchanged changelog is reported, not 'generated'."""
+        changelog = _build_changelog(mocker)
+        changelog.repo_releases = []
+        changelog.options["show_unreleased"] = False
+        mocker.patch(
+            "github_changelog_md.changelog.changelog.write_atomic",
+            return_value=False,
+        )
+
+        changelog.generate_changelog()
+
+        assert changelog.changelog_changed is False
+        assert "Changelog unchanged" in capsys.readouterr().out
+
     def test_process_release_skip_prev_release_and_title(
         self,
         mocker,
@@ -1065,10 +1232,6 @@ class TestChangelog:
             def __init__(self) -> None:
                 self.tag_name = "v1.0.0"
 
-        mocker.patch(
-            "github_changelog_md.changelog.changelog.GitRelease",
-            FakeRelease,
-        )
         out = MagicMock()
         changelog.show_release_text(out, cast("Any", FakeRelease()))
         rendered = "".join(call.args[0] for call in out.write.call_args_list)
@@ -1079,13 +1242,13 @@ class TestChangelog:
         changelog = _build_changelog(mocker)
         changelog.options["show_issues"] = True
         changelog.ignored_labels = ["wontfix"]
+        changelog.sections = []
+        changelog.plan = changelog.compile_plan()
         issue = MagicMock()
         issue.number = 7
         issue.title = "Ignored issue"
         issue.html_url = "https://github.com/user/repo/issues/7"
-        label = MagicMock()
-        label.name = "wontfix"
-        issue.labels = [label]
+        issue.labels = frozenset({"wontfix"})
         issue.closed_by = MagicMock(
             login="dev",
             html_url="https://github.com/dev",
@@ -1106,10 +1269,6 @@ class TestChangelog:
             def __init__(self, tag_name: str) -> None:
                 self.tag_name = tag_name
 
-        mocker.patch(
-            "github_changelog_md.changelog.changelog.GitRelease",
-            FakeRelease,
-        )
         out = MagicMock()
         changelog.generate_diff_url(
             out,
@@ -1127,9 +1286,10 @@ class TestChangelog:
         changelog.options["show_depends"] = False
         changelog.sections = [("Dependency Updates", "dependencies")]
         changelog.ignored_labels = []
+        changelog.plan = changelog.compile_plan()
 
         dep_pr = MagicMock()
-        dep_pr.labels = [MagicMock(name="dependencies")]
+        dep_pr.labels = frozenset({"dependencies"})
         dep_pr.number = 1
         dep_pr.title = "dep"
         dep_pr.html_url = "https://github.com/user/repo/pull/1"
@@ -1180,16 +1340,26 @@ class TestChangelog:
         changelog = _build_changelog(mocker)
         changelog.repo_data = MagicMock()
 
+        issue_items = [
+            MagicMock(number=1, pull_request=None),
+            MagicMock(number=2, pull_request=None),
+        ]
+        pr_items = [MagicMock(number=3)]
         issues = MagicMock(totalCount=2)
-        pulls = MagicMock(totalCount=3)
+        issues.__iter__.return_value = iter(issue_items)
+        pulls = MagicMock(totalCount=1)
+        pulls.__iter__.return_value = iter(pr_items)
         releases = MagicMock(totalCount=1)
         releases.__iter__.return_value = iter([MagicMock(tag_name="v1.0.0")])
         changelog.repo_data.get_issues.return_value = issues
         changelog.repo_data.get_pulls.return_value = pulls
         changelog.repo_data.get_releases.return_value = releases
 
-        assert changelog.get_closed_issues() == issues
-        assert changelog.get_closed_prs() == pulls
+        assert [issue.number for issue in changelog.get_closed_issues()] == [
+            1,
+            2,
+        ]
+        assert [pr.number for pr in changelog.get_closed_prs()] == [3]
         assert len(changelog.get_repo_releases()) == 1
 
         git_error_mock = mocker.patch(
@@ -1242,3 +1412,882 @@ class TestChangelog:
         with pytest.raises(typer.Exit):
             changelog.get_repo_data()
         assert git_error_mock.called
+
+    def test_releases_come_from_local_tags_when_selected(self, mocker) -> None:
+        """Test the local tags replace the GitHub releases and commit walk."""
+        changelog = _build_changelog(mocker, {"release_source": "tags"})
+        changelog.repo_name = "repo"
+        changelog.git = MagicMock()
+        repo_obj = MagicMock(html_url="https://github.com/owner/repo")
+        changelog.git.get_user.return_value.get_repo.return_value = repo_obj
+        local_git_class = mocker.patch(
+            "github_changelog_md.changelog.changelog.LocalGit"
+        )
+        local_git = local_git_class.return_value
+        tags = [_release(2, 10), _release(1, 1)]
+        local_git.get_releases.return_value = tags
+        local_git.first_commit_date.return_value = _jan(1)
+        mocker.patch(
+            "github_changelog_md.changelog.changelog.probe_remote",
+            return_value={"release": None, "updated": None},
+        )
+
+        changelog.repo_data = changelog.get_repo_data()
+        local_git_class.assert_called_once_with(repo_obj.html_url, None)
+        local_git.check_clone.assert_called_once_with(repo_obj.name)
+
+        assert changelog.get_repo_releases() == tags
+        assert changelog.get_recent_releases(0) == tags[:1]
+        changelog.repo_releases = []
+        assert changelog.get_latest_release_date() == _jan(1)
+        tagged = changelog.get_fingerprint()
+        local_git.get_releases.return_value = tags[1:]
+        assert changelog.get_fingerprint().remote != tagged.remote
+        repo_obj.get_releases.assert_not_called()
+        repo_obj.get_commits.assert_not_called()
+
+    def test_get_contributors_from_git_history(self, mocker) -> None:
+        """Test contributors come from the local history when selected."""
+        changelog = _build_changelog(mocker, {"contributors_source": "git"})
+        changelog.repo_data = RepoRecord(
+            "o/repo", "repo", "https://github.com/o/repo"
+        )
+        changelog.repo_prs = [MagicMock()]
+        changelog.resolve_names = MagicMock()
+        local_git_class = mocker.patch(
+            "github_changelog_md.changelog.changelog.LocalGit"
+        )
+        authors = [
+            UserRecord(login="", html_url="", name="Zed"),
+            UserRecord(login="amy", html_url="https://github.com/amy"),
+        ]
+        local_git_class.return_value.get_contributors.return_value = authors
+        write_atomic = mocker.patch(
+            "github_changelog_md.changelog.changelog.write_atomic"
+        )
+
+        changelog.contributors = changelog.get_contributors()
+        changelog.update_contributors()
+
+        local_git_class.assert_called_once_with(
+            "https://github.com/o/repo", None
+        )
+        local_git_class.return_value.check_clone.assert_called_once_with("repo")
+        changelog.resolve_names.assert_not_called()
+        _, rendered = write_atomic.call_args.args
+        assert rendered.endswith(
+            "- Zed\n- amy ([@amy](https://github.com/amy))\n"
+        )
+
+    def test_graphql_backend_is_used_when_selected(self, mocker) -> None:
+        """Test the GraphQL fetcher replaces the REST calls when selected."""
+        changelog = _build_changelog(mocker, {"backend": "graphql"})
+        fetcher_cls = mocker.patch(
+            "github_changelog_md.changelog.changelog.GraphQLFetcher"
+        )
+        fetcher = fetcher_cls.return_value
+        fetcher.get_releases.return_value = [MagicMock()]
+        fetcher.get_pull_requests.return_value = [MagicMock(), MagicMock()]
+        fetcher.get_issues.return_value = []
+        repo_obj = MagicMock(full_name="owner/repo")
+        repo_obj.name = "repo"
+        repo_obj.owner.login = "owner"
+        changelog.git = MagicMock()
+        changelog.git.get_user.return_value.get_repo.return_value = repo_obj
+
+        changelog.repo_data = changelog.get_repo_data()
+
+        fetcher_cls.assert_called_once_with(
+            changelog.git.requester, "owner", "repo"
+        )
+        assert changelog.get_repo_releases() == (
+            fetcher.get_releases.return_value
+        )
+        assert changelog.get_closed_prs() == (
+            fetcher.get_pull_requests.return_value
+        )
+        assert changelog.get_closed_issues() == []
+        repo_obj.get_pulls.assert_not_called()
+        repo_obj.get_issues.assert_not_called()
+        repo_obj.get_releases.assert_not_called()
+
+    def test_rprint_issues_uses_resolved_closers(self, mocker) -> None:
+        """Test rprint_issues reads the closer from the prefetched lookup."""
+        changelog = _build_changelog(mocker)
+        changelog.ignored_labels = []
+        changelog.sections = []
+        changelog.plan = changelog.compile_plan()
+        changelog.issue_closers = {
+            42: UserRecord(login="closer", html_url="https://github.com/closer")
+        }
+
+        issue = MagicMock()
+        issue.number = 42
+        issue.title = "closed issue"
+        issue.html_url = "https://github.com/user/repo/issues/42"
+        issue.labels = []
+
+        out = MagicMock()
+        changelog.rprint_issues(out, [issue])
+
+        rendered = "".join(call.args[0] for call in out.write.call_args_list)
+        assert "by [closer](https://github.com/closer)" in rendered
+
+    def test_get_issue_closers_batches_rest_issues(self, mocker) -> None:
+        """Test closers for REST issues are resolved in one bulk lookup."""
+        changelog = _build_changelog(mocker)
+        changelog.repo_data = MagicMock()
+        changelog.repo_data.name = "repo"
+        changelog.repo_data.owner.login = "owner"
+        changelog.issue_by_release = {
+            1: [MagicMock(number=1, closed_by=None)],
+            2: [],
+        }
+        changelog.unreleased_issues = [MagicMock(number=2, closed_by=None)]
+        fetcher_cls = mocker.patch(
+            "github_changelog_md.changelog.changelog.GraphQLFetcher"
+        )
+        fetcher_cls.return_value.get_issue_closers.return_value = {
+            1: None,
+            2: None,
+        }
+
+        assert changelog.get_issue_closers() == {1: None, 2: None}
+        fetcher_cls.assert_called_once_with(
+            changelog.git.requester, "owner", "repo"
+        )
+        (numbers,) = fetcher_cls.return_value.get_issue_closers.call_args.args
+        assert list(numbers) == [1, 2]
+
+        git_error_mock = mocker.patch(
+            "github_changelog_md.changelog.changelog.git_error",
+            side_effect=typer.Exit(ExitErrors.GIT_ERROR),
+        )
+        fetcher_cls.return_value.get_issue_closers.side_effect = (
+            GithubException(status=502, data={"message": "boom"})
+        )
+        with pytest.raises(typer.Exit):
+            changelog.get_issue_closers()
+        assert git_error_mock.called
+
+    def test_get_issue_closers_graphql_and_hidden_issues(self, mocker) -> None:
+        """Test no requests are made when the closers are known or unused."""
+        changelog = _build_changelog(mocker)
+        fetcher_cls = mocker.patch(
+            "github_changelog_md.changelog.changelog.GraphQLFetcher"
+        )
+        closer = UserRecord(login="closer", html_url="https://github.com/c")
+        issue = IssueRecord(
+            id=1,
+            number=7,
+            title="Issue",
+            html_url="https://github.com/user/repo/issues/7",
+            user=closer,
+            closed_at=None,
+            closed_by=closer,
+        )
+        changelog.graphql = MagicMock()
+        changelog.issue_by_release = {1: [issue]}
+        changelog.unreleased_issues = []
+
+        assert changelog.get_issue_closers() == {7: closer}
+
+        changelog.options["show_issues"] = False
+        assert changelog.get_issue_closers() == {}
+        fetcher_cls.assert_not_called()
+
+    def test_run_with_local_store_syncs_instead_of_fetching(
+        self, mocker, tmp_path
+    ) -> None:
+        """Test run reads the lists from the local store when enabled."""
+        changelog = _build_changelog(
+            mocker, {"local_store": True, "cache_dir": str(tmp_path)}
+        )
+        mocker.patch("github_changelog_md.changelog.changelog.header")
+        changelog.get_repo_data = MagicMock(return_value=MagicMock())
+        changelog.get_repo_releases = MagicMock()
+        changelog.get_closed_prs = MagicMock()
+        changelog.get_closed_issues = MagicMock()
+        changelog.sync_local_store = MagicMock(return_value=([], [], []))
+        changelog.filter_issues = MagicMock(return_value=[])
+        changelog.link_pull_requests = MagicMock(return_value={})
+        changelog.link_issues = MagicMock(return_value={})
+        changelog.get_issue_closers = MagicMock(return_value={})
+        changelog.generate_changelog = MagicMock()
+
+        changelog.run()
+
+        changelog.sync_local_store.assert_called_once_with(changelog.store)
+        changelog.get_repo_releases.assert_not_called()
+        changelog.get_closed_prs.assert_not_called()
+        changelog.get_closed_issues.assert_not_called()
+        assert (tmp_path / "store.sqlite3").exists()
+
+    def test_sync_local_store_success_and_error(self, mocker) -> None:
+        """Test sync_local_store returns the synced lists or exits."""
+        changelog = _build_changelog(mocker)
+        changelog.repo_data = MagicMock()
+        store = MagicMock()
+        store.sync.return_value = MagicMock(
+            releases=[MagicMock()], pull_requests=[], issues=[], updated=1
+        )
+
+        releases, prs, issues = changelog.sync_local_store(store)
+
+        assert releases == store.sync.return_value.releases
+        assert prs == []
+        assert issues == []
+
+        git_error_mock = mocker.patch(
+            "github_changelog_md.changelog.changelog.git_error",
+            side_effect=typer.Exit(ExitErrors.GIT_ERROR),
+        )
+        store.sync.side_effect = GithubException(
+            status=500, data={"message": "boom"}
+        )
+        with pytest.raises(typer.Exit):
+            changelog.sync_local_store(store)
+        assert git_error_mock.called
+
+    def test_get_issue_closers_saves_resolved_closers_to_store(
+        self, mocker
+    ) -> None:
+        """Test resolved closers are saved so they are not asked for again."""
+        changelog = _build_changelog(mocker)
+        changelog.repo_data = MagicMock(full_name="owner/repo")
+        changelog.store = MagicMock()
+        closer = UserRecord(login="closer", html_url="https://github.com/c")
+        known = IssueRecord(
+            id=1,
+            number=1,
+            title="Known",
+            html_url="https://github.com/user/repo/issues/1",
+            user=closer,
+            closed_at=None,
+            closed_by=closer,
+        )
+        unknown = replace(known, id=2, number=2, closed_by=None)
+        changelog.issue_by_release = {1: [known, unknown]}
+        changelog.unreleased_issues = []
+        fetcher_cls = mocker.patch(
+            "github_changelog_md.changelog.changelog.GraphQLFetcher"
+        )
+        fetcher_cls.return_value.get_issue_closers.return_value = {2: closer}
+
+        assert changelog.get_issue_closers() == {1: closer, 2: closer}
+
+        fetcher_cls.return_value.get_issue_closers.assert_called_once_with([2])
+        changelog.store.save.assert_called_once_with(
+            "owner/repo", "issue", [replace(unknown, closed_by=closer)]
+        )
+        changelog.store.commit.assert_called_once()
+
+    def test_rest_pages_are_fetched_in_parallel_when_enabled(
+        self, mocker
+    ) -> None:
+        """Test closed PRs and issues are fetched with the page fetcher."""
+        changelog = _build_changelog(mocker, {"fetch_workers": 3})
+        fetcher_cls = mocker.patch(
+            "github_changelog_md.changelog.changelog.PageFetcher"
+        )
+        repo_obj = MagicMock(full_name="owner/repo")
+        changelog.repo_name = "repo"
+        changelog.user = "owner"
+        changelog.git = MagicMock()
+        changelog.git.get_user.return_value.get_repo.return_value = repo_obj
+
+        changelog.repo_data = changelog.get_repo_data()
+
+        fetcher_cls.assert_called_once_with(
+            changelog.git.requester, "owner/repo", 3
+        )
+        fetch = fetcher_cls.return_value.fetch
+        fetch.side_effect = lambda get_list, _total, _type, _checkpoint: [
+            get_list(repo_obj)
+        ]
+
+        assert changelog.get_closed_prs() == [repo_obj.get_pulls.return_value]
+        assert changelog.get_closed_issues() == [
+            repo_obj.get_issues.return_value
+        ]
+        repo_obj.get_pulls.assert_called_with(
+            state="closed", sort="created", direction="desc"
+        )
+        repo_obj.get_issues.assert_called_with(state="closed", sort="created")
+        assert fetch.call_count == 2  # noqa: PLR2004
+
+    def test_fetch_repo_lists_runs_phases_concurrently(self, mocker) -> None:
+        """Test the three lists are fetched at the same time."""
+        changelog = _build_changelog(mocker)
+        all_started = threading.Barrier(3, timeout=5)
+
+        def fetch(result: list[Any]) -> Callable[[], list[Any]]:
+            def getter() -> list[Any]:
+                all_started.wait()
+                return result
+
+            return getter
+
+        release, pr, issue = MagicMock(), MagicMock(), MagicMock()
+        changelog.get_repo_releases = fetch([release])
+        changelog.get_closed_prs = fetch([pr])
+        changelog.get_closed_issues = fetch([issue])
+
+        assert changelog.fetch_repo_lists() == ([release], [pr], [issue])
+
+    def test_start_sets_up_shared_connections(self, mocker) -> None:
+        """Test a ChangeLog used on its own makes its client thread-safe."""
+        changelog = _build_changelog(mocker)
+        mocker.patch("github_changelog_md.changelog.changelog.header")
+        github = mocker.patch(
+            "github_changelog_md.changelog.changelog.Github",
+            return_value=MagicMock(),
+        )
+        changelog.git = MagicMock()
+        changelog.git.requester.kwargs = {"per_page": 30}
+
+        with contextlib.ExitStack() as stack:
+            changelog.start(stack)
+            assert SharedConnection.installed
+            github.assert_called_once_with(per_page=30)
+            assert changelog.git is github.return_value
+
+            # the commands have already set them up, so it is left alone.
+            changelog.start(stack)
+            github.assert_called_once()
+        assert not SharedConnection.installed
+
+    def test_fetch_repo_lists_stops_on_error(self, mocker) -> None:
+        """Test an error in any of the fetches ends the run."""
+        changelog = _build_changelog(mocker)
+        changelog.get_repo_releases = MagicMock(return_value=[])
+        changelog.get_closed_prs = MagicMock(
+            side_effect=typer.Exit(ExitErrors.GIT_ERROR)
+        )
+        changelog.get_closed_issues = MagicMock(return_value=[])
+
+        with pytest.raises(typer.Exit):
+            changelog.fetch_repo_lists()
+
+    def test_print_found_prints_one_line(self, capsys) -> None:
+        """Test the progress for each list is printed as a single line."""
+        ChangeLog.print_found("Releases", 3)
+
+        assert capsys.readouterr().out == "  -> Getting Releases ... 3 Found\n"
+
+    def test_render_release_reuses_unchanged_fragments(
+        self, mocker, tmp_path
+    ) -> None:
+        """Test a release is only rendered again if its inputs change."""
+        changelog = _build_changelog(mocker)
+        changelog.settings.fragment_cache = True
+        changelog.settings.cache_dir = str(tmp_path)
+        changelog.repo_data = MagicMock(
+            html_url="https://github.com/owner/repo", full_name="owner/repo"
+        )
+        changelog.sections = []
+        changelog.ignored_labels = []
+        changelog.plan = changelog.compile_plan()
+        changelog.pr_by_release = {}
+        changelog.issue_by_release = {}
+        release = ReleaseRecord(
+            id=1,
+            tag_name="v1.0",
+            title="",
+            body="notes",
+            html_url="https://github.com/owner/repo/releases/tag/v1.0",
+            created_at=datetime.datetime(
+                2024, 1, 1, tzinfo=datetime.timezone.utc
+            ),
+        )
+        changelog.process_release = MagicMock(
+            side_effect=lambda f, r: f.write(f"## {r.tag_name}\n")
+        )
+
+        def render() -> str:
+            fragments = changelog.open_fragment_cache()
+            assert fragments is not None
+            f = io.StringIO()
+            changelog.render_release(f, release, fragments)
+            fragments.save()
+            return f.getvalue()
+
+        assert render() == "## v1.0\n"
+        assert render() == "## v1.0\n"
+        assert changelog.process_release.call_count == 1
+        assert (tmp_path / "fragments" / "owner--repo.json").exists()
+
+        changelog.release_text_cache.yanked_by_release["v1.0"] = "Broken"
+        render()
+        assert changelog.process_release.call_count == 2  # noqa: PLR2004
+
+        changelog.settings.fragment_cache = False
+        assert changelog.open_fragment_cache() is None
+
+    def test_unwritable_release_cache_still_writes_the_changelog(
+        self, mocker, tmp_path, monkeypatch, capsys
+    ) -> None:
+        """Test the changelog is written even if the cache can't be saved."""
+        monkeypatch.chdir(tmp_path)
+        # a file where the cache folder should be, so it can't be created.
+        (tmp_path / "cache").write_text("")
+        changelog = _build_changelog(mocker)
+        changelog.settings.fragment_cache = True
+        changelog.settings.cache_dir = str(tmp_path / "cache")
+        changelog.options["show_unreleased"] = False
+        changelog.repo_data = MagicMock(
+            html_url="https://github.com/owner/repo", full_name="owner/repo"
+        )
+        changelog.sections = []
+        changelog.ignored_labels = []
+        changelog.plan = changelog.compile_plan()
+        changelog.pr_by_release = {}
+        changelog.issue_by_release = {}
+        changelog.repo_releases = [_release(1, 1)]
+        changelog.process_release = MagicMock(
+            side_effect=lambda f, r: f.write(f"## [{r.tag_name}]\n\n")
+        )
+
+        changelog.generate_changelog()
+
+        assert "## [v1]" in (tmp_path / "CHANGELOG.md").read_text()
+        assert "Could not save the release cache" in capsys.readouterr().out
+
+    def test_fetch_recent_lists_stops_at_the_boundary_release(
+        self, mocker
+    ) -> None:
+        """Test only items updated since the boundary release are fetched."""
+        changelog = _build_changelog(mocker)
+        changelog.options["max_releases"] = 1
+        changelog.repo_data = MagicMock()
+        releases = [_release(3, 20), _release(2, 10), _release(1, 1)]
+        changelog.repo_data.get_releases.return_value = releases
+        changelog.repo_data.get_pulls.return_value = [
+            MagicMock(number=3, updated_at=_jan(15)),
+            MagicMock(number=2, updated_at=_jan(5)),
+            MagicMock(number=1, updated_at=_jan(12)),
+        ]
+        changelog.repo_data.get_issues.return_value = [
+            MagicMock(number=4, pull_request=None, updated_at=_jan(11)),
+            MagicMock(number=5, pull_request=None, updated_at=_jan(2)),
+        ]
+
+        repo_releases, prs, issues = changelog.fetch_recent_lists(1)
+
+        assert repo_releases == releases[:2]
+        assert [pr.number for pr in prs] == [3]
+        assert [issue.number for issue in issues] == [4]
+        changelog.repo_data.get_pulls.assert_called_once_with(
+            state="closed", sort="updated", direction="desc"
+        )
+        changelog.repo_releases = repo_releases
+        assert changelog.boundary_release == releases[1]
+        assert changelog.window_releases(releases) == releases[:2]
+
+        changelog.repo_data.get_pulls.side_effect = GithubException(
+            status=500, data={"message": "boom"}
+        )
+        with pytest.raises(typer.Exit):
+            changelog.fetch_recent_lists(1)
+
+    def test_fetch_recent_lists_fetches_everything_if_few_releases(
+        self, mocker
+    ) -> None:
+        """Test the whole history is fetched if it is inside the window."""
+        changelog = _build_changelog(mocker)
+        changelog.options["max_releases"] = 5
+        changelog.repo_data = MagicMock()
+        changelog.repo_data.get_releases.return_value = [_release(1, 1)]
+        changelog.get_closed_prs = MagicMock(return_value=[])
+        changelog.get_closed_issues = MagicMock(return_value=[])
+
+        releases, _, _ = changelog.fetch_recent_lists(5)
+
+        changelog.repo_releases = releases
+        assert changelog.boundary_release is None
+        changelog.get_closed_prs.assert_called_once()
+        changelog.get_closed_issues.assert_called_once()
+
+        changelog.repo_data.get_releases.side_effect = GithubException(
+            status=500, data={"message": "boom"}
+        )
+        with pytest.raises(typer.Exit):
+            changelog.get_recent_releases(5)
+
+    def test_generate_changelog_keeps_older_releases(
+        self, mocker, tmp_path, monkeypatch
+    ) -> None:
+        """Test the older releases are copied from the existing changelog."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "CHANGELOG.md").write_text(
+            "# Changelog\n\nOld intro\n\n"
+            "## [v1](https://github.com/owner/repo/releases/tag/v1)\n\n"
+            "- Old\n\n---\n*footer*\n"
+        )
+        changelog = _build_changelog(mocker)
+        changelog.options["max_releases"] = 1
+        changelog.options["show_unreleased"] = False
+        changelog.repo_data = MagicMock(
+            html_url="https://github.com/owner/repo"
+        )
+        changelog.repo_releases = [_release(2, 10), _release(1, 1)]
+        changelog.process_release = MagicMock(
+            side_effect=lambda f, r: f.write(f"## [{r.tag_name}]\n\n")
+        )
+        write_atomic = mocker.patch(
+            "github_changelog_md.changelog.changelog.write_atomic"
+        )
+
+        changelog.generate_changelog()
+
+        _, rendered = write_atomic.call_args.args
+        assert rendered.endswith(
+            "## [v2]\n\n"
+            "[`Full Changelog`](https://github.com/owner/repo/compare/v1...v2)"
+            " | [`Diff`](https://github.com/owner/repo/compare/v1...v2.diff)"
+            " | [`Patch`](https://github.com/owner/repo/compare/v1...v2.patch)"
+            "\n\n## [v1](https://github.com/owner/repo/releases/tag/v1)\n\n"
+            "- Old\n\n---\n*footer*\n"
+        )
+        assert "Old intro" not in rendered
+        changelog.process_release.assert_called_once()
+
+    def test_skipped_boundary_release_uses_the_next_one(
+        self, mocker, tmp_path, monkeypatch
+    ) -> None:
+        """Test a skipped release is passed over when keeping older releases."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "CHANGELOG.md").write_text(
+            "# Changelog\n\n"
+            "## [v1](https://github.com/owner/repo/releases/tag/v1)\n\n"
+            "- Old\n"
+        )
+        changelog = _build_changelog(mocker)
+        changelog.options["max_releases"] = 2
+        changelog.options["skip_releases"] = ["v2"]
+        changelog.options["show_unreleased"] = False
+        changelog.repo_data = MagicMock(
+            html_url="https://github.com/owner/repo"
+        )
+        releases = [_release(4, 30), _release(3, 20), _release(2, 10)]
+        releases += [_release(1, 5), _release(0, 1)]
+        changelog.repo_data.get_releases.return_value = releases
+        changelog.get_updated_since = MagicMock(return_value=[])
+
+        changelog.repo_releases, _, _ = changelog.fetch_recent_lists(2)
+
+        assert changelog.repo_releases == releases[:4]
+        assert changelog.window_releases(releases) == releases[:4]
+        assert changelog.boundary_release == releases[3]
+        changelog.process_release = MagicMock(
+            side_effect=lambda f, r: f.write(f"## [{r.tag_name}]\n\n")
+        )
+        write_atomic = mocker.patch(
+            "github_changelog_md.changelog.changelog.write_atomic"
+        )
+
+        changelog.generate_changelog()
+
+        _, rendered = write_atomic.call_args.args
+        assert rendered.startswith("# Changelog\n\n## [v4]\n\n## [v3]")
+        assert rendered.endswith(
+            "compare/v1...v2.patch)\n\n"
+            "## [v1](https://github.com/owner/repo/releases/tag/v1)\n\n"
+            "- Old\n"
+        )
+
+    def test_generate_changelog_needs_the_older_releases(
+        self, mocker, tmp_path, monkeypatch, capsys
+    ) -> None:
+        """Test we stop if the older releases aren't in the changelog."""
+        monkeypatch.chdir(tmp_path)
+        changelog = _build_changelog(mocker)
+        changelog.options["max_releases"] = 1
+        changelog.repo_releases = [_release(2, 10), _release(1, 1)]
+
+        with pytest.raises(typer.Exit) as exc:
+            changelog.generate_changelog()
+
+        assert exc.value.exit_code == ExitErrors.MISSING_HISTORY
+        assert "Release 'v1' not found" in capsys.readouterr().err
+
+    def test_run_with_max_releases_skips_contributors(
+        self, mocker, capsys
+    ) -> None:
+        """Test CONTRIBUTORS.md is left alone when only some are fetched."""
+        changelog = _build_changelog(mocker)
+        changelog.options["contributors"] = True
+        changelog.options["max_releases"] = 1
+
+        mocker.patch("github_changelog_md.changelog.changelog.header")
+        changelog.get_repo_data = MagicMock(return_value=MagicMock())
+        changelog.fetch_recent_lists = MagicMock(
+            return_value=([_release(2, 10), _release(1, 1)], [], [])
+        )
+        changelog.link_pull_requests = MagicMock(return_value={})
+        changelog.link_issues = MagicMock(return_value={})
+        changelog.get_issue_closers = MagicMock(return_value={})
+        changelog.generate_changelog = MagicMock()
+        changelog.get_contributors = MagicMock()
+
+        changelog.run()
+
+        changelog.get_contributors.assert_not_called()
+        assert "Not updating CONTRIBUTORS.md" in capsys.readouterr().out
+
+        # the git history has every contributor, so can still be used.
+        changelog.settings.contributors_source = "git"
+        changelog.get_contributors.return_value = []
+        changelog.update_contributors = MagicMock()
+        changelog.run()
+        changelog.update_contributors.assert_called_once()
+
+    def test_run_unreleased_renders_only_the_unreleased_section(
+        self, mocker
+    ) -> None:
+        """Test only the latest release and newer items are used."""
+        changelog = _build_changelog(mocker)
+        mocker.patch("github_changelog_md.changelog.changelog.header")
+        repo = MagicMock(html_url="https://github.com/owner/repo")
+        changelog.get_repo_data = MagicMock(return_value=repo)
+        changelog.git = MagicMock()
+        pr = PRRecord(
+            id=1,
+            number=7,
+            title="add a thing",
+            html_url="https://github.com/owner/repo/pull/7",
+            user=UserRecord(login="me", html_url="https://github.com/me"),
+            merged_at=_jan(12),
+        )
+        changelog.fetch_recent_lists = MagicMock(
+            return_value=([_release(1, 10)], [pr], [])
+        )
+        resolve_closers = mocker.patch.object(
+            changelog, "resolve_closers", return_value={}
+        )
+
+        text = changelog.run_unreleased()
+
+        changelog.fetch_recent_lists.assert_called_once_with(0)
+        resolve_closers.assert_called_once_with([])
+        assert text.startswith(
+            "## [Unreleased](https://github.com/owner/repo/tree/HEAD)\n\n"
+        )
+        assert "- Add a thing ([#7]" in text
+        assert "Full Changelog" not in text
+
+    def test_open_checkpoint_only_when_enabled(
+        self, mocker, tmp_path, capsys
+    ) -> None:
+        """Test checkpoints are opened in the cache dir, if turned on."""
+        changelog = _build_changelog(mocker)
+        changelog.repo_data = MagicMock(full_name="owner/repo")
+        changelog.git = MagicMock(per_page=30)
+        assert changelog.open_checkpoint("Closed PRs") is None
+
+        changelog.settings.checkpoints = True
+        changelog.settings.cache_dir = str(tmp_path)
+        checkpoint = changelog.open_checkpoint("Closed PRs", PRRecord)
+        assert isinstance(checkpoint, RecordCheckpoint)
+        assert checkpoint.path == (
+            tmp_path / "checkpoints" / "owner--repo-closed-prs.jsonl"
+        )
+        assert checkpoint.key == {
+            "repo": "owner/repo",
+            "list": "Closed PRs",
+            "backend": "rest",
+            "per_page": 30,
+        }
+        checkpoint.save_page(0, [], 0)
+        assert capsys.readouterr().out == ""
+
+        resumed = changelog.open_checkpoint("Closed PRs")
+        assert type(resumed) is Checkpoint
+        assert "Resuming Closed PRs from 1 saved pages" in (
+            capsys.readouterr().out
+        )
+
+    def test_checkpoint_removed_once_list_is_fetched(
+        self, mocker, tmp_path
+    ) -> None:
+        """Test a finished fetch removes its checkpoint, a failed one not."""
+        changelog = _build_changelog(
+            mocker, {"checkpoints": True, "cache_dir": str(tmp_path)}
+        )
+        changelog.repo_data = MagicMock(full_name="owner/repo")
+        changelog.git = MagicMock(per_page=30)
+        changelog.graphql = MagicMock()
+        changelog.graphql.get_pull_requests.side_effect = GithubException(
+            500, {"message": "boom"}
+        )
+        path = tmp_path / "checkpoints" / "owner--repo-closed-prs.jsonl"
+
+        with pytest.raises(typer.Exit):
+            changelog.get_closed_prs()
+        assert path.exists()
+
+        changelog.graphql.get_pull_requests.side_effect = None
+        changelog.graphql.get_pull_requests.return_value = []
+        assert changelog.get_closed_prs() == []
+        assert not path.exists()
+
+        changelog.graphql.get_issues.return_value = []
+        assert changelog.get_closed_issues() == []
+        checkpoint = changelog.graphql.get_issues.call_args.args[0]
+        assert not checkpoint.path.exists()
+
+    def test_render_from_snapshot_without_github(
+        self, mocker, tmp_path, monkeypatch
+    ) -> None:
+        """Test a snapshot renders with no client and no PAT."""
+        monkeypatch.chdir(tmp_path)
+        user = UserRecord("dev", "https://github.com/dev")
+        when = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        snapshot = Snapshot(
+            repo=RepoRecord(
+                "owner/repo",
+                "repo",
+                "https://github.com/owner/repo",
+                first_commit_at=when,
+            ),
+            fetched_at=when,
+            releases=[],
+            pull_requests=[
+                PRRecord(
+                    id=1,
+                    number=2,
+                    title="Add a thing",
+                    html_url="https://github.com/owner/repo/pull/2",
+                    user=user,
+                    merged_at=when + datetime.timedelta(days=1),
+                )
+            ],
+            issues=[
+                IssueRecord(
+                    id=3,
+                    number=1,
+                    title="Broken thing",
+                    html_url="https://github.com/owner/repo/issues/1",
+                    user=user,
+                    closed_at=when + datetime.timedelta(days=1),
+                )
+            ],
+        )
+        changelog = _build_changelog(mocker, {"github_pat": None}, snapshot)
+        github_cls = mocker.patch(
+            "github_changelog_md.changelog.changelog.GraphQLFetcher"
+        )
+        mocker.patch("github_changelog_md.changelog.changelog.header")
+
+        changelog.run()
+
+        text = (tmp_path / "CHANGELOG.md").read_text()
+        assert "Add a thing" in text
+        assert "Broken thing" in text
+        assert not hasattr(changelog, "git")
+        github_cls.assert_not_called()
+
+    def test_github_repo_is_not_available_from_a_snapshot(self, mocker) -> None:
+        """Test steps that need GitHub exit when rendering a snapshot."""
+        changelog = _build_changelog(mocker)
+        changelog.repo_data = RepoRecord("o/r", "r", "https://github.com/o/r")
+
+        with pytest.raises(typer.Exit) as exc_info:
+            _ = changelog.github_repo
+
+        assert exc_info.value.exit_code == ExitErrors.BAD_SNAPSHOT
+
+    def test_save_snapshot(self, mocker, tmp_path) -> None:
+        """Test the fetched data is saved with closers and names resolved."""
+        changelog = _build_changelog(mocker)
+        mocker.patch("github_changelog_md.changelog.changelog.header")
+        user = UserRecord("dev", "https://github.com/dev")
+        issue = IssueRecord(
+            id=3,
+            number=1,
+            title="Broken",
+            html_url="https://github.com/o/r/issues/1",
+            user=user,
+            closed_at=None,
+        )
+        repo = MagicMock(full_name="o/r", html_url="https://github.com/o/r")
+        repo.name = "r"
+        first_commit = datetime.datetime(
+            2020, 1, 1, tzinfo=datetime.timezone.utc
+        )
+        changelog.get_repo_data = MagicMock(return_value=repo)
+        pr = PRRecord(
+            id=4,
+            number=2,
+            title="Fix",
+            html_url="https://github.com/o/r/pull/2",
+            user=user,
+            merged_at=first_commit,
+        )
+        named = replace(user, name="Dev User")
+        changelog.fetch_repo_lists = MagicMock(return_value=([], [pr], [issue]))
+        changelog.resolve_closers = MagicMock(return_value={1: user})
+        changelog.resolve_names = MagicMock(return_value=[named])
+        changelog.get_latest_release_date = MagicMock(return_value=first_commit)
+        path = tmp_path / "snapshot.json"
+
+        changelog.save_snapshot(path)
+
+        snapshot = Snapshot.load(path)
+        assert snapshot.repo == RepoRecord(
+            "o/r", "r", "https://github.com/o/r", first_commit
+        )
+        assert snapshot.issues == [replace(issue, closed_by=user)]
+        changelog.resolve_closers.assert_called_once_with([issue])
+        assert snapshot.pull_requests == [replace(pr, user=named)]
+        changelog.resolve_names.assert_called_once_with([user])
+
+    def test_print_budget_shows_remaining_requests(
+        self, mocker, capsys
+    ) -> None:
+        """Test the remaining budget is printed, if we know it."""
+        scheduler = RateLimitScheduler(max_wait=60)
+        mocker.patch.object(SharedConnection, "scheduler", None)
+        ChangeLog.print_budget()
+        assert capsys.readouterr().out == ""
+
+        mocker.patch.object(SharedConnection, "scheduler", scheduler)
+        ChangeLog.print_budget()
+        assert capsys.readouterr().out == ""
+
+        scheduler.budgets["core"] = Budget(5000, 4321, 0)
+        ChangeLog.print_budget()
+        assert (
+            capsys.readouterr().out
+            == "  -> API requests left : 4321/5000 core\n"
+        )
+
+    def test_search_backend_is_used_when_selected(self, mocker) -> None:
+        """Test the search fetcher replaces the REST PR and Issue calls."""
+        changelog = _build_changelog(mocker, {"backend": "search"})
+        fetcher_cls = mocker.patch(
+            "github_changelog_md.changelog.changelog.SearchFetcher"
+        )
+        repo_obj = MagicMock(full_name="owner/repo")
+        changelog.repo_name = "repo"
+        changelog.user = "owner"
+        changelog.ignored_labels = ["wontfix"]
+        changelog.git = MagicMock()
+        changelog.git.get_user.return_value.get_repo.return_value = repo_obj
+        fetcher = fetcher_cls.return_value
+        fetcher.get_pull_requests.return_value = [MagicMock()]
+        fetcher.get_issues.return_value = [MagicMock(), MagicMock()]
+
+        changelog.repo_data = changelog.get_repo_data()
+
+        fetcher_cls.assert_called_once_with(
+            changelog.git.requester,
+            "owner/repo",
+            repo_obj.created_at,
+            [],
+            ["wontfix"],
+        )
+        assert changelog.get_closed_prs() == fetcher.get_pull_requests()
+        assert changelog.get_closed_issues() == fetcher.get_issues()
+        repo_obj.get_pulls.assert_not_called()
+        repo_obj.get_issues.assert_not_called()
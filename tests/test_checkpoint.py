@@ -0,0 +1,156 @@
+"""Test saving fetched pages so an interrupted run can resume."""
+
+from __future__ import annotations
+
+import datetime
+import json
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+from github_changelog_md.changelog.checkpoint import (
+    MAX_AGE,
+    Checkpoint,
+    RecordCheckpoint,
+    SavedPage,
+)
+from github_changelog_md.changelog.records import (
+    GHOST_USER,
+    IssueRecord,
+    PRRecord,
+    UserRecord,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+KEY = {"repo": "owner/repo", "list": "Closed PRs", "per_page": 2}
+
+
+def _user() -> MagicMock:
+    """Return a mock PyGithub user."""
+    return MagicMock(login="dev", html_url="https://github.com/dev")
+
+
+class TestCheckpoint:
+    """Test the Checkpoint and RecordCheckpoint classes."""
+
+    def test_saved_pages_are_read_back(self, tmp_path: Path) -> None:
+        """Test a new checkpoint sees the pages saved by an earlier one."""
+        path = tmp_path / "checkpoints" / "prs.jsonl"
+        checkpoint = Checkpoint(path, KEY)
+        assert checkpoint.get_page(0) is None
+
+        checkpoint.save_page(0, [{"n": 1}], 1, "abc")
+        checkpoint.save_page(1, [{"n": 2}], 1)
+
+        resumed = Checkpoint(path, KEY)
+        assert resumed.get_page(0) == SavedPage([{"n": 1}], 1, "abc")
+        assert resumed.get_page(1) == SavedPage([{"n": 2}], 1, None)
+
+    def test_different_key_starts_again(self, tmp_path: Path) -> None:
+        """Test a checkpoint saved for something else is thrown away."""
+        path = tmp_path / "prs.jsonl"
+        Checkpoint(path, KEY).save_page(0, [{"n": 1}], 1)
+
+        checkpoint = Checkpoint(path, {**KEY, "per_page": 100})
+
+        assert checkpoint.pages == {}
+        assert len(path.read_text().splitlines()) == 1
+
+    def test_old_checkpoint_starts_again(self, tmp_path: Path) -> None:
+        """Test a checkpoint older than the maximum age is thrown away."""
+        path = tmp_path / "prs.jsonl"
+        started_at = datetime.datetime.now(tz=datetime.timezone.utc) - (
+            MAX_AGE + datetime.timedelta(minutes=1)
+        )
+        header = {
+            "version": 1,
+            "key": KEY,
+            "started_at": started_at.isoformat(),
+        }
+        page = {"page": 0, "count": 1, "cursor": None, "items": [{"n": 1}]}
+        path.write_text(f"{json.dumps(header)}\n{json.dumps(page)}\n")
+
+        assert Checkpoint(path, KEY).pages == {}
+
+    def test_partly_written_page_is_ignored(self, tmp_path: Path) -> None:
+        """Test we stop at a line that was cut short when a run was killed."""
+        path = tmp_path / "prs.jsonl"
+        Checkpoint(path, KEY).save_page(0, [{"n": 1}], 1)
+        with path.open("a") as f:
+            f.write('{"page": 1, "count"')
+
+        assert list(Checkpoint(path, KEY).pages) == [0]
+
+    def test_unreadable_checkpoint_starts_again(self, tmp_path: Path) -> None:
+        """Test an empty or broken file is replaced with a new checkpoint."""
+        path = tmp_path / "prs.jsonl"
+        path.write_text("")
+
+        checkpoint = Checkpoint(path, KEY)
+
+        assert checkpoint.pages == {}
+        assert json.loads(path.read_text())["key"] == KEY
+
+    def test_remove(self, tmp_path: Path) -> None:
+        """Test the checkpoint file is removed, even if already gone."""
+        path = tmp_path / "prs.jsonl"
+        checkpoint = Checkpoint(path, KEY)
+
+        checkpoint.remove()
+        checkpoint.remove()
+
+        assert not path.exists()
+
+    def test_records_round_trip(self, tmp_path: Path) -> None:
+        """Test PyGithub PRs are saved, and read back, as records."""
+        path = tmp_path / "prs.jsonl"
+        pr = MagicMock(
+            id=10,
+            number=1,
+            title="Add a thing",
+            html_url="https://github.com/owner/repo/pull/1",
+            user=_user(),
+            merged_at=datetime.datetime(
+                2024, 1, 2, tzinfo=datetime.timezone.utc
+            ),
+            labels=[],
+        )
+        RecordCheckpoint(path, KEY, PRRecord).save_records(
+            0, [PRRecord.from_github(pr)], 1
+        )
+
+        saved = RecordCheckpoint(path, KEY, PRRecord).get_records(0)
+
+        assert saved == (
+            [
+                PRRecord(
+                    id=10,
+                    number=1,
+                    title="Add a thing",
+                    html_url="https://github.com/owner/repo/pull/1",
+                    user=UserRecord("dev", "https://github.com/dev"),
+                    merged_at=pr.merged_at,
+                )
+            ],
+            1,
+        )
+
+    def test_count_includes_dropped_items(self, tmp_path: Path) -> None:
+        """Test the page count is kept when PRs were dropped from the issues."""
+        path = tmp_path / "issues.jsonl"
+        issue = IssueRecord(
+            id=20,
+            number=2,
+            title="Broken",
+            html_url="https://github.com/owner/repo/issues/2",
+            user=GHOST_USER,
+            closed_at=None,
+        )
+        checkpoint = RecordCheckpoint(path, KEY, IssueRecord)
+        checkpoint.save_records(0, [issue], 2)
+
+        saved = checkpoint.get_records(0)
+
+        assert saved == ([issue], 2)
+        assert checkpoint.get_records(1) is None
@@ -2,20 +2,21 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import TYPE_CHECKING
 from unittest.mock import Mock
 
 import pytest
 from typer.testing import CliRunner
 
+from github_changelog_md.constants import SNAPSHOT_FILE, ExitErrors
 from github_changelog_md.main import app
+from tests import conftest
 
 if TYPE_CHECKING:
     from pytest_mock import MockerFixture
     from pytest_mock.plugin import MockType
 
-    from github_changelog_md.constants import ChangelogOptions
-
 
 @pytest.fixture
 def mock_changelog(mocker: MockerFixture) -> MockType:
@@ -23,22 +24,19 @@ def mock_changelog(mocker: MockerFixture) -> MockType:
     return mocker.patch("github_changelog_md.main.ChangeLog")
 
 
-default_options: ChangelogOptions = {
-    "user_name": None,
-    "next_release": None,
-    "show_unreleased": True,
-    "show_depends": True,
-    "output_file": "CHANGELOG.md",
-    "contributors": False,
-    "quiet": False,
-    "skip_releases": None,
-    "show_issues": True,
-    "item_order": "newest-first",
-    "ignore_items": None,
-    "max_depends": 10,
-    "show_diff": True,
-    "show_patch": True,
-}
+@pytest.fixture(autouse=True)
+def mock_response_cache(mocker: MockerFixture) -> MockType:
+    """Return a mocked response cache, so no cache file is created."""
+    return mocker.patch("github_changelog_md.main.response_cache")
+
+
+@pytest.fixture(autouse=True)
+def mock_shared_connections(mocker: MockerFixture) -> MockType:
+    """Return a mocked shared_connections, used when the cache is off."""
+    return mocker.patch("github_changelog_md.main.shared_connections")
+
+
+default_options = conftest.default_options()
 
 
 @pytest.mark.usefixtures("config_file")
@@ -82,12 +80,14 @@ class TestCLI:
             (["--contrib"], {"contributors": True}),
             (["--no-contrib"], {"contributors": False}),
             (["--quiet"], {"quiet": True}),
+            (["--quick-check"], {"quick_check": True}),
+            (["--max-releases", "5"], {"max_releases": 5}),
         ],
     )
     def test_different_cli_options(
         self,
         mock_changelog: MockType,
-        cli_options: tuple[list[str], dict[str, bool]],
+        cli_options: tuple[list[str], dict[str, bool | int]],
     ) -> None:
         """Test that the CLI options are properly passed to ChangeLog().
 
@@ -201,3 +201,182 @@ class TestCLI:
         assert "Could not find a local repository" in result.output
         mock_changelog.assert_not_called()
         mock_changelog_instance.run.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("cli_options", "expected"),
+        [([], True), (["--cache"], True), (["--no-cache"], False)],
+    )
+    def test_response_cache_option(
+        self,
+        mock_changelog: MockType,
+        mock_response_cache: MockType,
+        mock_shared_connections: MockType,
+        cli_options: list[str],
+        expected: bool,  # noqa: FBT001
+    ) -> None:
+        """Test the response cache is used unless '--no-cache' is given."""
+        runner = CliRunner()
+        runner.invoke(app, ["--repo", "test_repo", *cli_options])
+
+        assert mock_response_cache.called is expected
+        assert mock_shared_connections.called is not expected
+        mock_changelog.return_value.run.assert_called_once()
+
+    @pytest.mark.parametrize(
+        ("cli_options", "changed", "contributors_changed", "expected"),
+        [
+            ([], False, False, 0),
+            (["--exit-code"], True, False, 0),
+            (["--exit-code"], False, True, 0),
+            (["--exit-code"], False, False, ExitErrors.UNCHANGED),
+        ],
+    )
+    def test_exit_code_option(
+        self,
+        mock_changelog: MockType,
+        cli_options: list[str],
+        changed: bool,  # noqa: FBT001
+        contributors_changed: bool,  # noqa: FBT001
+        expected: int,
+    ) -> None:
+        """Test '--exit-code' exits with UNCHANGED if nothing was written."""
+        mock_changelog.return_value.changelog_changed = changed
+        mock_changelog.return_value.contributors_changed = contributors_changed
+
+        runner = CliRunner()
+        result = runner.invoke(app, ["--repo", "test_repo", *cli_options])
+
+        assert result.exit_code == expected
+
+    def test_fetch_command(
+        self, mock_changelog: MockType, mock_response_cache: MockType
+    ) -> None:
+        """Test 'fetch' saves a snapshot rather than rendering."""
+        runner = CliRunner()
+        result = runner.invoke(
+            app, ["fetch", "--repo", "test_repo", "--snapshot", "data.json"]
+        )
+
+        assert result.exit_code == 0
+        mock_changelog.assert_called_once_with("test_repo", default_options)
+        mock_changelog.return_value.save_snapshot.assert_called_once_with(
+            Path("data.json")
+        )
+        mock_changelog.return_value.run.assert_not_called()
+        mock_response_cache.assert_called_once()
+
+    def test_render_command(
+        self,
+        mocker: MockerFixture,
+        mock_changelog: MockType,
+        mock_response_cache: MockType,
+        mock_shared_connections: MockType,
+    ) -> None:
+        """Test 'render' builds the changelog from a snapshot, offline."""
+        mock_load = mocker.patch("github_changelog_md.main.Snapshot.load")
+        mock_load.return_value.repo.name = "snap_repo"
+
+        runner = CliRunner()
+        result = runner.invoke(app, ["render", "--output", "OUT.md"])
+
+        assert result.exit_code == 0
+        mock_load.assert_called_once_with(Path(SNAPSHOT_FILE))
+        mock_changelog.assert_called_once_with(
+            "snap_repo",
+            {**default_options, "output_file": "OUT.md"},
+            snapshot=mock_load.return_value,
+        )
+        mock_changelog.return_value.run.assert_called_once()
+        mock_response_cache.assert_not_called()
+        mock_shared_connections.assert_not_called()
+
+    def test_unreleased_command_prints_markdown(
+        self, mock_changelog: MockType
+    ) -> None:
+        """Test 'unreleased' prints just the section, with no progress."""
+        mock_changelog.return_value.run_unreleased.return_value = (
+            "## [Unreleased](url)\n\n- A change\n"
+        )
+
+        runner = CliRunner()
+        result = runner.invoke(app, ["unreleased", "--repo", "test_repo"])
+
+        assert result.exit_code == 0
+        assert result.output == "## [Unreleased](url)\n\n- A change\n"
+        mock_changelog.assert_called_once_with(
+            "test_repo", {**default_options, "quiet": True}
+        )
+        mock_changelog.return_value.run.assert_not_called()
+
+    def test_unreleased_command_writes_to_file(
+        self, mocker: MockerFixture, mock_changelog: MockType
+    ) -> None:
+        """Test 'unreleased --output' writes the section to the file."""
+        mock_changelog.return_value.run_unreleased.return_value = "## [U]\n"
+        write_atomic = mocker.patch("github_changelog_md.main.write_atomic")
+
+        runner = CliRunner()
+        result = runner.invoke(
+            app, ["unreleased", "--repo", "test_repo", "-o", "PENDING.md"]
+        )
+
+        assert result.exit_code == 0
+        write_atomic.assert_called_once_with(Path("PENDING.md"), "## [U]\n")
+        assert "Unreleased changes written to" in result.output
+
+    @pytest.mark.parametrize(
+        ("failed", "expected"), [(False, 0), (True, ExitErrors.BATCH_FAILED)]
+    )
+    def test_batch_command(
+        self,
+        fs,
+        mocker: MockerFixture,
+        failed: bool,  # noqa: FBT001
+        expected: int,
+    ) -> None:
+        """Test 'batch' builds each repository with its own settings."""
+        fs.create_file(
+            "changelog-batch.toml",
+            contents=(
+                '[[repos]]\nrepo = "owner/one"\n'
+                '[repos.settings]\noutput_file = "HISTORY.md"\n'
+            ),
+        )
+        runner_class = mocker.patch("github_changelog_md.main.BatchRunner")
+        runner_class.return_value.run.return_value = [
+            Mock(full_name="owner/one", failed=failed)
+        ]
+
+        runner = CliRunner()
+        result = runner.invoke(app, ["batch", "--jobs", "2", "--quiet"])
+
+        assert result.exit_code == expected
+        assert runner_class.call_args.args[1] == 2  # noqa: PLR2004
+        (job,) = runner_class.return_value.run.call_args.args[0]
+        assert job.repo.full_name == "owner/one"
+        assert job.options == {
+            **default_options,
+            "user_name": "owner",
+            "output_file": "HISTORY.md",
+            "quiet": False,
+        }
+
+    def test_serve_command(
+        self, mocker: MockerFixture, mock_changelog: MockType
+    ) -> None:
+        """Test 'serve' loads the changelog once, then listens for events."""
+        serve_forever = mocker.patch("github_changelog_md.main.serve_forever")
+        live_class = mocker.patch("github_changelog_md.main.LiveChangelog")
+
+        runner = CliRunner()
+        result = runner.invoke(
+            app, ["serve", "--repo", "test_repo", "--port", "9000"]
+        )
+
+        assert result.exit_code == 0
+        mock_changelog.assert_called_once_with("test_repo", default_options)
+        mock_changelog.return_value.load.assert_called_once()
+        live_class.assert_called_once_with(mock_changelog.return_value, None)
+        serve_forever.assert_called_once_with(
+            live_class.return_value, "127.0.0.1", 9000
+        )
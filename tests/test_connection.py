@@ -0,0 +1,192 @@
+"""Test the thread-safe PyGithub connection class."""
+
+from __future__ import annotations
+
+import io
+import threading
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+import urllib3
+from github import Github, RateLimitExceededException
+from github.Requester import HTTPSRequestsConnectionClass, Requester
+
+from github_changelog_md.changelog.connection import (
+    SharedConnection,
+    retry_args,
+    shared_connections,
+)
+from github_changelog_md.changelog.ratelimit import RateLimitScheduler
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+def _requester() -> Requester:
+    """Return a PyGithub Requester for the public API."""
+    return Requester(
+        auth=None,
+        base_url="https://api.github.com",
+        timeout=15,
+        user_agent="test",
+        per_page=30,
+        verify=True,
+        retry=None,
+        pool_size=None,
+    )
+
+
+class TestSharedConnection:
+    """Test the SharedConnection class."""
+
+    def test_request_details_are_kept_per_thread(self) -> None:
+        """Test two threads using one connection don't swap requests."""
+        with shared_connections():
+            connection = SharedConnection("api.github.com")
+            session = MagicMock()
+            connection.session = session
+            session.get.side_effect = lambda url, **_kwargs: MagicMock(
+                status_code=200, text=url
+            )
+            both_requested = threading.Barrier(2)
+            results: dict[str, str] = {}
+
+            def fetch(path: str) -> None:
+                connection.request("GET", path, None, {})
+                both_requested.wait()
+                results[path] = connection.getresponse().read()
+
+            threads = [
+                threading.Thread(target=fetch, args=(path,))
+                for path in ("/a", "/b")
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert results == {
+            "/a": "https://api.github.com:443/a",
+            "/b": "https://api.github.com:443/b",
+        }
+
+    def test_connections_share_one_session(self) -> None:
+        """Test every connection uses the same session until the block ends."""
+        with shared_connections():
+            first = SharedConnection("api.github.com")
+            second = SharedConnection("api.github.com")
+            second.close()
+
+            assert first.session is second.session
+            assert isinstance(SharedConnection.shared_session, requests.Session)
+
+        assert SharedConnection.shared_session is None
+
+    def test_shared_connections_installs_connection_class(self) -> None:
+        """Test new requesters use the shared connection inside the block."""
+        with shared_connections():
+            requester = _requester()
+            assert requester._Requester__connectionClass is SharedConnection  # noqa: SLF001
+
+        requester = _requester()
+        assert (
+            requester._Requester__connectionClass  # noqa: SLF001
+            is HTTPSRequestsConnectionClass
+        )
+
+    def test_nested_blocks_keep_the_outer_settings(self) -> None:
+        """Test an inner block leaves the outer connections in place."""
+        scheduler = MagicMock()
+        with shared_connections(scheduler=scheduler):
+            with shared_connections():
+                assert SharedConnection.scheduler is scheduler
+            assert SharedConnection.installed
+            assert _requester()._Requester__connectionClass is SharedConnection  # noqa: SLF001
+
+        assert not SharedConnection.installed
+
+    def test_rate_limited_requests_are_retried(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test a 429 is retried after the delay, and the budget recorded."""
+        sleep = mocker.patch(
+            "github_changelog_md.changelog.connection.time.sleep"
+        )
+        scheduler = RateLimitScheduler(max_wait=60)
+        limits = {
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "4999",
+            "X-RateLimit-Reset": "0",
+        }
+        with shared_connections(scheduler=scheduler):
+            connection = SharedConnection("api.github.com")
+            connection.session = MagicMock()
+            connection.session.get.side_effect = [
+                MagicMock(status_code=429, headers={"Retry-After": "3"}),
+                MagicMock(status_code=200, headers=limits, text="ok"),
+            ]
+
+            connection.request("GET", "/repos/o/r", None, {})
+            response = connection.getresponse()
+
+        assert response.status == 200  # noqa: PLR2004
+        assert response.read() == "ok"
+        sleep.assert_called_once_with(3.0)
+        assert scheduler.summary() == "4999/5000 core"
+        assert scheduler.in_flight == {"core": 0}
+
+    def test_permission_errors_are_not_retried(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test a 403 that isn't about the rate limit is returned as is."""
+        sleep = mocker.patch(
+            "github_changelog_md.changelog.connection.time.sleep"
+        )
+        with shared_connections(scheduler=RateLimitScheduler(max_wait=60)):
+            connection = SharedConnection("api.github.com")
+            connection.session = MagicMock()
+            connection.session.get.return_value = MagicMock(
+                status_code=403, headers={}, text='{"message": "Forbidden"}'
+            )
+
+            connection.request("GET", "/repos/o/r", None, {})
+            response = connection.getresponse()
+
+        assert response.status == 403  # noqa: PLR2004
+        sleep.assert_not_called()
+
+    def test_client_does_not_wait_for_the_rate_limit_itself(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test a used up rate limit fails at once if we shouldn't wait.
+
+        PyGithub would otherwise sleep until the reset, however far away.
+        """
+        sleep = mocker.patch("time.sleep")
+        headers = {
+            "Content-Type": "application/json",
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+        }
+        mocker.patch.object(
+            urllib3.connectionpool.HTTPConnectionPool,
+            "_make_request",
+            side_effect=lambda *_args, **_kwargs: urllib3.HTTPResponse(
+                body=io.BytesIO(b'{"message": "API rate limit exceeded"}'),
+                status=403,
+                headers=headers,
+                preload_content=False,
+            ),
+        )
+
+        with shared_connections(scheduler=RateLimitScheduler(max_wait=0)):
+            client = Github(**retry_args())
+            with pytest.raises(RateLimitExceededException):
+                client.get_repo("o/r")
+
+        sleep.assert_not_called()
+        assert retry_args() == {}
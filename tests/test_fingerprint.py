@@ -0,0 +1,88 @@
+"""Test the quick check fingerprint of a repository."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock
+
+from github_changelog_md.changelog.fingerprint import (
+    Fingerprint,
+    digest,
+    digest_files,
+    probe_remote,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+REPO_URL = "https://api.github.com/repos/owner/repo"
+
+
+def _requester(
+    releases: list[dict[str, Any]], items: list[dict[str, Any]]
+) -> MagicMock:
+    """Return a mock Requester answering the two probe requests."""
+    requester = MagicMock()
+    requester.requestJsonAndCheck.side_effect = [({}, releases), ({}, items)]
+    return requester
+
+
+class TestFingerprint:
+    """Test the fingerprint functions and the Fingerprint class."""
+
+    def test_probe_remote(self) -> None:
+        """Test the probe asks for one release and the newest update."""
+        release = {"id": 1, "tag_name": "v1.0", "body": "notes", "url": "x"}
+        requester = _requester(
+            [release], [{"number": 7, "updated_at": "2024-01-02T00:00:00Z"}]
+        )
+
+        remote = probe_remote(requester, REPO_URL)
+
+        assert remote == {
+            "release": {
+                "id": 1,
+                "tag_name": "v1.0",
+                "name": None,
+                "body": "notes",
+                "created_at": None,
+            },
+            "updated": {"number": 7, "at": "2024-01-02T00:00:00Z"},
+        }
+        releases_call, issues_call = (
+            requester.requestJsonAndCheck.call_args_list
+        )
+        assert releases_call.args == ("GET", f"{REPO_URL}/releases")
+        assert releases_call.kwargs["parameters"] == {"per_page": 1}
+        assert issues_call.kwargs["parameters"]["sort"] == "updated"
+
+    def test_probe_remote_empty_repo(self) -> None:
+        """Test a repository with no releases or issues can be probed."""
+        remote = probe_remote(_requester([], []), REPO_URL)
+
+        assert remote == {"release": None, "updated": None}
+
+    def test_digests(self, tmp_path: Path) -> None:
+        """Test the digests are stable, and notice changed or missing files."""
+        assert digest({"a": 1, "b": 2}) == digest({"b": 2, "a": 1})
+        path = tmp_path / "CHANGELOG.md"
+        missing = digest_files([path])
+
+        path.write_text("# Changelog\n")
+        written = digest_files([path])
+
+        assert written != missing
+        assert digest_files([path]) == written
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Test a saved fingerprint loads back, and a bad one doesn't."""
+        path = tmp_path / "fingerprints" / "owner--repo.json"
+        fingerprint = Fingerprint(remote="r", config="c", output="o")
+
+        assert Fingerprint.load(path) is None
+        fingerprint.save(path)
+        assert Fingerprint.load(path) == fingerprint
+
+        path.write_text(json.dumps({"version": 0, "remote": "r"}))
+        assert Fingerprint.load(path) is None
@@ -0,0 +1,79 @@
+"""Test the cache of rendered release fragments."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from github_changelog_md.changelog.fragments import (
+    FRAGMENT_VERSION,
+    FragmentCache,
+)
+from github_changelog_md.changelog.records import UserRecord
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestFragmentCache:
+    """Test the FragmentCache class."""
+
+    def test_missing_cache_is_empty(self, tmp_path: Path) -> None:
+        """Test a cache that was never saved has no fragments."""
+        cache = FragmentCache(tmp_path / "fragments" / "owner--repo.json")
+
+        assert cache.get("key") is None
+        assert cache.hits == 0
+
+    def test_save_keeps_only_used_fragments(self, tmp_path: Path) -> None:
+        """Test fragments load back, and those not used are dropped."""
+        path = tmp_path / "fragments" / "owner--repo.json"
+        cache = FragmentCache(path)
+        cache.put("old", "## v1.0\n")
+        cache.put("kept", "## v1.1\n")
+        cache.save()
+
+        cache = FragmentCache(path)
+        assert cache.get("kept") == "## v1.1\n"
+        assert cache.hits == 1
+        cache.put("new", "## v1.2\n")
+        cache.save()
+
+        saved = json.loads(path.read_text())
+        assert saved["fragments"] == {"kept": "## v1.1\n", "new": "## v1.2\n"}
+
+    def test_other_version_is_ignored(self, tmp_path: Path) -> None:
+        """Test fragments saved by another version, or corrupt, aren't used."""
+        path = tmp_path / "owner--repo.json"
+        path.write_text(
+            json.dumps(
+                {"version": FRAGMENT_VERSION + 1, "fragments": {"key": "x"}}
+            )
+        )
+        assert FragmentCache(path).get("key") is None
+
+        path.write_text("not json")
+        assert FragmentCache(path).get("key") is None
+
+    def test_record_digest_is_kept_between_renders(
+        self, tmp_path: Path, mocker
+    ) -> None:
+        """Test each record is hashed once, until it is replaced."""
+        digest_repr = mocker.patch(
+            "github_changelog_md.changelog.fragments.digest_repr",
+            side_effect=repr,
+        )
+        cache = FragmentCache(tmp_path / "owner--repo.json")
+        user = UserRecord("dev", "https://github.com/dev")
+
+        first = cache.record_digest(user)
+        assert cache.record_digest(user) == first
+        cache.restart()
+        assert cache.record_digest(user) == first
+        digest_repr.assert_called_once()
+
+        # a record that replaced it is hashed again.
+        digest_repr.reset_mock()
+        renamed = UserRecord("dev", "https://github.com/dev", "Dev")
+        assert cache.record_digest(renamed) != first
+        digest_repr.assert_called_once()
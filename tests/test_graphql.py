@@ -0,0 +1,305 @@
+"""Test the GraphQL fetch backend."""
+
+from __future__ import annotations
+
+import datetime
+import math
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock
+
+import pytest
+from github import GithubException
+
+from github_changelog_md.changelog.checkpoint import Checkpoint, SavedPage
+from github_changelog_md.changelog.graphql import (
+    CLOSER_BATCH_SIZE,
+    ISSUES_QUERY,
+    PAGE_SIZE,
+    GraphQLFetcher,
+)
+from github_changelog_md.changelog.records import (
+    GHOST_USER,
+    UserRecord,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _page(
+    connection: str,
+    nodes: list[dict[str, Any]],
+    cursor: str | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return a fake graphql_query response for one page of a connection."""
+    return (
+        {},
+        {
+            "data": {
+                "repository": {
+                    connection: {
+                        "pageInfo": {
+                            "hasNextPage": cursor is not None,
+                            "endCursor": cursor,
+                        },
+                        "nodes": nodes,
+                    }
+                }
+            }
+        },
+    )
+
+
+AUTHOR = {
+    "__typename": "User",
+    "login": "dev",
+    "url": "https://github.com/dev",
+    "name": "Dev User",
+}
+BOT = {
+    "__typename": "Bot",
+    "login": "dependabot",
+    "url": "https://github.com/apps/dependabot",
+}
+
+
+class TestGraphQLFetcher:
+    """Test the GraphQLFetcher class."""
+
+    def test_paginate_follows_cursors(self) -> None:
+        """Test every page is requested, passing the previous end cursor."""
+        requester = MagicMock()
+        requester.graphql_query.side_effect = [
+            _page("releases", [{"n": 1}], cursor="abc"),
+            _page("releases", [{"n": 2}]),
+        ]
+        fetcher = GraphQLFetcher(requester, "owner", "repo")
+
+        nodes = list(fetcher.paginate("query", "releases"))
+
+        assert nodes == [{"n": 1}, {"n": 2}]
+        variables = [
+            call.args[1] for call in requester.graphql_query.call_args_list
+        ]
+        assert variables[0] == {
+            "owner": "owner",
+            "name": "repo",
+            "first": PAGE_SIZE,
+            "cursor": None,
+        }
+        assert variables[1]["cursor"] == "abc"
+
+    def test_paginate_resumes_from_checkpoint(self, tmp_path: Path) -> None:
+        """Test saved pages are read back and the fetch continues after them."""
+        checkpoint = Checkpoint(tmp_path / "prs.jsonl", {"list": "prs"})
+        checkpoint.save_page(0, [{"n": 1}], 1, "abc")
+        requester = MagicMock()
+        requester.graphql_query.side_effect = [
+            _page("pullRequests", [{"n": 2}], cursor="def"),
+            _page("pullRequests", [{"n": 3}]),
+        ]
+        fetcher = GraphQLFetcher(requester, "owner", "repo")
+
+        nodes = list(fetcher.paginate("query", "pullRequests", checkpoint))
+
+        assert nodes == [{"n": 1}, {"n": 2}, {"n": 3}]
+        assert requester.graphql_query.call_args_list[0].args[1]["cursor"] == (
+            "abc"
+        )
+        assert checkpoint.get_page(1) == SavedPage([{"n": 2}], 1, "def")
+        assert checkpoint.get_page(2) == SavedPage([{"n": 3}], 1, None)
+
+    def test_get_releases(self) -> None:
+        """Test releases are converted into ReleaseRecords."""
+        requester = MagicMock()
+        requester.graphql_query.return_value = _page(
+            "releases",
+            [
+                {
+                    "databaseId": 1,
+                    "tagName": "v1.0.0",
+                    "name": None,
+                    "description": None,
+                    "url": "https://github.com/o/r/releases/tag/v1.0.0",
+                    "createdAt": "2021-01-01T00:00:00Z",
+                }
+            ],
+        )
+
+        (release,) = GraphQLFetcher(requester, "o", "r").get_releases()
+
+        assert release.id == 1
+        assert release.tag_name == "v1.0.0"
+        assert release.title == ""
+        assert release.body == ""
+        assert release.created_at == datetime.datetime(
+            2021, 1, 1, tzinfo=datetime.timezone.utc
+        )
+
+    def test_get_pull_requests(self) -> None:
+        """Test PRs are converted, including unmerged, ghost and bot authors."""
+        requester = MagicMock()
+        requester.graphql_query.return_value = _page(
+            "pullRequests",
+            [
+                {
+                    "databaseId": 1,
+                    "number": 5,
+                    "title": "Merged",
+                    "url": "https://github.com/o/r/pull/5",
+                    "mergedAt": "2021-01-02T03:04:05Z",
+                    "author": AUTHOR,
+                    "labels": {"nodes": [{"name": "Bug"}]},
+                },
+                {
+                    "databaseId": 2,
+                    "number": 6,
+                    "title": "Closed",
+                    "url": "https://github.com/o/r/pull/6",
+                    "mergedAt": None,
+                    "author": None,
+                    "labels": {"nodes": []},
+                },
+                {
+                    "databaseId": 3,
+                    "number": 7,
+                    "title": "Bump a dependency",
+                    "url": "https://github.com/o/r/pull/7",
+                    "mergedAt": "2021-01-03T03:04:05Z",
+                    "author": BOT,
+                    "labels": {"nodes": []},
+                },
+            ],
+        )
+
+        merged, closed, bot = GraphQLFetcher(
+            requester, "o", "r"
+        ).get_pull_requests()
+
+        assert merged.user == UserRecord(
+            "dev", "https://github.com/dev", "Dev User"
+        )
+        assert merged.labels == frozenset({"bug"})
+        assert merged.merged_at is not None
+        assert closed.merged_at is None
+        assert closed.user == GHOST_USER
+        # the same login as the REST API, so 'ignored_users' still matches.
+        assert bot.user == UserRecord(
+            "dependabot[bot]", "https://github.com/apps/dependabot"
+        )
+
+    def test_get_issues_reads_closer(self) -> None:
+        """Test issues carry the closing actor from the ClosedEvent."""
+        requester = MagicMock()
+        base = {
+            "title": "Issue",
+            "url": "https://github.com/o/r/issues/1",
+            "closedAt": "2021-01-01T00:00:00Z",
+            "author": AUTHOR,
+            "labels": {"nodes": []},
+        }
+        requester.graphql_query.return_value = _page(
+            "issues",
+            [
+                {
+                    **base,
+                    "databaseId": 1,
+                    "number": 1,
+                    "timelineItems": {
+                        "nodes": [
+                            {
+                                "actor": {
+                                    "login": "closer",
+                                    "url": "https://github.com/closer",
+                                }
+                            }
+                        ]
+                    },
+                },
+                {
+                    **base,
+                    "databaseId": 2,
+                    "number": 2,
+                    "timelineItems": {"nodes": []},
+                },
+            ],
+        )
+
+        with_closer, without_closer = GraphQLFetcher(
+            requester, "o", "r"
+        ).get_issues()
+
+        assert requester.graphql_query.call_args.args[0] == ISSUES_QUERY
+        assert with_closer.closed_by == UserRecord(
+            "closer", "https://github.com/closer"
+        )
+        assert with_closer.pull_request is None
+        assert without_closer.closed_by is None
+
+    def test_get_issue_closers_batches_lookups(self) -> None:
+        """Test closers are looked up in batches using aliased fields."""
+        requester = MagicMock()
+        numbers = list(range(1, CLOSER_BATCH_SIZE + 2))
+        closer = {"login": "closer", "url": "https://github.com/closer"}
+
+        def fake_query(
+            query: str, _variables: dict[str, Any]
+        ) -> tuple[dict[str, Any], dict[str, Any]]:
+            aliases = [
+                line.split(":")[0]
+                for line in query.splitlines()
+                if ": issue(" in line
+            ]
+            repository: dict[str, Any] = {
+                alias: {"timelineItems": {"nodes": [{"actor": closer}]}}
+                for alias in aliases
+            }
+            # simulate an issue that has since been deleted or transferred
+            repository["i1"] = None
+            return {}, {"data": {"repository": repository}}
+
+        requester.graphql_query.side_effect = fake_query
+
+        closers = GraphQLFetcher(requester, "o", "r").get_issue_closers(
+            [*numbers, 2]
+        )
+
+        assert requester.graphql_query.call_count == math.ceil(
+            len(numbers) / CLOSER_BATCH_SIZE
+        )
+        assert closers[1] is None
+        assert closers[2] == UserRecord("closer", "https://github.com/closer")
+        assert set(closers) == set(numbers)
+
+    def test_get_issue_closers_keeps_a_partial_batch(self) -> None:
+        """Test issues that error get None, without losing the others."""
+        requester = MagicMock()
+        closer = {"login": "closer", "url": "https://github.com/closer"}
+        requester.graphql_query.side_effect = GithubException(
+            200,
+            {
+                "data": {
+                    "repository": {
+                        "i1": {"timelineItems": {"nodes": [{"actor": closer}]}},
+                        "i2": None,
+                    }
+                },
+                "errors": [{"type": "NOT_FOUND", "path": ["repository", "i2"]}],
+            },
+        )
+
+        closers = GraphQLFetcher(requester, "o", "r").get_issue_closers(
+            [1, 2, 3]
+        )
+
+        assert closers == {
+            1: UserRecord("closer", "https://github.com/closer"),
+            2: None,
+            3: None,
+        }
+
+        requester.graphql_query.side_effect = GithubException(
+            502, {"message": "Bad Gateway"}
+        )
+        with pytest.raises(GithubException):
+            GraphQLFetcher(requester, "o", "r").get_issue_closers([1])
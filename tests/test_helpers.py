@@ -12,14 +12,17 @@ import pytest
 
 from github_changelog_md.constants import ExitErrors, SectionHeadings
 from github_changelog_md.helpers import (
+    UMASK,
     cap_first_letter,
     get_app_version,
+    get_cache_dir,
     get_index_of_tuple,
     get_repo_name,
     get_section_name,
     header,
     strip_first_alpha_char,
     title_unique,
+    write_atomic,
 )
 
 if TYPE_CHECKING:
@@ -223,3 +226,65 @@ class TestHelpers:
         release.tag_name = tag_name
 
         assert title_unique(release) is expected
+
+    def test_get_cache_dir(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """Test the cache folder honours the setting, then XDG_CACHE_HOME."""
+        assert get_cache_dir(str(tmp_path)) == tmp_path
+
+        mocker.patch.dict("os.environ", {"XDG_CACHE_HOME": str(tmp_path)})
+        assert get_cache_dir() == tmp_path / "github-changelog-md"
+
+        mocker.patch.dict("os.environ", {"XDG_CACHE_HOME": ""})
+        mocker.patch("pathlib.Path.home", return_value=tmp_path)
+        assert get_cache_dir() == tmp_path / ".cache" / "github-changelog-md"
+
+    def test_write_atomic_replaces_file(self, tmp_path: Path) -> None:
+        """Test the file is replaced, keeping its mode, with no temp left."""
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text("old")
+        path.chmod(0o640)
+
+        write_atomic(path, "new")
+
+        assert path.read_text() == "new"
+        assert path.stat().st_mode & 0o777 == 0o640  # noqa: PLR2004
+        assert [p.name for p in tmp_path.iterdir()] == ["CHANGELOG.md"]
+
+    def test_write_atomic_ignores_leftover_temp_file(
+        self, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        """Test a temp file left by a killed run doesn't block the write."""
+        mocker.patch("os.getpid", return_value=123)
+        leftover = tmp_path / ".CHANGELOG.md.123.tmp"
+        leftover.write_text("partial")
+        path = tmp_path / "CHANGELOG.md"
+
+        assert write_atomic(path, "new") is True
+
+        assert path.read_text() == "new"
+        assert path.stat().st_mode & 0o777 == 0o666 & ~UMASK
+        assert leftover.read_text() == "partial"
+
+    def test_write_atomic_keeps_old_file_on_error(
+        self, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        """Test a failed write leaves the old file and no temp file."""
+        path = tmp_path / "CHANGELOG.md"
+        path.write_text("old")
+        mocker.patch("os.fsync", side_effect=OSError("disk full"))
+
+        with pytest.raises(OSError, match="disk full"):
+            write_atomic(path, "new")
+
+        assert path.read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["CHANGELOG.md"]
+
+    def test_write_atomic_skips_unchanged_file(self, tmp_path: Path) -> None:
+        """Test a file that already holds the text is not rewritten."""
+        path = tmp_path / "CHANGELOG.md"
+        assert write_atomic(path, "# Changelog\n") is True
+        mtime = path.stat().st_mtime_ns
+
+        assert write_atomic(path, "# Changelog\n") is False
+        assert path.stat().st_mtime_ns == mtime
+        assert write_atomic(path, "# Changelog!\n") is True
@@ -0,0 +1,184 @@
+"""Test the conditional-request response cache."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from github.Requester import HTTPSRequestsConnectionClass, Requester
+from requests.structures import CaseInsensitiveDict
+
+from github_changelog_md.changelog.connection import SharedConnection
+from github_changelog_md.changelog.http_cache import (
+    CachingConnection,
+    ResponseCache,
+    cache_key,
+    response_cache,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+HEADERS = {"Authorization": "token abc", "Accept": "application/json"}
+
+
+def _response(
+    status: int, body: bytes = b"", headers: dict[str, str] | None = None
+) -> requests.Response:
+    """Return a requests Response with the given status, body and headers."""
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = "utf-8"
+    response._content = body  # noqa: SLF001
+    return response
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> Generator[ResponseCache]:
+    """Return an empty cache in a temporary folder."""
+    with response_cache(tmp_path / "cache.sqlite3", 1024) as response_cache_:
+        yield response_cache_
+
+
+@pytest.fixture
+def session(cache: ResponseCache) -> MagicMock:  # noqa: ARG001
+    """Return a mock session shared by all caching connections."""
+    session = MagicMock()
+    SharedConnection.shared_session = session
+    return session
+
+
+def _get(url: str = "/repos/o/r/releases") -> tuple[int, str]:
+    """Make a GET request through a caching connection."""
+    connection = CachingConnection("api.github.com")
+    connection.request("GET", url, None, dict(HEADERS))
+    response = connection.getresponse()
+    connection.close()
+    return response.status, response.read()
+
+
+class TestResponseCache:
+    """Test the ResponseCache and CachingConnection classes."""
+
+    def test_cache_key_is_scoped_to_the_token(self) -> None:
+        """Test the same URL has a different key for a different token."""
+        other = {**HEADERS, "Authorization": "token xyz"}
+
+        assert cache_key("/a", HEADERS) == cache_key("/a", dict(HEADERS))
+        assert cache_key("/a", HEADERS) != cache_key("/a", other)
+        assert cache_key("/a", HEADERS) != cache_key("/b", HEADERS)
+
+    def test_least_recently_used_responses_are_evicted(
+        self, cache: ResponseCache
+    ) -> None:
+        """Test the cache drops the oldest responses when it is too big."""
+        headers = CaseInsensitiveDict({"ETag": '"1"'})
+        cache.put("a", headers, b"x" * 400)
+        cache.put("b", headers, b"x" * 400)
+        assert cache.get("a") is not None
+
+        cache.put("c", headers, b"x" * 400)
+        cache.put("huge", headers, b"x" * 2048)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.get("huge") is None
+
+    def test_not_modified_replays_the_cached_body(
+        self, session: MagicMock
+    ) -> None:
+        """Test a 304 is answered from the cache with fresh rate headers."""
+        session.get.side_effect = [
+            _response(
+                200,
+                b"[1, 2]",
+                {
+                    "ETag": '"abc"',
+                    "Link": "<next>",
+                    "X-RateLimit-Remaining": "9",
+                },
+            ),
+            _response(304, headers={"X-RateLimit-Remaining": "8"}),
+        ]
+
+        assert _get() == (200, "[1, 2]")
+        status, body = _get()
+
+        assert (status, body) == (200, "[1, 2]")
+        second_headers = session.get.call_args_list[1].kwargs["headers"]
+        assert second_headers["If-None-Match"] == '"abc"'
+        assert HEADERS == {
+            "Authorization": "token abc",
+            "Accept": "application/json",
+        }
+
+    def test_replayed_response_keeps_body_headers(
+        self, session: MagicMock
+    ) -> None:
+        """Test the Link header comes from the cache, the rest from GitHub."""
+        session.get.side_effect = [
+            _response(200, b"[]", {"Last-Modified": "then", "Link": "<n>"}),
+            _response(304, headers={"X-RateLimit-Remaining": "8"}),
+        ]
+        _get()
+        connection = CachingConnection("api.github.com")
+        connection.request("GET", "/repos/o/r/releases", None, dict(HEADERS))
+
+        response = connection.getresponse()
+
+        sent = session.get.call_args_list[1].kwargs["headers"]
+        assert sent["If-Modified-Since"] == "then"
+        assert response.headers["link"] == "<n>"
+        assert response.headers["X-RateLimit-Remaining"] == "8"
+
+    def test_uncacheable_requests_pass_through(
+        self, session: MagicMock
+    ) -> None:
+        """Test POSTs and responses without validators are not cached."""
+        session.get.return_value = _response(200, b"{}")
+        session.post.return_value = _response(200, b"{}", {"ETag": '"1"'})
+
+        _get()
+        _get()
+        connection = CachingConnection("api.github.com")
+        connection.request("POST", "/graphql", "{}", dict(HEADERS))
+        connection.getresponse()
+
+        for call in session.get.call_args_list:
+            assert "If-None-Match" not in call.kwargs["headers"]
+
+    def test_response_cache_installs_and_removes_connection_class(
+        self, tmp_path: Path
+    ) -> None:
+        """Test new requesters use the caching connection inside the block."""
+        with response_cache(tmp_path / "cache.sqlite3", 1024) as cache:
+            assert CachingConnection.cache is cache
+            requester = _requester()
+            assert requester._Requester__connectionClass is CachingConnection  # noqa: SLF001
+
+        assert CachingConnection.cache is None
+        assert SharedConnection.shared_session is None
+        requester = _requester()
+        assert (
+            requester._Requester__connectionClass  # noqa: SLF001
+            is HTTPSRequestsConnectionClass
+        )
+
+
+def _requester() -> Requester:
+    """Return a PyGithub Requester for the public API."""
+    return Requester(
+        auth=None,
+        base_url="https://api.github.com",
+        timeout=15,
+        user_agent="test",
+        per_page=30,
+        verify=True,
+        retry=None,
+        pool_size=None,
+    )
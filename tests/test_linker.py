@@ -0,0 +1,113 @@
+"""Test the release timeline linker."""
+
+from __future__ import annotations
+
+import datetime
+import random
+from typing import Any
+from unittest.mock import MagicMock
+
+from github_changelog_md.changelog.linker import (
+    ReleaseTimeline,
+    link_to_releases,
+)
+
+
+def _day(day: int) -> datetime.datetime:
+    """Return a UTC datetime 'day' days after the start of 2021."""
+    return datetime.datetime(
+        2021, 1, 1, tzinfo=datetime.timezone.utc
+    ) + datetime.timedelta(days=day)
+
+
+def _nested_loop_link(
+    releases: list[Any], items: list[Any], last_release_date: datetime.datetime
+) -> tuple[dict[int, list[Any]], list[Any]]:
+    """The original O(releases x items) algorithm, used as a reference."""
+    by_release: dict[int, list[Any]] = {}
+    seen: set[int] = set()
+    for release in releases[::-1]:
+        by_release[release.id] = []
+        for item in items:
+            if (
+                item.merged_at
+                and item.merged_at <= release.created_at
+                and item.id not in seen
+            ):
+                by_release[release.id].append(item)
+                seen.add(item.id)
+    unreleased = [
+        item
+        for item in items
+        if item.merged_at
+        and item.merged_at > last_release_date
+        and item.id not in seen
+    ]
+    return by_release, unreleased
+
+
+class TestLinker:
+    """Test the linker module."""
+
+    def test_timeline_find(self) -> None:
+        """Test items are placed in the first release on or after them."""
+        releases = [
+            MagicMock(id=2, created_at=_day(10)),
+            MagicMock(id=1, created_at=_day(5)),
+        ]
+        timeline = ReleaseTimeline(releases)
+
+        assert timeline.find(_day(1)) == 1
+        assert timeline.find(_day(5)) == 1
+        assert timeline.find(_day(6)) == 2  # noqa: PLR2004
+        assert timeline.find(_day(11)) is None
+
+    def test_link_skips_undated_and_old_items(self) -> None:
+        """Test unmerged items are dropped and unreleased is date-bounded."""
+        releases: list[Any] = []
+        merged = MagicMock(id=1, merged_at=_day(3))
+        too_old = MagicMock(id=2, merged_at=_day(1))
+        unmerged = MagicMock(id=3, merged_at=None)
+
+        by_release, unreleased = link_to_releases(
+            releases,
+            [merged, too_old, unmerged],
+            lambda item: item.merged_at,
+            _day(2),
+        )
+
+        assert by_release == {}
+        assert unreleased == [merged]
+
+    def test_matches_nested_loop_for_random_histories(self) -> None:
+        """Test the buckets match the original algorithm exactly.
+
+        This includes releases returned out of date order, which can happen
+        when a release is created for an older tag.
+        """
+        rng = random.Random(1234)  # noqa: S311
+        for _ in range(50):
+            releases = [
+                MagicMock(id=release_id, created_at=_day(rng.randint(0, 60)))
+                for release_id in range(rng.randint(0, 8))
+            ]
+            rng.shuffle(releases)
+            items = [
+                MagicMock(
+                    id=100 + item_id,
+                    merged_at=(
+                        _day(rng.randint(0, 70))
+                        if rng.random() > 0.1  # noqa: PLR2004
+                        else None
+                    ),
+                )
+                for item_id in range(rng.randint(0, 40))
+            ]
+            last_release_date = releases[-1].created_at if releases else _day(0)
+
+            expected = _nested_loop_link(releases, items, last_release_date)
+            actual = link_to_releases(
+                releases, items, lambda item: item.merged_at, last_release_date
+            )
+
+            assert actual == expected
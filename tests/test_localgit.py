@@ -0,0 +1,213 @@
+"""Test reading the releases from the tags of a local clone."""
+
+from __future__ import annotations
+
+import datetime
+import os
+import subprocess
+from shutil import which
+from typing import TYPE_CHECKING
+
+import pytest
+import typer
+
+from github_changelog_md.changelog.localgit import (
+    LocalGit,
+    login_from_email,
+    tag_id,
+)
+from github_changelog_md.changelog.records import UserRecord
+from github_changelog_md.constants import ExitErrors
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+HTML_URL = "https://github.com/owner/repo"
+
+needs_git = pytest.mark.skipif(which("git") is None, reason="needs git")
+
+
+def _git(
+    path: Path,
+    *args: str,
+    date: str = "2024-01-01T00:00:00Z",
+    author: str = "Test <test@example.com>",
+) -> None:
+    """Run a git command in 'path', as 'author' with both dates 'date'."""
+    name, email = author.rstrip(">").split(" <")
+    identity = ["-c", f"user.name={name}", "-c", f"user.email={email}"]
+    subprocess.run(  # noqa: S603
+        ["git", *identity, *args],  # noqa: S607
+        cwd=path,
+        check=True,
+        capture_output=True,
+        env={**os.environ, "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date},
+    )
+
+
+@pytest.fixture
+def clone(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Return a repository with a lightweight and an annotated tag."""
+    monkeypatch.chdir(tmp_path)
+    _git(tmp_path, "init", "-q")
+    first = "2024-01-01T10:00:00Z"
+    _git(tmp_path, "commit", "-q", "--allow-empty", "-m", "First", date=first)
+    _git(tmp_path, "tag", "v1.0", date=first)
+    second = "2024-02-01T10:00:00Z"
+    _git(tmp_path, "commit", "-q", "--allow-empty", "-m", "Second", date=second)
+    _git(
+        tmp_path,
+        "tag",
+        "-a",
+        "v1.1",
+        "-m",
+        "Version 1.1\n\nNew things",
+        date="2024-02-02T12:00:00+02:00",
+    )
+    return tmp_path
+
+
+class TestLocalGit:
+    """Test the LocalGit class."""
+
+    @needs_git
+    @pytest.mark.usefixtures("clone")
+    def test_get_releases_from_tags(self) -> None:
+        """Test each tag is a release, newest first, with annotated notes."""
+        releases = LocalGit(HTML_URL).get_releases()
+
+        assert [release.tag_name for release in releases] == ["v1.1", "v1.0"]
+        newest, oldest = releases
+        assert newest.id == tag_id("v1.1")
+        assert newest.created_at == datetime.datetime(
+            2024, 2, 2, 10, tzinfo=datetime.timezone.utc
+        )
+        assert newest.body == "Version 1.1\n\nNew things"
+        assert newest.html_url == f"{HTML_URL}/releases/tag/v1.1"
+        assert oldest.body == ""
+        assert oldest.title == ""
+
+    @needs_git
+    @pytest.mark.usefixtures("clone")
+    def test_first_commit_date(self) -> None:
+        """Test the date of the root commit is found."""
+        assert LocalGit(HTML_URL).first_commit_date() == datetime.datetime(
+            2024, 1, 1, 10, tzinfo=datetime.timezone.utc
+        )
+
+    @needs_git
+    def test_get_contributors_from_history(self, clone: Path) -> None:
+        """Test authors are found once each, using the '.mailmap'."""
+        (clone / ".mailmap").write_text(
+            "Jane Doe <jane@example.com> <jane@old.example.com>\n"
+        )
+        for author in (
+            "Jane Doe <jane@example.com>",
+            "jane <jane@old.example.com>",
+            "Sam <123+sam-gh@users.noreply.github.com>",
+            "Sam <sam@example.com>",
+            (
+                "dependabot[bot] <49699333+dependabot[bot]@users.noreply."
+                "github.com>"
+            ),
+        ):
+            _git(
+                clone, "commit", "-q", "--allow-empty", "-m", "x", author=author
+            )
+
+        contributors = LocalGit(HTML_URL).get_contributors()
+
+        assert contributors == [
+            UserRecord(
+                login="sam-gh",
+                html_url="https://github.com/sam-gh",
+                name="Sam",
+            ),
+            UserRecord(login="", html_url="", name="Jane Doe"),
+            UserRecord(login="", html_url="", name="Test"),
+        ]
+
+    @needs_git
+    def test_check_clone(
+        self,
+        clone: Path,
+        tmp_path_factory: pytest.TempPathFactory,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test only a full clone of the same repository is accepted."""
+        local_git = LocalGit(HTML_URL)
+        with pytest.raises(typer.Exit) as exc:
+            local_git.check_clone("repo")
+        assert exc.value.exit_code == ExitErrors.LOCAL_GIT_ERROR
+
+        _git(clone, "remote", "add", "origin", f"{HTML_URL}.git")
+        local_git.check_clone("Repo")
+        with pytest.raises(typer.Exit):
+            local_git.check_clone("other")
+        assert "is of 'repo', not 'other'" in capsys.readouterr().err
+
+        # a CI-style checkout, with only the last commit and no tags.
+        shallow = tmp_path_factory.mktemp("shallow")
+        _git(shallow, "clone", "-q", "--depth=1", clone.as_uri(), ".")
+        _git(shallow, "remote", "set-url", "origin", f"{HTML_URL}.git")
+        with pytest.raises(typer.Exit) as exc:
+            LocalGit(HTML_URL, shallow).check_clone("repo")
+        assert exc.value.exit_code == ExitErrors.LOCAL_GIT_ERROR
+        assert "The local clone is shallow" in capsys.readouterr().err
+
+    def test_login_from_email(self) -> None:
+        """Test logins are taken from GitHub noreply addresses only."""
+        assert login_from_email("1+me@users.noreply.github.com") == "me"
+        assert login_from_email("me@users.noreply.github.com") == "me"
+        assert login_from_email("me@example.com") is None
+
+    def test_authors_git_errors_exit(self, mocker: MockerFixture) -> None:
+        """Test a failed or missing 'git log' stops with an error."""
+        local_git = LocalGit(HTML_URL)
+        popen = mocker.patch(
+            "github_changelog_md.changelog.localgit.subprocess.Popen"
+        )
+        process = popen.return_value.__enter__.return_value
+        process.stdout = ["Me\x00me@example.com\n"]
+        process.returncode = 128
+        with pytest.raises(typer.Exit):
+            list(local_git.authors())
+
+        popen.side_effect = OSError("no such file")
+        with pytest.raises(typer.Exit):
+            list(local_git.authors())
+
+    def test_git_errors_exit(
+        self, mocker: MockerFixture, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test a failed git command or missing git stops with an error."""
+        mocker.patch(
+            "github_changelog_md.changelog.localgit.which",
+            return_value="git",
+        )
+        mocker.patch(
+            "github_changelog_md.changelog.localgit.subprocess.run",
+            side_effect=subprocess.CalledProcessError(
+                128, "git", stderr="not a git repository"
+            ),
+        )
+        with pytest.raises(typer.Exit) as exc:
+            LocalGit(HTML_URL).get_releases()
+        assert exc.value.exit_code == ExitErrors.LOCAL_GIT_ERROR
+        assert "not a git repository" in capsys.readouterr().err
+
+        mocker.patch(
+            "github_changelog_md.changelog.localgit.which", return_value=None
+        )
+        with pytest.raises(typer.Exit):
+            LocalGit(HTML_URL)
+
+    def test_no_commits(self, mocker: MockerFixture) -> None:
+        """Test a repository without commits stops with an error."""
+        local_git = LocalGit(HTML_URL)
+        mocker.patch.object(local_git, "run", return_value="")
+
+        with pytest.raises(typer.Exit):
+            local_git.first_commit_date()
@@ -0,0 +1,126 @@
+"""Test fetching the pages of a list in parallel."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+from github_changelog_md.changelog.checkpoint import RecordCheckpoint
+from github_changelog_md.changelog.pages import PageFetcher
+from github_changelog_md.changelog.records import (
+    PRRecord,
+    UserRecord,
+    to_dict,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+def _fetcher(mocker: MockerFixture, pages: list[list[int]]) -> MagicMock:
+    """Return a mock Github class whose repo returns the given pages of ids.
+
+    Asking for a page past the end returns an empty page.
+    """
+    github_cls = mocker.patch("github_changelog_md.changelog.pages.Github")
+    repo = github_cls.return_value.get_repo.return_value
+
+    def get_page(page: int) -> list[MagicMock]:
+        ids = pages[page] if page < len(pages) else []
+        return [MagicMock(id=item_id) for item_id in ids]
+
+    repo.get_pulls.return_value.get_page.side_effect = get_page
+    return github_cls
+
+
+def _record(item_id: int) -> PRRecord:
+    """Return a PRRecord with the given id."""
+    return PRRecord(
+        id=item_id,
+        number=item_id,
+        title="PR",
+        html_url="https://github.com/o/r/pull/1",
+        user=UserRecord("dev", "https://github.com/dev"),
+        merged_at=None,
+    )
+
+
+def _requester(per_page: int) -> MagicMock:
+    """Return a mock Requester with the given page size."""
+    return MagicMock(kwargs={"per_page": per_page}, per_page=per_page)
+
+
+class TestPageFetcher:
+    """Test the PageFetcher class."""
+
+    def test_fetch_keeps_page_order(self, mocker: MockerFixture) -> None:
+        """Test items come back in page order, whichever page lands first."""
+        github_cls = _fetcher(mocker, [[1, 2], [3, 4], [5]])
+        fetcher = PageFetcher(_requester(2), "o/r", workers=3)
+
+        items = fetcher.fetch(
+            lambda repo: repo.get_pulls(state="closed"), 5, PRRecord
+        )
+
+        assert [item.id for item in items] == [1, 2, 3, 4, 5]
+        github_cls.assert_called_with(per_page=2, lazy=True)
+        github_cls.return_value.get_repo.assert_called_with("o/r")
+
+    def test_fetch_follows_the_list_if_it_grew(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test a full last page is followed, and shifted items are dropped."""
+        _fetcher(mocker, [[1, 2], [2, 3], [4]])
+        fetcher = PageFetcher(_requester(2), "o/r", workers=2)
+
+        items = fetcher.fetch(lambda repo: repo.get_pulls(), 4, PRRecord)
+
+        assert [item.id for item in items] == [1, 2, 3, 4]
+
+    def test_fetch_empty_list(self, mocker: MockerFixture) -> None:
+        """Test an empty list makes no page requests."""
+        github_cls = _fetcher(mocker, [])
+        fetcher = PageFetcher(_requester(30), "o/r", workers=4)
+
+        assert fetcher.fetch(lambda repo: repo.get_pulls(), 0, PRRecord) == []
+        github_cls.assert_not_called()
+
+    def test_each_thread_reuses_its_client(self, mocker: MockerFixture) -> None:
+        """Test a client is created once per thread, not once per page."""
+        github_cls = _fetcher(mocker, [[1, 2], [3, 4], [5]])
+        fetcher = PageFetcher(_requester(2), "o/r", workers=1)
+
+        fetcher.fetch(lambda repo: repo.get_pulls(), 5, PRRecord)
+
+        github_cls.assert_called_once()
+
+    def test_fetch_resumes_from_checkpoint(
+        self, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        """Test saved pages are not fetched again, and new ones are saved."""
+        github_cls = _fetcher(mocker, [[1, 2], [3, 4], [5]])
+        repo = github_cls.return_value.get_repo.return_value
+        checkpoint = RecordCheckpoint(
+            tmp_path / "prs.jsonl", {"list": "prs"}, PRRecord
+        )
+        saved = [to_dict(_record(1)), to_dict(_record(2))]
+        checkpoint.save_page(0, saved, 2)
+        mocker.patch.object(checkpoint, "save_records")
+        fetcher = PageFetcher(_requester(2), "o/r", workers=2)
+
+        items = fetcher.fetch(
+            lambda repo: repo.get_pulls(), 5, PRRecord, checkpoint
+        )
+
+        assert [item.id for item in items] == [1, 2, 3, 4, 5]
+        assert isinstance(items[0], PRRecord)
+        requested = {
+            call.args[0]
+            for call in repo.get_pulls.return_value.get_page.call_args_list
+        }
+        assert requested == {1, 2}
+        assert sorted(
+            call.args[0] for call in checkpoint.save_records.call_args_list
+        ) == [1, 2]
@@ -0,0 +1,58 @@
+"""Test compiling the render plan and sorting PRs into sections."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock
+
+from github_changelog_md.changelog.plan import MERGED_HEADING, RenderPlan
+from github_changelog_md.constants import SECTIONS
+
+
+def _pr(number: int, *labels: str, title: str = "A PR") -> Any:  # noqa: ANN401
+    """Return a mock PR record with the given labels."""
+    return MagicMock(number=number, title=title, labels=frozenset(labels))
+
+
+class TestRenderPlan:
+    """Test the RenderPlan class."""
+
+    def test_compile_keeps_the_section_order(self) -> None:
+        """Test the headings follow the sections, labels map to headings."""
+        plan = RenderPlan.compile(SECTIONS, ["wontfix"])
+
+        assert plan.headings == tuple(heading for heading, _ in SECTIONS)
+        assert plan.section_by_label["bug"] == ("Bug Fixes",)
+        assert plan.merged_heading == MERGED_HEADING
+        assert plan.ignored_labels == frozenset({"wontfix"})
+
+    def test_compile_adds_missing_merged_heading(self) -> None:
+        """Test the default section is added last if it isn't configured."""
+        plan = RenderPlan.compile([("Bug Fixes", "bug")], [])
+
+        assert plan.headings == ("Bug Fixes", MERGED_HEADING)
+
+    def test_classify_sorts_prs_in_one_pass(self) -> None:
+        """Test PRs go in each matching section, or the default one."""
+        plan = RenderPlan.compile(SECTIONS, ["wontfix"])
+        fix = _pr(1, "bug")
+        both = _pr(2, "bug", "enhancement")
+        plain = _pr(3, "help wanted")
+        ignored = _pr(4, "bug", "wontfix")
+
+        sections = plan.classify([fix, both, plain, ignored])
+
+        assert list(sections) == list(plan.headings)
+        assert sections["Bug Fixes"] == [fix, both]
+        assert sections["Enhancements"] == [both]
+        assert sections[MERGED_HEADING] == [plain]
+        assert sections["Documentation"] == []
+
+    def test_is_hidden(self) -> None:
+        """Test hidden numbers and '[no changelog]' titles are hidden."""
+        plan = RenderPlan.compile(SECTIONS, [], [2])
+
+        assert not plan.is_hidden(_pr(1))
+        assert plan.is_hidden(_pr(2))
+        assert plan.is_hidden(_pr(3, title="Tidy up [No Changelog]"))
+        assert not RenderPlan.compile(SECTIONS, []).is_hidden(_pr(2))
@@ -0,0 +1,120 @@
+"""Test looking up contributor names in batches, and caching them."""
+
+from __future__ import annotations
+
+import json
+import math
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock
+
+import pytest
+from github import GithubException
+
+from github_changelog_md.changelog.profiles import (
+    PROFILE_BATCH_SIZE,
+    PROFILE_VERSION,
+    ProfileCache,
+    build_query,
+    fetch_names,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+def _answer(_query: str, variables: dict[str, str]) -> tuple[Any, Any]:
+    """Answer a name query, with each user named after their login."""
+    return {}, {
+        "data": {
+            f"u{key[1:]}": {"name": login.title()}
+            for key, login in variables.items()
+        }
+    }
+
+
+class TestFetchNames:
+    """Test the fetch_names function."""
+
+    def test_build_query(self) -> None:
+        """Test each login is passed as a variable to an aliased field."""
+        query = build_query(2)
+
+        assert query.startswith("query($l0: String!, $l1: String!) {")
+        assert "u1: user(login: $l1) { name }" in query
+
+    def test_logins_are_fetched_in_batches(self) -> None:
+        """Test each unique login is looked up once, in full batches."""
+        requester = MagicMock()
+        requester.graphql_query.side_effect = _answer
+        logins = [f"user{number}" for number in range(PROFILE_BATCH_SIZE + 5)]
+
+        names = fetch_names(requester, [*logins, "user0"])
+
+        assert requester.graphql_query.call_count == math.ceil(
+            len(logins) / PROFILE_BATCH_SIZE
+        )
+        assert names["user0"] == "User0"
+        assert len(names) == len(logins)
+
+    def test_logins_that_are_not_users(self) -> None:
+        """Test an app login gets no name, without losing the others."""
+        requester = MagicMock()
+        requester.graphql_query.side_effect = GithubException(
+            400,
+            {
+                "data": {"u0": {"name": "Amy"}, "u1": None},
+                "errors": [{"type": "NOT_FOUND", "path": ["u1"]}],
+            },
+        )
+
+        names = fetch_names(requester, ["renovate[bot]", "amy"])
+
+        assert names == {"amy": "Amy", "renovate[bot]": None}
+
+        requester.graphql_query.side_effect = GithubException(
+            502, {"message": "Bad Gateway"}
+        )
+        with pytest.raises(GithubException):
+            fetch_names(requester, ["amy"])
+
+
+class TestProfileCache:
+    """Test the ProfileCache class."""
+
+    def test_names_are_saved_and_expire(
+        self, tmp_path: Path, mocker: MockerFixture
+    ) -> None:
+        """Test saved names are used until they are older than 'max_age'."""
+        path = tmp_path / "profiles.json"
+        clock = mocker.patch(
+            "github_changelog_md.changelog.profiles.time.time",
+            return_value=1000.0,
+        )
+        cache = ProfileCache(path, max_age=60)
+        cache.update({"amy": "Amy", "sam": None})
+        cache.save()
+
+        clock.return_value = 1050.0
+        assert ProfileCache(path, max_age=60).get_names(
+            ["amy", "sam", "x"]
+        ) == {
+            "amy": "Amy",
+            "sam": None,
+        }
+        clock.return_value = 1061.0
+        assert ProfileCache(path, max_age=60).get_names(["amy"]) == {}
+
+    def test_other_version_is_ignored(self, tmp_path: Path) -> None:
+        """Test names saved by another version, or corrupt, aren't used."""
+        path = tmp_path / "profiles.json"
+        path.write_text(
+            json.dumps(
+                {"version": PROFILE_VERSION + 1, "profiles": {"a": ["A", 1e12]}}
+            )
+        )
+        assert ProfileCache(path, max_age=60).get_names(["a"]) == {}
+
+        path.write_text("not json")
+        assert ProfileCache(path, max_age=60).get_names(["a"]) == {}
@@ -0,0 +1,173 @@
+"""Test the rate limit scheduler."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from github_changelog_md.changelog.ratelimit import (
+    MAX_RETRIES,
+    Budget,
+    RateLimitScheduler,
+    format_wait,
+    get_resource,
+)
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+def _headers(remaining: int, reset: float, limit: int = 5000) -> dict[str, str]:
+    """Return rate limit headers for the given budget."""
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(reset)),
+    }
+
+
+class TestRateLimitScheduler:
+    """Test the RateLimitScheduler class and helpers."""
+
+    def test_budget_from_headers(self) -> None:
+        """Test the budget is read from the headers, if they are there."""
+        assert Budget.from_headers(_headers(10, 100)) == Budget(5000, 10, 100)
+        assert Budget.from_headers({}) is None
+        assert (
+            Budget.from_headers(_headers(10, 100) | {"X-RateLimit-Limit": "x"})
+            is None
+        )
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("/repos/o/r/pulls", "core"),
+            ("/search/issues", "search"),
+            ("/api/v3/search/issues", "search"),
+            ("/graphql", "graphql"),
+            ("/api/graphql", "graphql"),
+        ],
+    )
+    def test_get_resource(self, url: str, expected: str) -> None:
+        """Test each URL is matched to the limit it counts against."""
+        assert get_resource(url) == expected
+
+    def test_format_wait(self) -> None:
+        """Test waits are shown in minutes and seconds."""
+        assert format_wait(5.4) == "5s"
+        assert format_wait(125) == "2m 5s"
+
+    def test_requests_in_flight_shrink_with_the_budget(self) -> None:
+        """Test fewer requests are allowed at once as the budget runs low."""
+        scheduler = RateLimitScheduler(max_wait=60)
+        assert scheduler.allowed_in_flight("core") == 1
+
+        scheduler.budgets["core"] = Budget(5000, 4000, 0)
+        assert scheduler.allowed_in_flight("core") == 400  # noqa: PLR2004
+
+        scheduler.budgets["core"] = Budget(5000, 25, 0)
+        assert scheduler.allowed_in_flight("core") == 2  # noqa: PLR2004
+
+        scheduler.budgets["core"] = Budget(5000, 0, 0)
+        assert scheduler.allowed_in_flight("core") == 1
+
+    def test_acquire_takes_from_the_shared_bucket(
+        self, mocker: MockerFixture
+    ) -> None:
+        """Test each request waits for a token from the shared bucket."""
+        sleep = mocker.patch(
+            "github_changelog_md.changelog.ratelimit.time.sleep"
+        )
+        bucket = mocker.MagicMock()
+        bucket.take.return_value = 2.5
+        scheduler = RateLimitScheduler(max_wait=60, bucket=bucket)
+
+        assert scheduler.acquire("/repos/o/r") == "core"
+
+        bucket.take.assert_called_once_with()
+        sleep.assert_called_once_with(2.5)
+
+    def test_acquire_waits_while_others_are_in_flight(self) -> None:
+        """Test a request waits for a free slot, then goes."""
+        scheduler = RateLimitScheduler(max_wait=60)
+        resource = scheduler.acquire("/repos/o/r")
+        acquired = threading.Event()
+
+        def second_request() -> None:
+            scheduler.acquire("/repos/o/r/pulls")
+            acquired.set()
+
+        thread = threading.Thread(target=second_request)
+        thread.start()
+        assert not acquired.wait(0.1)
+
+        scheduler.release(resource, _headers(4000, time.time() + 60))
+        thread.join(timeout=5)
+        assert acquired.is_set()
+        assert scheduler.budgets["core"].remaining == 4000  # noqa: PLR2004
+
+    def test_acquire_waits_for_reset_when_budget_used_up(
+        self, mocker: MockerFixture, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test we wait for the reset rather than send a doomed request."""
+        scheduler = RateLimitScheduler(max_wait=60)
+        scheduler.budgets["core"] = Budget(5000, 0, time.time() + 30)
+        mocker.patch.object(
+            Budget, "seconds_to_reset", side_effect=[0.01, 0.01, 0]
+        )
+
+        assert scheduler.acquire("/repos/o/r") == "core"
+        output = capsys.readouterr().out
+        assert output.count("Rate limit for 'core' requests used up") == 1
+
+    def test_acquire_does_not_wait_longer_than_max_wait(self) -> None:
+        """Test the request is sent anyway if the reset is too far away."""
+        scheduler = RateLimitScheduler(max_wait=60)
+        scheduler.budgets["core"] = Budget(5000, 0, time.time() + 3600)
+
+        assert scheduler.acquire("/repos/o/r") == "core"
+
+    def test_retry_delay(self, mocker: MockerFixture) -> None:
+        """Test which responses are retried, and after how long."""
+        scheduler = RateLimitScheduler(max_wait=60)
+        mocker.patch(
+            "github_changelog_md.changelog.ratelimit.time.time",
+            return_value=1000.0,
+        )
+        mocker.patch(
+            "github_changelog_md.changelog.ratelimit.random.uniform",
+            return_value=1.0,
+        )
+
+        assert scheduler.retry_delay(200, {}, "", 0) is None
+        assert scheduler.retry_delay(403, {"Retry-After": "7"}, "", 0) == 7  # noqa: PLR2004
+        assert scheduler.retry_delay(403, _headers(0, 1020), "", 0) == 21  # noqa: PLR2004
+        assert scheduler.retry_delay(403, _headers(0, 5000), "", 0) is None
+        assert scheduler.retry_delay(429, _headers(10, 5000), "", 1) == 10  # noqa: PLR2004
+        secondary = '{"message": "You have exceeded a secondary rate limit"}'
+        assert scheduler.retry_delay(403, _headers(10, 5000), secondary, 0) == 5  # noqa: PLR2004
+        assert scheduler.retry_delay(403, {}, secondary, MAX_RETRIES - 1) == 80  # noqa: PLR2004
+        assert scheduler.retry_delay(403, {}, secondary, MAX_RETRIES) is None
+        assert scheduler.retry_delay(429, {}, "", 10) is None
+        assert (
+            scheduler.retry_delay(
+                403,
+                _headers(10, 5000),
+                '{"message": "Must have admin rights"}',
+                0,
+            )
+            is None
+        )
+
+    def test_summary(self) -> None:
+        """Test the summary lists each budget we know about."""
+        scheduler = RateLimitScheduler(max_wait=60)
+        assert scheduler.summary() == ""
+
+        scheduler.budgets["search"] = Budget(30, 12, 0)
+        scheduler.budgets["core"] = Budget(5000, 4000, 0)
+
+        assert scheduler.summary() == "4000/5000 core, 12/30 search"
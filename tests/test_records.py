@@ -0,0 +1,203 @@
+"""Test the lightweight record classes."""
+
+from __future__ import annotations
+
+import copy
+import datetime
+import pickle
+from dataclasses import FrozenInstanceError, replace
+from unittest.mock import MagicMock
+
+import pytest
+
+from github_changelog_md.changelog.records import (
+    GHOST_USER,
+    IssueRecord,
+    PRRecord,
+    ReleaseRecord,
+    RepoRecord,
+    UserRecord,
+    as_records,
+    record_key,
+    to_dict,
+)
+
+WHEN = datetime.datetime(2021, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+def _label(name: str) -> MagicMock:
+    """Return a mock PyGithub Label."""
+    label = MagicMock()
+    label.name = name
+    return label
+
+
+class TestRecords:
+    """Test conversion to and from the record classes."""
+
+    def test_release_from_github_and_round_trip(self) -> None:
+        """Test a GitRelease converts and survives a dict round trip."""
+        release = MagicMock(
+            id=1,
+            tag_name="v1.0.0",
+            title=None,
+            body=None,
+            html_url="https://github.com/o/r/releases/tag/v1.0.0",
+            created_at=WHEN,
+        )
+
+        record = ReleaseRecord.from_github(release)
+
+        assert record.title == ""
+        assert record.body == ""
+        assert to_dict(record)["created_at"] == WHEN.isoformat()
+        assert ReleaseRecord.from_dict(to_dict(record)) == record
+
+    def test_pr_from_github_and_round_trip(self) -> None:
+        """Test a PullRequest converts without reading the user's name."""
+        user = MagicMock(login="dev", html_url="https://github.com/dev")
+        pr = MagicMock(
+            id=2,
+            number=3,
+            title="A PR",
+            html_url="https://github.com/o/r/pull/3",
+            user=user,
+            merged_at=None,
+            labels=[_label("bug")],
+        )
+
+        record = PRRecord.from_github(pr)
+
+        assert record.user == UserRecord("dev", "https://github.com/dev")
+        assert record.labels == frozenset({"bug"})
+        assert PRRecord.from_dict(to_dict(record)) == record
+
+    def test_issue_from_github_and_round_trip(self) -> None:
+        """Test an Issue converts, keeping deleted authors as the ghost."""
+        issue = MagicMock(
+            id=4,
+            number=5,
+            title="An issue",
+            html_url="https://github.com/o/r/issues/5",
+            user=None,
+            closed_at=WHEN,
+            labels=[],
+        )
+
+        record = IssueRecord.from_github(issue)
+
+        assert record.user == GHOST_USER
+        assert record.closed_by is None
+        assert IssueRecord.from_dict(to_dict(record)) == record
+
+        closed = replace(record, closed_by=GHOST_USER)
+        assert IssueRecord.from_dict(to_dict(closed)) == closed
+
+    def test_repo_from_github_and_round_trip(self) -> None:
+        """Test a Repository converts, with or without a first commit date."""
+        repo = MagicMock(full_name="o/r", html_url="https://github.com/o/r")
+        repo.name = "r"
+
+        record = RepoRecord.from_github(repo)
+
+        assert record == RepoRecord("o/r", "r", "https://github.com/o/r")
+        assert RepoRecord.from_dict(to_dict(record)) == record
+
+        dated = RepoRecord.from_github(repo, WHEN)
+        assert RepoRecord.from_dict(to_dict(dated)).first_commit_at == WHEN
+
+    def test_records_are_slotted_and_frozen(self) -> None:
+        """Test records have no per-object dict and can't be changed."""
+        record = UserRecord("dev", "https://github.com/dev")
+
+        assert not hasattr(record, "__dict__")
+        assert record.name is None
+        with pytest.raises(FrozenInstanceError):
+            record.login = "other"  # type: ignore[misc]
+
+    def test_records_can_be_copied_and_pickled(self) -> None:
+        """Test a deep copy or a pickle round trip gives an equal record."""
+        user = UserRecord("dev", "https://github.com/dev", "Dev")
+        record = IssueRecord(
+            id=1,
+            number=2,
+            title="An issue",
+            html_url="https://github.com/o/r/issues/2",
+            user=user,
+            closed_at=WHEN,
+            closed_by=user,
+            labels=frozenset({"bug"}),
+        )
+
+        copied = copy.deepcopy(record)
+        assert copied == record
+        assert copied.user is not user
+        assert pickle.loads(pickle.dumps(record)) == record  # noqa: S301
+
+    def test_labels_are_lowercased(self) -> None:
+        """Test labels are lowercased, and the older saved form still loads."""
+        pr = MagicMock(
+            id=2,
+            number=3,
+            title="A PR",
+            html_url="https://github.com/o/r/pull/3",
+            user=None,
+            merged_at=None,
+            labels=[_label("Bug"), _label("DOCUMENTATION")],
+        )
+        record = PRRecord.from_github(pr)
+
+        assert record.labels == frozenset({"bug", "documentation"})
+        assert to_dict(record)["labels"] == ["bug", "documentation"]
+
+        saved = {**to_dict(record), "labels": [{"name": "Bug"}]}
+        assert PRRecord.from_dict(saved).labels == frozenset({"bug"})
+
+    def test_as_records_keeps_records_and_drops_prs(self) -> None:
+        """Test records are kept, PyGithub objects converted, PRs dropped."""
+        record = IssueRecord(
+            id=1,
+            number=1,
+            title="Kept",
+            html_url="https://github.com/o/r/issues/1",
+            user=GHOST_USER,
+            closed_at=WHEN,
+        )
+        issue = MagicMock(
+            id=4,
+            number=5,
+            title="Converted",
+            html_url="https://github.com/o/r/issues/5",
+            user=None,
+            closed_at=WHEN,
+            labels=[],
+            pull_request=None,
+        )
+        pr = MagicMock(pull_request=MagicMock())
+
+        records = as_records([record, issue, pr], IssueRecord)
+
+        assert records[0] is record
+        assert [item.number for item in records] == [1, 5]
+        assert isinstance(records[1], IssueRecord)
+
+    def test_record_key_is_stable(self) -> None:
+        """Test the key sorts labels, includes users and skips fields."""
+        user = UserRecord("dev", "https://github.com/dev")
+        record = IssueRecord(
+            id=1,
+            number=2,
+            title="An issue",
+            html_url="https://github.com/o/r/issues/2",
+            user=user,
+            closed_at=WHEN,
+            closed_by=user,
+            labels=frozenset({"bug", "documentation", "enhancement"}),
+        )
+
+        key = record_key(record)
+
+        assert ("bug", "documentation", "enhancement") in key
+        assert ("dev", "https://github.com/dev", None) in key
+        assert len(record_key(record, ("closed_by",))) == len(key) - 1
+        assert record_key(replace(record, title="Changed")) != key
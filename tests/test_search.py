@@ -0,0 +1,160 @@
+"""Test the search API fetch backend."""
+
+from __future__ import annotations
+
+import datetime
+import re
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock
+
+from github_changelog_md.changelog.records import GHOST_USER
+from github_changelog_md.changelog.search import (
+    MAX_QUERY_LENGTH,
+    SearchFetcher,
+    build_query,
+)
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+START = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+DATE_RANGE = re.compile(r"created:(\S+)\.\.(\S+)")
+
+
+def _item(number: int, **extra: Any) -> dict[str, Any]:  # noqa: ANN401
+    """Return a search result created 'number' days after START."""
+    created = START + datetime.timedelta(days=number)
+    return {
+        "id": 1000 + number,
+        "number": number,
+        "title": f"Item {number}",
+        "html_url": f"https://github.com/o/r/issues/{number}",
+        "user": {"login": "dev", "html_url": "https://github.com/dev"},
+        "labels": [],
+        "closed_at": "2022-01-01T00:00:00Z",
+        "pull_request": {"merged_at": "2022-01-01T00:00:00Z"},
+        "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        **extra,
+    }
+
+
+def _search_engine(items: list[dict[str, Any]]) -> MagicMock:
+    """Return a requester that answers searches from 'items'.
+
+    Like GitHub, results are filtered by the 'created:' range in the query,
+    returned newest first, and paged.
+    """
+    requester = MagicMock()
+
+    def search(
+        _verb: str, _url: str, parameters: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        match = DATE_RANGE.search(parameters["q"])
+        assert match is not None
+        start, end = match.groups()
+        found = sorted(
+            (item for item in items if start <= item["created_at"] <= end),
+            key=lambda item: item["created_at"],
+            reverse=True,
+        )
+        per_page = parameters["per_page"]
+        offset = (parameters["page"] - 1) * per_page
+        return {}, {
+            "total_count": len(found),
+            "items": found[offset : offset + per_page],
+        }
+
+    requester.requestJsonAndCheck.side_effect = search
+    return requester
+
+
+class TestSearchFetcher:
+    """Test the SearchFetcher class and query planner."""
+
+    def test_build_query_pushes_filters_into_the_query(self) -> None:
+        """Test the query includes the date window and the exclusions."""
+        query = build_query(
+            ("repo:o/r", "is:pr", "is:merged"),
+            ["-author:bot", '-label:"good first issue"'],
+            START,
+            START + datetime.timedelta(days=1),
+        )
+
+        assert query == (
+            "repo:o/r is:pr is:merged "
+            "created:2021-01-01T00:00:00Z..2021-01-02T00:00:00Z "
+            '-author:bot -label:"good first issue"'
+        )
+
+    def test_build_query_drops_exclusions_that_do_not_fit(self) -> None:
+        """Test a long list of exclusions is cut to fit the length limit."""
+        exclusions = [f"-author:user{n}" for n in range(50)]
+
+        query = build_query(("repo:o/r",), exclusions, START, START)
+
+        assert len(query) <= MAX_QUERY_LENGTH
+        assert "-author:user0" in query
+        assert "-author:user49" not in query
+
+    def test_exclusions_come_from_ignored_users_and_labels(self) -> None:
+        """Test ignored users and labels become negative qualifiers."""
+        fetcher = SearchFetcher(
+            MagicMock(), "o/r", START, ["bot"], ["wontfix", "won't fix it"]
+        )
+
+        assert fetcher.exclusions == [
+            "-author:bot",
+            "-label:wontfix",
+            '-label:"won\'t fix it"',
+        ]
+
+    def test_large_windows_are_split(self, mocker: MockerFixture) -> None:
+        """Test windows over the result limit are halved, newest first."""
+        mocker.patch("github_changelog_md.changelog.search.SEARCH_LIMIT", 5)
+        mocker.patch("github_changelog_md.changelog.search.PAGE_SIZE", 2)
+        items = [_item(number) for number in range(1, 21)]
+        requester = _search_engine(items)
+        fetcher = SearchFetcher(requester, "o/r", START)
+
+        prs = fetcher.get_pull_requests()
+
+        assert [pr.number for pr in prs] == list(range(20, 0, -1))
+        for call in requester.requestJsonAndCheck.call_args_list:
+            assert "is:pr is:merged" in call.kwargs["parameters"]["q"]
+
+    def test_duplicate_results_are_dropped(self) -> None:
+        """Test an item returned twice is only kept once."""
+        requester = MagicMock()
+        requester.requestJsonAndCheck.return_value = (
+            {},
+            {"total_count": 2, "items": [_item(2), _item(2)]},
+        )
+        fetcher = SearchFetcher(requester, "o/r", START)
+
+        assert [issue.number for issue in fetcher.get_issues()] == [2]
+
+    def test_results_are_converted_to_records(self) -> None:
+        """Test search results become PR and Issue records."""
+        item = _item(
+            3,
+            user=None,
+            labels=[{"name": "bug"}],
+            pull_request={"merged_at": None},
+        )
+        requester = _search_engine([item])
+        fetcher = SearchFetcher(requester, "o/r", START)
+
+        (pr,) = fetcher.get_pull_requests()
+        (issue,) = fetcher.get_issues()
+
+        assert pr.user == GHOST_USER
+        assert pr.merged_at is None
+        assert pr.labels == frozenset({"bug"})
+        assert issue.closed_at == datetime.datetime(
+            2022, 1, 1, tzinfo=datetime.timezone.utc
+        )
+        queries = [
+            call.kwargs["parameters"]["q"]
+            for call in requester.requestJsonAndCheck.call_args_list
+        ]
+        assert "is:issue is:closed" in queries[-1]
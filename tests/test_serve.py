@@ -0,0 +1,329 @@
+"""Test keeping the changelog up to date from webhook events."""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+import hashlib
+import hmac
+import json
+import threading
+import urllib.error
+import urllib.request
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from github_changelog_md.changelog import ChangeLog
+from github_changelog_md.changelog.records import (
+    IssueRecord,
+    PRRecord,
+    ReleaseRecord,
+    RepoRecord,
+    UserRecord,
+)
+from github_changelog_md.changelog.serve import (
+    LiveChangelog,
+    WebhookServer,
+    parse_payload,
+)
+from github_changelog_md.changelog.snapshot import Snapshot
+from tests.conftest import default_options
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+    from github_changelog_md.constants import ChangelogOptions
+
+SECRET = "s3cret"  # noqa: S105
+REPO_URL = "https://github.com/owner/repo"
+USER = UserRecord("dev", "https://github.com/dev")
+REPOSITORY = {"full_name": "owner/repo", "html_url": REPO_URL}
+SENDER = {"login": "maintainer", "html_url": "https://github.com/maintainer"}
+OPTIONS: ChangelogOptions = {
+    **default_options(),
+    "quiet": True,
+}
+
+
+def _jan(day: int) -> datetime.datetime:
+    """Return midday on the given day of January 2024, in UTC."""
+    return datetime.datetime(2024, 1, day, 12, tzinfo=datetime.timezone.utc)
+
+
+def _settings(tmp_path: Path) -> MagicMock:
+    """Return settings that render the changelog with the defaults."""
+    return MagicMock(
+        yanked=None,
+        release_text_before=None,
+        release_text=None,
+        release_overrides=None,
+        date_format="%Y-%m-%d",
+        ignored_users=[],
+        intro_text="",
+        extend_sections=None,
+        extend_sections_index=None,
+        rename_sections=None,
+        ignored_labels=None,
+        extend_ignored=None,
+        allowed_labels=None,
+        fragment_cache=False,
+        cache_dir=str(tmp_path / "cache"),
+    )
+
+
+def _snapshot() -> Snapshot:
+    """Return two releases, with a PR in the first and an Issue in the next."""
+    return Snapshot(
+        repo=RepoRecord("owner/repo", "repo", REPO_URL),
+        fetched_at=_jan(21),
+        releases=[
+            ReleaseRecord(2, "v2", "", "", f"{REPO_URL}/v2", _jan(20)),
+            ReleaseRecord(1, "v1", "", "", f"{REPO_URL}/v1", _jan(10)),
+        ],
+        pull_requests=[
+            PRRecord(10, 5, "Add a thing", f"{REPO_URL}/pull/5", USER, _jan(5))
+        ],
+        issues=[
+            IssueRecord(
+                20, 4, "Old bug", f"{REPO_URL}/issues/4", USER, _jan(15), USER
+            )
+        ],
+    )
+
+
+# trimmed copies of the payloads GitHub sends, with only what we read.
+def _pr_payload(
+    action: str, state: str, merged_at: str | None
+) -> dict[str, Any]:
+    return {
+        "action": action,
+        "pull_request": {
+            "id": 11,
+            "number": 7,
+            "state": state,
+            "title": "Fix the other thing",
+            "html_url": f"{REPO_URL}/pull/7",
+            "user": {"login": "dev", "html_url": "https://github.com/dev"},
+            "merged_at": merged_at,
+            "labels": [{"id": 1, "name": "bug", "color": "d73a4a"}],
+        },
+        "repository": REPOSITORY,
+        "sender": SENDER,
+    }
+
+
+def _issue_payload(action: str, state: str) -> dict[str, Any]:
+    return {
+        "action": action,
+        "issue": {
+            "id": 21,
+            "number": 8,
+            "state": state,
+            "title": "New bug",
+            "html_url": f"{REPO_URL}/issues/8",
+            "user": {"login": "dev", "html_url": "https://github.com/dev"},
+            "closed_at": "2024-01-22T12:00:00Z" if state == "closed" else None,
+            "labels": [],
+        },
+        "repository": REPOSITORY,
+        "sender": SENDER,
+    }
+
+
+def _release_payload(action: str) -> dict[str, Any]:
+    return {
+        "action": action,
+        "release": {
+            "id": 3,
+            "tag_name": "v3",
+            "name": "Third",
+            "body": "",
+            "draft": False,
+            "html_url": f"{REPO_URL}/releases/tag/v3",
+            "created_at": "2024-01-25T12:00:00Z",
+        },
+        "repository": REPOSITORY,
+        "sender": SENDER,
+    }
+
+
+@pytest.fixture
+def live(tmp_path: Path) -> Iterator[LiveChangelog]:
+    """Return a changelog loaded from a snapshot, written to 'tmp_path'."""
+    changelog = ChangeLog(
+        "repo",
+        OPTIONS,
+        _snapshot(),
+        settings=_settings(tmp_path),
+        folder=tmp_path,
+    )
+    with contextlib.ExitStack() as stack:
+        changelog.load(stack)
+        yield LiveChangelog(changelog, SECRET)
+
+
+@pytest.fixture
+def server_url(live: LiveChangelog) -> Iterator[str]:
+    """Serve 'live' on a free local port, returning its URL."""
+    server = WebhookServer(("127.0.0.1", 0), live)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def _post(
+    url: str, event: str, payload: dict[str, Any], secret: str = SECRET
+) -> tuple[int, str]:
+    """POST an event like GitHub does, returning the status and message."""
+    body = json.dumps(payload).encode()
+    signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    request = urllib.request.Request(  # noqa: S310
+        url,
+        data=body,
+        headers={
+            "Content-Type": "application/json",
+            "X-GitHub-Event": event,
+            "X-Hub-Signature-256": f"sha256={signature}",
+        },
+    )
+    try:
+        with urllib.request.urlopen(request) as response:  # noqa: S310
+            return response.status, response.read().decode().strip()
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.read().decode().strip()
+
+
+class TestServe:
+    """Test applying webhook events to a loaded changelog."""
+
+    def test_merged_pr_is_added_without_rendering_releases(
+        self, live: LiveChangelog, server_url: str, tmp_path: Path
+    ) -> None:
+        """Test a merged PR goes in Unreleased, and old releases are reused."""
+        status, message = _post(
+            server_url,
+            "pull_request",
+            _pr_payload("closed", "closed", "2024-01-22T12:00:00Z"),
+        )
+
+        assert (status, message) == (
+            200,
+            "Changelog updated for 'pull_request' event",
+        )
+        text = (tmp_path / "CHANGELOG.md").read_text()
+        assert "Fix the other thing" in text.split("## [v2]")[0]
+        # v2 now starts with the diff link from the Unreleased section, so
+        # only v1 is reused.
+        assert live.changelog.fragments is not None
+        assert live.changelog.fragments.hits == 1
+
+        # reopening it takes it out again.
+        _post(server_url, "pull_request", _pr_payload("reopened", "open", None))
+        assert (
+            "Fix the other thing" not in (tmp_path / "CHANGELOG.md").read_text()
+        )
+
+    def test_release_and_issue_events(
+        self, live: LiveChangelog, server_url: str, tmp_path: Path
+    ) -> None:
+        """Test a new release and a closed issue are both shown."""
+        _post(server_url, "issues", _issue_payload("closed", "closed"))
+        status, _ = _post(server_url, "release", _release_payload("published"))
+
+        assert status == 200  # noqa: PLR2004
+        text = (tmp_path / "CHANGELOG.md").read_text()
+        assert "## [v3]" in text
+        assert "New bug" in text.split("## [v3]")[1].split("## [v2]")[0]
+        assert live.changelog.issue_closers[8] == UserRecord(
+            "maintainer", "https://github.com/maintainer"
+        )
+
+        _post(server_url, "release", _release_payload("deleted"))
+        assert "## [v3]" not in (tmp_path / "CHANGELOG.md").read_text()
+
+    def test_closers_are_only_looked_up_once(
+        self, live: LiveChangelog, mocker: MockerFixture
+    ) -> None:
+        """Test an issue nobody was found to have closed isn't asked again."""
+        fetcher = mocker.patch(
+            "github_changelog_md.changelog.changelog.GraphQLFetcher"
+        )
+        fetcher.return_value.get_issue_closers.return_value = {9: None}
+        changelog = live.changelog
+        # as if fetched from GitHub using REST, rather than a snapshot.
+        changelog.snapshot = None
+        changelog.git = MagicMock()
+        mocker.patch.object(
+            ChangeLog, "github_repo", new_callable=mocker.PropertyMock
+        )
+        issue = IssueRecord(
+            30, 9, "Closed by nobody", f"{REPO_URL}/issues/9", USER, _jan(16)
+        )
+
+        changelog.issue_closers = changelog.resolve_closers([issue])
+        live.keep_closers()
+
+        assert changelog.resolve_closers([issue]) == {}
+        fetcher.assert_called_once()
+
+    @pytest.mark.parametrize(
+        ("event", "payload", "secret", "expected"),
+        [
+            ("ping", {"zen": "Keep it simple."}, SECRET, (200, "pong")),
+            (
+                "push",
+                {"repository": REPOSITORY},
+                SECRET,
+                (200, "Ignored 'push' event"),
+            ),
+            (
+                "release",
+                {**_release_payload("published"), "repository": {}},
+                SECRET,
+                (200, "Ignored 'release' event"),
+            ),
+            (
+                "release",
+                _release_payload("published"),
+                "wrong",
+                (401, "Bad signature"),
+            ),
+            (
+                "release",
+                {"action": "published", "repository": REPOSITORY},
+                SECRET,
+                (400, "Bad 'release' payload"),
+            ),
+        ],
+    )
+    def test_events_that_change_nothing(  # noqa: PLR0913
+        self,
+        server_url: str,
+        tmp_path: Path,
+        event: str,
+        payload: dict[str, Any],
+        secret: str,
+        expected: tuple[int, str],
+    ) -> None:
+        """Test other events, repositories or bad requests aren't applied."""
+        before = (tmp_path / "CHANGELOG.md").read_text()
+
+        assert _post(server_url, event, payload, secret) == expected
+        assert (tmp_path / "CHANGELOG.md").read_text() == before
+
+    def test_parse_payload(self) -> None:
+        """Test a payload can be sent as JSON or as a form."""
+        assert parse_payload(b'{"a": 1}', "application/json") == {"a": 1}
+        assert parse_payload(
+            b"payload=%7B%22a%22%3A+1%7D", "application/x-www-form-urlencoded"
+        ) == {"a": 1}
+        with pytest.raises(TypeError):
+            parse_payload(b"[1]", "application/json")
@@ -0,0 +1,111 @@
+"""Test saving and loading snapshots of the fetched data."""
+
+from __future__ import annotations
+
+import datetime
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+import typer
+
+from github_changelog_md.changelog.records import (
+    IssueRecord,
+    PRRecord,
+    ReleaseRecord,
+    RepoRecord,
+    UserRecord,
+)
+from github_changelog_md.changelog.snapshot import SNAPSHOT_VERSION, Snapshot
+from github_changelog_md.constants import ExitErrors
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+WHEN = datetime.datetime(2024, 3, 1, 12, tzinfo=datetime.timezone.utc)
+USER = UserRecord("dev", "https://github.com/dev")
+
+
+def _snapshot() -> Snapshot:
+    """Return a snapshot with one of everything."""
+    return Snapshot(
+        repo=RepoRecord(
+            full_name="owner/repo",
+            name="repo",
+            html_url="https://github.com/owner/repo",
+        ),
+        fetched_at=WHEN,
+        releases=[
+            ReleaseRecord(
+                id=1,
+                tag_name="v1.0",
+                title="First",
+                body="",
+                html_url="https://github.com/owner/repo/releases/v1.0",
+                created_at=WHEN,
+            )
+        ],
+        pull_requests=[
+            PRRecord(
+                id=2,
+                number=5,
+                title="Add a thing",
+                html_url="https://github.com/owner/repo/pull/5",
+                user=USER,
+                merged_at=WHEN,
+                labels=frozenset({"enhancement"}),
+            )
+        ],
+        issues=[
+            IssueRecord(
+                id=3,
+                number=4,
+                title="Broken",
+                html_url="https://github.com/owner/repo/issues/4",
+                user=USER,
+                closed_at=WHEN,
+                closed_by=USER,
+            )
+        ],
+    )
+
+
+class TestSnapshot:
+    """Test the Snapshot class."""
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Test a saved snapshot loads back the same."""
+        path = tmp_path / "out" / "snapshot.json"
+        _snapshot().save(path)
+
+        assert Snapshot.load(path) == _snapshot()
+        assert json.loads(path.read_text())["version"] == SNAPSHOT_VERSION
+        assert "\n" not in path.read_text()
+
+    def test_load_missing_file(self, tmp_path: Path, capsys) -> None:
+        """Test a missing snapshot exits with an error."""
+        with pytest.raises(typer.Exit) as exc_info:
+            Snapshot.load(tmp_path / "missing.json")
+
+        assert exc_info.value.exit_code == ExitErrors.BAD_SNAPSHOT
+        assert "Cannot read snapshot" in capsys.readouterr().err
+
+    def test_load_other_version(self, tmp_path: Path, capsys) -> None:
+        """Test a snapshot from a different version is rejected."""
+        path = tmp_path / "snapshot.json"
+        path.write_text(json.dumps({"version": SNAPSHOT_VERSION + 1}))
+
+        with pytest.raises(typer.Exit):
+            Snapshot.load(path)
+
+        assert "run 'fetch'" in capsys.readouterr().err
+
+    def test_load_damaged(self, tmp_path: Path, capsys) -> None:
+        """Test a snapshot missing some data is rejected."""
+        path = tmp_path / "snapshot.json"
+        path.write_text(json.dumps({"version": SNAPSHOT_VERSION}))
+
+        with pytest.raises(typer.Exit):
+            Snapshot.load(path)
+
+        assert "is damaged" in capsys.readouterr().err
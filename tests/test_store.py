@@ -0,0 +1,219 @@
+"""Test the local store and incremental sync."""
+
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+
+from github_changelog_md.changelog.store import (
+    ISSUE,
+    SYNC_OVERLAP,
+    LocalStore,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+
+def _day(day: int) -> datetime.datetime:
+    """Return a UTC datetime 'day' days after the start of 2021."""
+    return datetime.datetime(
+        2021, 1, 1, tzinfo=datetime.timezone.utc
+    ) + datetime.timedelta(days=day)
+
+
+def _user() -> MagicMock:
+    return MagicMock(login="dev", html_url="https://github.com/dev")
+
+
+def _release(release_id: int, day: int) -> MagicMock:
+    return MagicMock(
+        id=release_id,
+        tag_name=f"v{release_id}",
+        title="",
+        body="",
+        html_url=f"https://github.com/o/r/releases/tag/v{release_id}",
+        created_at=_day(day),
+    )
+
+
+def _pr(pr_id: int, day: int, state: str = "closed") -> MagicMock:
+    return MagicMock(
+        id=pr_id,
+        number=pr_id,
+        title=f"PR {pr_id}",
+        html_url=f"https://github.com/o/r/pull/{pr_id}",
+        user=_user(),
+        merged_at=_day(day),
+        updated_at=_day(day),
+        labels=[],
+        state=state,
+    )
+
+
+def _issue(
+    issue_id: int,
+    day: int,
+    state: str = "closed",
+    pull_request: MagicMock | None = None,
+) -> MagicMock:
+    return MagicMock(
+        id=issue_id,
+        number=issue_id,
+        title=f"Issue {issue_id}",
+        html_url=f"https://github.com/o/r/issues/{issue_id}",
+        user=_user(),
+        closed_at=_day(day),
+        labels=[],
+        state=state,
+        pull_request=pull_request,
+    )
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Generator[LocalStore]:
+    """Return an empty store in a temporary folder."""
+    local_store = LocalStore(tmp_path / "cache" / "store.sqlite3")
+    yield local_store
+    local_store.close()
+
+
+class TestLocalStore:
+    """Test the LocalStore class."""
+
+    def test_first_sync_fetches_full_closed_history(
+        self, store: LocalStore
+    ) -> None:
+        """Test the first sync saves every closed item."""
+        repo = MagicMock(full_name="o/r")
+        repo.get_releases.return_value = [_release(2, 10), _release(1, 5)]
+        repo.get_pulls.return_value = [_pr(11, 3), _pr(12, 8)]
+        repo.get_issues.return_value = [
+            _issue(21, 4),
+            _issue(22, 4, pull_request=MagicMock()),
+        ]
+
+        result = store.sync(repo)
+
+        repo.get_pulls.assert_called_once_with(state="closed", sort="created")
+        repo.get_issues.assert_called_once_with(state="closed", sort="created")
+        assert [release.id for release in result.releases] == [2, 1]
+        assert [pr.id for pr in result.pull_requests] == [12, 11]
+        assert [issue.id for issue in result.issues] == [21]
+        assert result.updated == 5  # noqa: PLR2004
+        assert store.get_synced_at("o/r") is not None
+
+    def test_later_sync_only_fetches_changes(self, store: LocalStore) -> None:
+        """Test a later sync merges updates and drops reopened items."""
+        repo = MagicMock(full_name="o/r")
+        repo.get_releases.return_value = [_release(1, 5)]
+        repo.get_pulls.return_value = [_pr(11, 3), _pr(12, 8)]
+        repo.get_issues.return_value = [_issue(21, 4), _issue(22, 6)]
+        store.sync(repo)
+
+        synced_at = _day(20)
+        store.set_synced_at("o/r", synced_at)
+        repo.reset_mock()
+        repo.get_releases.return_value = [_release(3, 25), _release(1, 5)]
+        repo.get_pulls.return_value = [
+            _pr(13, 24),
+            _pr(12, 22, state="open"),
+            _pr(11, 3),
+        ]
+        repo.get_issues.return_value = [
+            _issue(23, 23),
+            _issue(21, 21, state="open"),
+            _issue(24, 22, pull_request=MagicMock()),
+        ]
+
+        result = store.sync(repo)
+
+        repo.get_pulls.assert_called_once_with(
+            state="all", sort="updated", direction="desc"
+        )
+        repo.get_issues.assert_called_once_with(
+            state="all", sort="updated", since=synced_at
+        )
+        assert [release.id for release in result.releases] == [3, 1]
+        assert [pr.id for pr in result.pull_requests] == [13, 11]
+        assert [issue.id for issue in result.issues] == [23, 22]
+        assert result.updated == 5  # noqa: PLR2004
+
+    def test_releases_are_always_fetched_in_full(
+        self, store: LocalStore
+    ) -> None:
+        """Test late, edited and deleted releases are all picked up."""
+        repo = MagicMock(full_name="o/r")
+        repo.get_releases.return_value = [_release(2, 10), _release(1, 5)]
+        repo.get_pulls.return_value = []
+        repo.get_issues.return_value = []
+        store.sync(repo)
+
+        store.set_synced_at("o/r", _day(20))
+        edited = _release(2, 10)
+        edited.body = "Now with notes"
+        # published after the last sync, on an older commit.
+        repo.get_releases.return_value = [edited, _release(3, 8)]
+
+        result = store.sync(repo)
+
+        assert [release.id for release in result.releases] == [2, 3]
+        assert result.releases[0].body == "Now with notes"
+        assert result.updated == 3  # noqa: PLR2004
+
+    def test_sync_does_not_lock_while_fetching(
+        self, store: LocalStore, tmp_path: Path
+    ) -> None:
+        """Test another run can write to the store while this one fetches."""
+        other = LocalStore(tmp_path / "cache" / "store.sqlite3")
+        other.connection.execute("PRAGMA busy_timeout = 0")
+
+        def other_run(**_kwargs: object) -> list[MagicMock]:
+            other.save("o/other", ISSUE, [])
+            other.set_synced_at("o/other", _day(1))
+            other.commit()
+            return [_issue(21, 4)]
+
+        repo = MagicMock(full_name="o/r")
+        repo.get_releases.return_value = [_release(1, 5)]
+        repo.get_pulls.return_value = [_pr(11, 3)]
+        repo.get_issues.side_effect = other_run
+
+        result = store.sync(repo)
+        other.close()
+
+        assert result.updated == 3  # noqa: PLR2004
+        assert store.get_synced_at("o/other") == _day(1)
+
+    def test_sync_records_start_time_with_overlap(
+        self, store: LocalStore
+    ) -> None:
+        """Test the saved sync time is a little before the sync started."""
+        repo = MagicMock(full_name="o/r")
+        repo.get_releases.return_value = []
+        repo.get_pulls.return_value = []
+        repo.get_issues.return_value = []
+        before = datetime.datetime.now(tz=datetime.timezone.utc)
+
+        store.sync(repo)
+
+        synced_at = store.get_synced_at("o/r")
+        assert synced_at is not None
+        assert synced_at <= before - SYNC_OVERLAP + datetime.timedelta(
+            seconds=5
+        )
+
+    def test_store_is_per_repository(self, store: LocalStore) -> None:
+        """Test records saved for one repo are not loaded for another."""
+        repo = MagicMock(full_name="o/r")
+        repo.get_releases.return_value = []
+        repo.get_pulls.return_value = []
+        repo.get_issues.return_value = [_issue(21, 4)]
+        store.sync(repo)
+
+        assert store.load("o/other", ISSUE) == []
+        assert len(store.load("o/r", ISSUE)) == 1
@@ -0,0 +1,55 @@
+"""Test fetching and rendering only the newest releases."""
+
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+from github_changelog_md.changelog.window import find_tail, updated_since
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+CHANGELOG = """# Changelog
+
+## [v1.1](https://github.com/owner/repo/releases/tag/v1.1) (2024-02-01)
+
+- Newer
+
+## [v1.0](https://github.com/owner/repo/releases/tag/v1.0) (2024-01-01)
+
+- Older
+"""
+
+
+def _day(day: int) -> datetime.datetime:
+    """Return a date in January 2024."""
+    return datetime.datetime(2024, 1, day, tzinfo=datetime.timezone.utc)
+
+
+class TestWindow:
+    """Test the window helper functions."""
+
+    def test_updated_since_stops_at_the_first_older_item(self) -> None:
+        """Test nothing after the first item older than 'since' is read."""
+        read: list[int] = []
+
+        def items() -> Iterator[int]:
+            for day in (9, 7, 5, 3, 8):
+                read.append(day)
+                yield day
+
+        result = list(updated_since(items(), _day(5), _day))
+
+        assert result == [9, 7, 5]
+        assert read == [9, 7, 5, 3]
+
+    def test_find_tail(self) -> None:
+        """Test the tail starts at the heading of the given release."""
+        tail = find_tail(CHANGELOG, "v1.0")
+
+        assert tail is not None
+        assert tail.startswith("## [v1.0](")
+        assert tail.endswith("- Older\n")
+        assert find_tail(CHANGELOG, "v0.9") is None
+        assert find_tail(CHANGELOG, "v1.") is None